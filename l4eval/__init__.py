@@ -0,0 +1,6 @@
+"""Concurrent evaluation engine for the L4 transparency indicators."""
+
+from .engine import Result, run_matrix
+from .registry import INDICATORS, MODELS
+
+__all__ = ["INDICATORS", "MODELS", "Result", "run_matrix"]
@@ -0,0 +1,277 @@
+"""Judge accuracy against cost, measured on a pinned gold set.
+
+The gold set is the raw score of every indicator block in ``Scores/*.json``,
+seeded once into ``Gold/gold.json`` (with the SHA-256 of each source file) so
+that later runs writing to ``Scores/`` do not move the target.
+
+Each pipeline variant is a set of ``RunConfig`` overrides: a cheaper judge,
+another context mode, the rubric extract, pruning, the cascade ...  A variant
+evaluates the gold pairs of the matrix into its own directory under
+``.l4eval/accuracy`` and is scored by exact match and quadratic-weighted
+Cohen's kappa against the gold set.  Its prompt and completion tokens, judge
+time and cost are read back from the variant's journal, which records every
+judge and JSON-repair response with its latency; the wall-clock time of the
+last sweep that made live calls is recorded there too.
+
+The journal doubles as the recording: a rerun replays it, and with
+``offline`` every call must come from it, so the report can be reproduced
+without network once each variant has been run.  Calls that are not
+journaled (map-reduce map steps, rubric distillation) must already be
+cached for an offline run.
+"""
+
+import hashlib
+import json
+import time
+import types
+from dataclasses import replace
+from pathlib import Path
+
+from openai.types.chat import ChatCompletion
+
+from . import cascade, engine, journal, pruning, telemetry
+from .cache import CACHE_DIR
+from .judge import usage_dict
+from .output import VALID_SCORES
+from .registry import INDICATORS, REPO_ROOT, SCORES_DIR, select
+
+GOLD_PATH = REPO_ROOT / "Gold" / "gold.json"
+ACCURACY_DIR = CACHE_DIR / "accuracy"
+VERSION = 1
+
+VARIANTS = {
+    "reference": {},
+    "chat": {"judge": "deepseek-chat"},
+    "budget": {"context": "budget"},
+    "retrieval": {"context": "retrieval"},
+    "rubric-extract": {"rubric": "extract"},
+    "pruned": {"prune": pruning.CATEGORIES},
+    "cascade": {"cascade": cascade.CHEAP_JUDGE},
+}
+
+
+class NotRecorded(RuntimeError):
+    """An offline run needed a response that no journal holds."""
+
+
+class _OfflineCompletions:
+    async def create(self, **params):
+        raise NotRecorded(f"no recorded response for this {params.get('model')} request")
+
+
+class OfflineClient:
+    """Client whose every call fails with ``NotRecorded``.
+
+    Journal keys include the base URL, so ``base_url`` must be the one the
+    responses were recorded against; ``run_variant`` takes it from the
+    variant's journal.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.chat = types.SimpleNamespace(completions=_OfflineCompletions())
+
+
+def seed(scores_dir: Path = SCORES_DIR, path: Path = GOLD_PATH) -> dict:
+    """Write the gold set from the score files of ``scores_dir``."""
+    scores, sources = {}, {}
+    for model, indicator in select():
+        score_path = Path(scores_dir) / indicator.output_file(model)
+        if not score_path.exists():
+            continue
+        raw = score_path.read_bytes()
+        data = json.loads(raw)
+        sources[score_path.name] = hashlib.sha256(raw).hexdigest()
+        for key in indicator.output_keys:
+            block = data.get(key)
+            if isinstance(block, dict) and block.get("raw_score") in VALID_SCORES:
+                scores.setdefault(model.key, {})[key] = block["raw_score"]
+    gold = {
+        "version": VERSION,
+        "seeded": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sources": sources,
+        "scores": scores,
+    }
+    engine.write_scores(gold, path)
+    return gold
+
+
+def load_gold(path: Path = GOLD_PATH) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def gold_pairs(gold: dict, models=None, indicators=None):
+    """The pairs of the matrix with at least one gold block."""
+    return [
+        (model, indicator)
+        for model, indicator in select(models, indicators)
+        if any(key in gold["scores"].get(model.key, {}) for key in indicator.output_keys)
+    ]
+
+
+def weighted_kappa(pairs: list[tuple[float, float]], categories=VALID_SCORES) -> float | None:
+    """Quadratic-weighted Cohen's kappa of ``(gold, score)`` pairs; ``None`` when undefined."""
+    if not pairs:
+        return None
+    index = {category: i for i, category in enumerate(categories)}
+    k = len(categories)
+    observed = [[0] * k for _ in range(k)]
+    for gold, score in pairs:
+        observed[index[gold]][index[score]] += 1
+    rows = [sum(row) for row in observed]
+    columns = [sum(row[j] for row in observed) for j in range(k)]
+    weight = [[(i - j) ** 2 / (k - 1) ** 2 for j in range(k)] for i in range(k)]
+    disagreement = sum(weight[i][j] * observed[i][j] for i in range(k) for j in range(k))
+    expected = sum(weight[i][j] * rows[i] * columns[j] / len(pairs) for i in range(k) for j in range(k))
+    if expected == 0:
+        # Both raters used a single category: chance agreement is total.
+        return None
+    return 1 - disagreement / expected
+
+
+def agreement(gold: dict, results: list[engine.Result]) -> dict:
+    """Exact match and weighted kappa of ``results`` against ``gold``.
+
+    A gold block that the variant failed to score counts as a mismatch for
+    the exact match and is left out of kappa.
+    """
+    compared, total = [], 0
+    for result in results:
+        expected = gold["scores"].get(result.model, {})
+        for key in INDICATORS[result.indicator].output_keys:
+            if key not in expected:
+                continue
+            total += 1
+            block = (result.scores or {}).get(key) or {}
+            if not result.error and block.get("raw_score") in VALID_SCORES:
+                compared.append((expected[key], block["raw_score"]))
+    matches = sum(1 for expected, score in compared if expected == score)
+    return {
+        "blocks": total,
+        "scored": len(compared),
+        "exact_match": matches / total if total else None,
+        "kappa": weighted_kappa(compared),
+    }
+
+
+def recorded(path: Path, keys: set[str]) -> dict:
+    """Tokens, judge time and cost of the journaled responses ``keys``, and the last live wall time."""
+    live = [sweep["wall"] for sweep in sweeps(path) if sweep.get("calls")]
+    totals = {"prompt_tokens": 0, "completion_tokens": 0, "judge_seconds": 0.0, "cost": 0.0, "wall_seconds": live[-1] if live else None}
+    responses = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("type") == "response" and record["key"] in keys:
+                responses[record["key"]] = record
+    for record in responses.values():
+        usage = usage_dict(ChatCompletion.model_validate_json(record["response"])) or {}
+        totals["prompt_tokens"] += usage.get("prompt_tokens") or 0
+        totals["completion_tokens"] += usage.get("completion_tokens") or 0
+        totals["judge_seconds"] += record.get("elapsed") or 0.0
+        cost = telemetry.estimate_cost(record.get("judge"), usage)
+        totals["cost"] = None if cost is None or totals["cost"] is None else totals["cost"] + cost
+    return totals
+
+
+def sweeps(path: Path) -> list[dict]:
+    """The sweep records of the journal at ``path``, oldest first."""
+    if not Path(path).exists():
+        return []
+    found = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("type") == "sweep":
+                found.append(record)
+    return found
+
+
+async def run_variant(name: str, overrides: dict, pairs, client, gold: dict, base: engine.RunConfig) -> dict:
+    """Evaluate ``pairs`` with one variant and return its report row."""
+    directory = ACCURACY_DIR / name
+    config = replace(
+        base, **overrides, scores_dir=directory, journal=None, run_log=None, store_path=None, record_manifest=False
+    )
+    path = directory / "journal.jsonl"
+    if isinstance(client, OfflineClient):
+        previous = sweeps(path)
+        client = OfflineClient(previous[-1]["base_url"] if previous else client.base_url)
+    with journal.journaling(path) as recording:
+        before = len(recording.responses)
+        start = time.perf_counter()
+        results = await engine.run_matrix(pairs, client=client, config=config)
+        wall = time.perf_counter() - start
+        live = len(recording.responses) - before
+        recording.write({"type": "sweep", "base_url": str(client.base_url), "wall": round(wall, 3), "calls": live})
+    row = {
+        "variant": name,
+        "overrides": overrides,
+        "errors": sum(1 for result in results if result.error),
+        "live_calls": live,
+        "replayed": recording.replayed,
+        **agreement(gold, results),
+        **recorded(path, recording.used),
+    }
+    if row["wall_seconds"] is None:
+        row["wall_seconds"] = round(wall, 3)
+    return row
+
+
+def pareto(rows: list[dict]) -> None:
+    """Mark the rows no other row beats on both exact match and cost."""
+    for row in rows:
+        row["pareto"] = row["exact_match"] is not None and row["cost"] is not None and not any(
+            other is not row
+            and other["exact_match"] is not None
+            and other["cost"] is not None
+            and other["exact_match"] >= row["exact_match"]
+            and other["cost"] <= row["cost"]
+            and (other["exact_match"] > row["exact_match"] or other["cost"] < row["cost"])
+            for other in rows
+        )
+
+
+async def run_benchmark(variants: dict[str, dict], client, gold: dict, base: engine.RunConfig, models=None, indicators=None) -> dict:
+    """Run every variant; a variant that raises is listed under ``failed`` with its error."""
+    pairs = gold_pairs(gold, models, indicators)
+    rows, failed = [], []
+    for name, overrides in variants.items():
+        try:
+            rows.append(await run_variant(name, overrides, pairs, client, gold, base))
+        except Exception as exc:
+            failed.append({"variant": name, "error": f"{type(exc).__name__}: {exc}"})
+    pareto(rows)
+    return {
+        "gold": {"seeded": gold["seeded"], "sources": gold["sources"]},
+        "pairs": len(pairs),
+        "variants": rows,
+        "failed": failed,
+    }
+
+
+def format_report(report: dict) -> str:
+    columns = ("variant", "exact", "kappa", "prompt_tok", "compl_tok", "wall_s", "judge_s", "cost_usd", "errors", "pareto")
+    lines = ["  ".join(f"{name:>14}" for name in columns)]
+    for row in sorted(report["variants"], key=lambda row: (row["cost"] is None, row["cost"] or 0)):
+        cells = (
+            row["variant"],
+            "n/a" if row["exact_match"] is None else f"{row['exact_match']:.0%} ({row['scored']}/{row['blocks']})",
+            "n/a" if row["kappa"] is None else f"{row['kappa']:.2f}",
+            row["prompt_tokens"],
+            row["completion_tokens"],
+            f"{row['wall_seconds']:.1f}",
+            f"{row['judge_seconds']:.1f}",
+            "n/a" if row["cost"] is None else f"{row['cost']:.4f}",
+            row["errors"],
+            "*" if row["pareto"] else "",
+        )
+        lines.append("  ".join(f"{cell:>14}" for cell in cells))
+    return "\n".join(lines)
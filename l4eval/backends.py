@@ -0,0 +1,88 @@
+"""Registry of judge backends sharing one pooled HTTP transport.
+
+A backend is an OpenAI-compatible endpoint plus the model to ask there.  The
+registered ones cover the DeepSeek judges and a local OpenAI-compatible
+server (vLLM, llama.cpp, Ollama ...); any other endpoint can be given as
+``MODEL@URL``.
+
+Every backend's client is built on the same ``httpx`` client, so connections
+are pooled and kept alive across calls and across judges, and multiplexed over
+HTTP/2 when the optional ``h2`` package is installed.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+try:
+    # Newer openai releases are built on httpx2.
+    import httpx2 as httpx
+    from openai import DefaultAsyncHttpx2Client as DefaultAsyncHttpClient
+except ImportError:
+    import httpx
+    from openai import DefaultAsyncHttpxClient as DefaultAsyncHttpClient
+
+from .judge import BASE_URL
+
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE = 32
+KEEPALIVE_SECONDS = 60.0
+LOCAL_BASE_URL = "http://127.0.0.1:8000/v1"
+
+
+@dataclass(frozen=True)
+class Backend:
+    name: str
+    model: str
+    base_url: str
+    api_key_env: str = "DEEPSEEK_API_KEY"
+
+    def api_key(self, default: str | None = None) -> str:
+        # An explicit --api-key wins over the environment.  Local servers
+        # ignore the key, but the client refuses an empty one.
+        return default or os.environ.get(self.api_key_env) or "unused"
+
+
+BACKENDS = {
+    "deepseek-chat": Backend("deepseek-chat", "deepseek-chat", BASE_URL),
+    "deepseek-reasoner": Backend("deepseek-reasoner", "deepseek-reasoner", BASE_URL),
+    "local": Backend("local", "local", LOCAL_BASE_URL, "L4EVAL_LOCAL_API_KEY"),
+}
+
+
+def resolve(spec: str) -> Backend:
+    """A registered backend by name, or an ad-hoc one written ``MODEL@URL``."""
+    if spec in BACKENDS:
+        return BACKENDS[spec]
+    model, at, base_url = spec.partition("@")
+    if not (at and model and base_url):
+        raise ValueError(f"unknown judge backend {spec!r}; expected one of {sorted(BACKENDS)} or MODEL@URL")
+    # The name doubles as the directory of the backend's score files.
+    host = urlsplit(base_url).netloc or base_url
+    name = re.sub(r"[^\w.@-]+", "_", f"{model}@{host}")
+    return Backend(name, model, base_url, api_key_env="L4EVAL_API_KEY")
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def shared_http_client(max_connections: int = MAX_CONNECTIONS, max_keepalive: int = MAX_KEEPALIVE):
+    """One pooled, keep-alive ``httpx`` client for every judge client of a run.
+
+    Create it once per event loop: the pooled connections belong to the loop
+    that opened them.
+    """
+    return DefaultAsyncHttpClient(
+        http2=http2_available(),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=KEEPALIVE_SECONDS,
+        ),
+    )
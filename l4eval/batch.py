@@ -0,0 +1,234 @@
+"""Provider Batch API mode for large offline sweeps.
+
+``compile_requests`` turns the evaluation matrix into a batch JSONL file,
+one chat-completion request per (model, indicator, sample) with a
+``custom_id`` of the form ``gpt4o:coverage:0``.  ``submit`` uploads it and
+creates the batch; ``wait`` polls it and downloads the results file; and
+``ingest`` routes every result line through the same validation, repair,
+voting, quote verification and score writing as the live mode.
+
+Batches are scheduled by the provider within its completion window at batch
+pricing, so a sweep sends no interactive traffic and needs no client-side
+rate limiting.  The state of each batch (ids, run settings and the manifest
+fingerprints taken at compile time) is kept in ``.l4eval/batches/``.
+"""
+
+import asyncio
+import dataclasses
+import json
+import time
+from pathlib import Path
+
+from openai.types.chat import ChatCompletion
+
+from . import engine, manifest, telemetry, voting
+from .judge import usage_dict
+from .prompting import build_messages
+from .registry import INDICATORS, MODELS, REPO_ROOT, Indicator, Model
+
+BATCHES_DIR = REPO_ROOT / ".l4eval" / "batches"
+ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+POLL_SECONDS = 60.0
+TERMINAL = frozenset({"completed", "failed", "expired", "cancelled"})
+# Share of list prices charged for batch requests by providers with batch pricing.
+BATCH_DISCOUNT = 0.5
+
+
+def custom_id(model: Model, indicator: Indicator, sample: int = 0) -> str:
+    return f"{model.key}:{indicator.key}:{sample}"
+
+
+def parse_custom_id(value: str) -> tuple[Model, Indicator, int]:
+    model_key, indicator_key, sample = value.split(":")
+    return MODELS[model_key], INDICATORS[indicator_key], int(sample)
+
+
+def compile_requests(pairs: list[tuple[Model, Indicator]], config: engine.RunConfig) -> tuple[list[dict], dict]:
+    """Batch request lines for ``pairs`` and the manifest fingerprints of their inputs."""
+    if config.context == "mapreduce" or config.batched or config.stream:
+        raise ValueError("batch mode sends one independent request per pair; mapreduce, batched and stream are not supported")
+    texts = engine.pair_texts(pairs, config)
+    lines = []
+    for model, indicator in pairs:
+        messages = build_messages(model, indicator, texts[model.key, indicator.key], config.layout)
+        for sample in range(config.samples):
+            lines.append(
+                {
+                    "custom_id": custom_id(model, indicator, sample),
+                    "method": "POST",
+                    "url": ENDPOINT,
+                    "body": engine.request_params(messages, config),
+                }
+            )
+    fingerprints = {
+        manifest.pair_key(model, indicator): manifest.fingerprint(model, indicator, texts[model.key, indicator.key], config)
+        for model, indicator in pairs
+    }
+    return lines, fingerprints
+
+
+def state_path(name: str) -> Path:
+    return BATCHES_DIR / f"{name}.json"
+
+
+def save_state(state: dict) -> None:
+    BATCHES_DIR.mkdir(parents=True, exist_ok=True)
+    with open(state_path(state["name"]), "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+
+def load_state(name: str) -> dict:
+    with open(state_path(name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_config(state: dict, **overrides) -> engine.RunConfig:
+    """The ``RunConfig`` a batch was compiled with."""
+    settings = {**state["config"], **overrides}
+    for name in ("documents_dir", "scores_dir", "run_log"):
+        if settings.get(name) is not None:
+            settings[name] = Path(settings[name])
+    settings["prune"] = tuple(settings.get("prune", ()))
+    return engine.RunConfig(**settings)
+
+
+def write_requests(pairs: list[tuple[Model, Indicator]], config: engine.RunConfig, name: str | None = None) -> dict:
+    """Compile the batch file and its state without submitting it."""
+    name = name or time.strftime("batch-%Y%m%d-%H%M%S")
+    lines, fingerprints = compile_requests(pairs, config)
+    BATCHES_DIR.mkdir(parents=True, exist_ok=True)
+    input_path = BATCHES_DIR / f"{name}.jsonl"
+    with open(input_path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+    settings = {**dataclasses.asdict(config), "run_log": None, "journal": None}
+    state = {
+        "name": name,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "requests": len(lines),
+        "input_path": str(input_path),
+        "config": json.loads(json.dumps(settings, default=str)),
+        "fingerprints": fingerprints,
+        "batch_id": None,
+        "status": "compiled",
+    }
+    save_state(state)
+    return state
+
+
+async def submit(client, state: dict) -> dict:
+    """Upload the batch file and create the batch; ``client`` must be a plain ``AsyncOpenAI``."""
+    with open(state["input_path"], "rb") as f:
+        uploaded = await client.files.create(file=(Path(state["input_path"]).name, f.read()), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=uploaded.id,
+        endpoint=ENDPOINT,
+        completion_window=COMPLETION_WINDOW,
+        metadata={"l4eval": state["name"]},
+    )
+    state.update(input_file_id=uploaded.id, batch_id=batch.id, status=batch.status)
+    save_state(state)
+    return state
+
+
+async def wait(client, state: dict, poll_seconds: float = POLL_SECONDS, block: bool = True) -> dict:
+    """Poll the batch until it ends (or once, without ``block``) and download its results."""
+    while True:
+        batch = await client.batches.retrieve(state["batch_id"])
+        state["status"] = batch.status
+        counts = batch.request_counts
+        if counts is not None:
+            state["request_counts"] = {"total": counts.total, "completed": counts.completed, "failed": counts.failed}
+        if batch.status in TERMINAL or not block:
+            break
+        await asyncio.sleep(poll_seconds)
+    for kind, file_id in (("output", batch.output_file_id), ("error", batch.error_file_id)):
+        if file_id:
+            path = BATCHES_DIR / f"{state['name']}.{kind}.jsonl"
+            content = await client.files.content(file_id)
+            path.write_bytes(content.content)
+            state[f"{kind}_path"] = str(path)
+    save_state(state)
+    return state
+
+
+def read_results(*paths) -> list[dict]:
+    lines = []
+    for path in paths:
+        if path is None:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            lines.extend(json.loads(line) for line in f if line.strip())
+    return lines
+
+
+async def ingest(client, lines: list[dict], state: dict, config: engine.RunConfig) -> list[engine.Result]:
+    """Validate, vote on and write the answers in batch result ``lines``.
+
+    ``client`` is only used for JSON fix follow-ups on invalid answers.
+    Pairs of the batch without any usable answer get an error result.
+    """
+    answers: dict[str, list] = {pair: [] for pair in state["fingerprints"]}
+    for line in lines:
+        model, indicator, sample = parse_custom_id(line["custom_id"])
+        answers.setdefault(manifest.pair_key(model, indicator), []).append((sample, line))
+
+    semaphore = asyncio.Semaphore(config.concurrency)
+    with telemetry.tracing(config.run_log):
+        results = await asyncio.gather(
+            *(_ingest_pair(client, key, sorted(items, key=lambda item: item[0]), semaphore, config) for key, items in answers.items())
+        )
+        written = [result for result in results if result.output_path is not None]
+        if config.record_manifest and written:
+            manifest.record(
+                config.scores_dir,
+                [
+                    (MODELS[result.model], INDICATORS[result.indicator], state["fingerprints"][f"{result.model}/{result.indicator}"], result.output_path)
+                    for result in written
+                    if f"{result.model}/{result.indicator}" in state["fingerprints"]
+                ],
+            )
+    engine.record_store(results, config, source="batch")
+    return list(results)
+
+
+async def _ingest_pair(client, key: str, items: list, semaphore, config: engine.RunConfig) -> engine.Result:
+    model_key, indicator_key = key.split("/")
+    model, indicator = MODELS[model_key], INDICATORS[indicator_key]
+    result = engine.Result(model.key, indicator.key, attempts=len(items))
+    answers, failures = [], []
+    with telemetry.span("evaluate", model=model.key, indicator=indicator.key, batch=True):
+        for sample, line in items:
+            response = line.get("response") or {}
+            if line.get("error") or response.get("status_code") != 200:
+                error = line.get("error") or {"message": f"HTTP {response.get('status_code')}"}
+                failures.append(f"sample {sample}: {error.get('message', error)}")
+                continue
+            completion = ChatCompletion.model_validate(response["body"])
+            usage = usage_dict(completion)
+            with telemetry.span("request", purpose="batch", judge=config.judge, sample=sample):
+                telemetry.record_usage(config.judge, usage, BATCH_DISCOUNT)
+            result.usage = voting.add_usage(result.usage, usage)
+            raw_output = result.raw_output = completion.choices[0].message.content
+            try:
+                scores = await engine.validate_answer(client, indicator, raw_output, semaphore, config, result, sample)
+            except engine.InvalidAnswer as exc:
+                failures.append(f"sample {sample}: {exc}")
+                continue
+            answers.append((scores, raw_output))
+        if not answers:
+            result.error = "; ".join(failures) or "no response in the batch results"
+            return result
+        if len(answers) > 1:
+            result.scores, representative = voting.combine([scores for scores, _ in answers], indicator.output_keys)
+            result.raw_output = answers[representative][1]
+            result.votes = {key: result.scores[key]["votes"] for key in indicator.output_keys}
+        else:
+            result.scores = answers[0][0]
+        engine.finish(model, indicator, config, result)
+    return result
+
+
+def estimated_cost(results: list[engine.Result], judge: str) -> float:
+    return sum(telemetry.estimate_cost(judge, result.usage, BATCH_DISCOUNT) or 0 for result in results)
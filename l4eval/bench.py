@@ -0,0 +1,148 @@
+"""End-to-end benchmark of the engine against the offline mock judge.
+
+Each concurrency level runs a full sweep in a fresh child process (so peak
+RSS is per level) against a mock server started in the parent, and reports
+sweep wall-clock time, p50/p95/p99 per-call latency, request bytes sent and
+peak RSS.  A previous JSON report can be given as a baseline to fail on
+wall-clock regressions, which makes the suite usable in CI without network.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import resource
+import tempfile
+import time
+import types
+from dataclasses import asdict
+from pathlib import Path
+
+from . import engine, judge, mockserver, ratelimit, registry
+from .telemetry import percentile
+
+LEVELS = (1, 4, 8)
+TOLERANCE = 0.25
+
+
+class _TimedStream:
+    def __init__(self, stream, start: float, record):
+        self._stream = stream
+        self._start = start
+        self._record = record
+        self._done = False
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        finally:
+            self._finish()
+
+    async def close(self):
+        self._finish()
+        await self._stream.close()
+
+    def _finish(self):
+        if not self._done:
+            self._done = True
+            self._record(time.perf_counter() - self._start)
+
+
+class _TimedCompletions:
+    def __init__(self, owner: "TimingClient"):
+        self._owner = owner
+
+    async def create(self, **params):
+        owner = self._owner
+        owner.bytes_sent += len(json.dumps(params, ensure_ascii=False).encode("utf-8"))
+        start = time.perf_counter()
+        response = await owner.client.chat.completions.create(**params)
+        if params.get("stream"):
+            return _TimedStream(response, start, owner.latencies.append)
+        owner.latencies.append(time.perf_counter() - start)
+        return response
+
+
+class TimingClient:
+    """Records the latency and request size of every call it forwards."""
+
+    def __init__(self, client):
+        self.client = client
+        self.latencies: list[float] = []
+        self.bytes_sent = 0
+        self.chat = types.SimpleNamespace(completions=_TimedCompletions(self))
+
+    @property
+    def base_url(self):
+        return self.client.base_url
+
+
+async def _sweep(base_url: str, level: int, run_options: dict, models, indicators) -> dict:
+    raw = judge.make_client("mock", base_url, max_retries=0)
+    scheduler = ratelimit.Scheduler(initial_concurrency=level, max_concurrency=level)
+    client = TimingClient(ratelimit.ScheduledClient(raw, scheduler))
+    with tempfile.TemporaryDirectory() as scores_dir:
+        config = engine.RunConfig(concurrency=level, scores_dir=Path(scores_dir), **run_options)
+        start = time.perf_counter()
+        results = await engine.run_matrix(registry.select(models, indicators), client=client, config=config)
+        wall = time.perf_counter() - start
+    await raw.close()
+    return {
+        "concurrency": level,
+        "wall_seconds": round(wall, 3),
+        "calls": len(client.latencies),
+        "errors": sum(1 for result in results if result.error),
+        "p50": round(percentile(client.latencies, 50), 3),
+        "p95": round(percentile(client.latencies, 95), 3),
+        "p99": round(percentile(client.latencies, 99), 3),
+        "bytes_sent": client.bytes_sent,
+        "retries": scheduler.stats["retries"],
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def _child(queue, base_url: str, level: int, run_options: dict, models, indicators) -> None:
+    queue.put(asyncio.run(_sweep(base_url, level, run_options, models, indicators)))
+
+
+def run_benchmark(
+    levels=LEVELS,
+    mock_config: mockserver.MockConfig | None = None,
+    run_options: dict | None = None,
+    models=None,
+    indicators=None,
+) -> dict:
+    server, base_url = mockserver.start_in_background(mock_config)
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    try:
+        for level in levels:
+            queue = context.Queue()
+            process = context.Process(target=_child, args=(queue, base_url, level, run_options or {}, models, indicators))
+            process.start()
+            rows.append(queue.get())
+            process.join()
+    finally:
+        server.shutdown()
+    return {"mock": asdict(mock_config or mockserver.MockConfig()), "run_options": run_options or {}, "levels": rows}
+
+
+def regressions(report: dict, baseline: dict, tolerance: float = TOLERANCE) -> list[str]:
+    """Levels whose wall-clock time grew by more than ``tolerance``."""
+    previous = {row["concurrency"]: row for row in baseline.get("levels", [])}
+    found = []
+    for row in report["levels"]:
+        old = previous.get(row["concurrency"])
+        if old and row["wall_seconds"] > old["wall_seconds"] * (1 + tolerance):
+            found.append(
+                f"concurrency {row['concurrency']}: {row['wall_seconds']}s vs baseline {old['wall_seconds']}s"
+            )
+    return found
+
+
+def format_report(report: dict) -> str:
+    columns = ("concurrency", "wall_seconds", "calls", "errors", "p50", "p95", "p99", "bytes_sent", "retries", "peak_rss_mb")
+    lines = ["  ".join(f"{name:>12}" for name in columns)]
+    for row in report["levels"]:
+        lines.append("  ".join(f"{row[name]:>12}" for name in columns))
+    return "\n".join(lines)
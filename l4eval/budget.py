@@ -0,0 +1,194 @@
+"""Token-budgeted packing of documents into the judge's context window.
+
+``read_txt(..., max_chars=150000)`` cuts every document at the same character
+count whatever the judge's window or the number of documents.  Here the system
+prompt, the instructions and the expected output are counted first, and the
+tokens that remain are shared between the documents by priority (lower number
+first; equal priorities split evenly, with unused share passed on).  Every
+cut is reported, and the assembled prompt is re-counted against the budget.
+
+Tokens are counted with the judge's own ``tiktoken`` encoding when tiktoken
+knows the judge, else with ``o200k_base``, else estimated from characters;
+``SAFETY_MARGIN`` covers the usual gap to the judge's tokenizer.  Should the
+provider still reject a packed prompt as too long, the engine re-packs it to
+the size the provider reports and retries once (see ``repacking``).
+"""
+
+import contextlib
+import contextvars
+import math
+import re
+from dataclasses import dataclass
+
+CONTEXT_WINDOW = 128000
+OUTPUT_RESERVE = 32000
+# Headroom for the gap between the counting tokenizer and the judge's own.
+SAFETY_MARGIN = 0.10
+MESSAGE_OVERHEAD = 4
+# Without a real tokenizer, assume at most this many characters per token;
+# English prose averages closer to 4, so the estimate errs on the safe side.
+CHARS_PER_TOKEN = 3.0
+TRUNCATION_MARKER = "\n\n[TRUNCATED TO FIT THE CONTEXT BUDGET: {dropped} of {total} tokens omitted]"
+# Shrink factor when the provider's error does not give the token counts.
+REPACK_FACTOR = 0.8
+
+_OVERFLOW = re.compile(r"maximum context length is (\d+) tokens.*?(?:requested|resulted in) (\d+) tokens", re.S)
+_repack: contextvars.ContextVar = contextvars.ContextVar("l4eval_repack", default=None)
+
+
+class Tokenizer:
+    """Counts tokens with ``tiktoken`` when available, else estimates them.
+
+    ``judge`` selects the encoding tiktoken uses for that model; judges it
+    does not know (DeepSeek) are counted with ``encoding``.
+    """
+
+    def __init__(self, judge: str | None = None, encoding: str = "o200k_base"):
+        try:
+            import tiktoken
+
+            try:
+                self.encoding = tiktoken.encoding_for_model(judge) if judge else tiktoken.get_encoding(encoding)
+            except KeyError:
+                self.encoding = tiktoken.get_encoding(encoding)
+        except Exception:
+            self.encoding = None
+
+    @property
+    def name(self) -> str:
+        if self.encoding is not None:
+            return f"{self.encoding.name} (approximate)"
+        return f"estimate ({CHARS_PER_TOKEN} chars/token)"
+
+    def count(self, text: str) -> int:
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    def head(self, text: str, tokens: int) -> str:
+        """Longest line-aligned prefix of ``text`` with at most ``tokens`` tokens."""
+        if tokens <= 0:
+            return ""
+        if self.encoding is not None:
+            ids = self.encoding.encode(text, disallowed_special=())
+            if len(ids) <= tokens:
+                return text
+            prefix = self.encoding.decode(ids[:tokens])
+        else:
+            prefix = text[: int(tokens * CHARS_PER_TOKEN)]
+            if len(prefix) == len(text):
+                return text
+        cut = prefix.rfind("\n")
+        return prefix[: cut + 1] if cut > 0 else prefix
+
+
+def count_messages(tokenizer: Tokenizer, messages: list[dict]) -> int:
+    return sum(tokenizer.count(message["content"]) + MESSAGE_OVERHEAD for message in messages) + 3
+
+
+@dataclass
+class Allocation:
+    filename: str
+    priority: int
+    total_tokens: int
+    kept_tokens: int
+    kept_chars: int
+    total_chars: int
+
+    @property
+    def dropped_tokens(self) -> int:
+        return self.total_tokens - self.kept_tokens
+
+    def describe(self) -> str:
+        if not self.dropped_tokens:
+            return f"{self.filename}: kept all {self.total_tokens} tokens"
+        return (
+            f"{self.filename}: kept {self.kept_tokens}/{self.total_tokens} tokens, "
+            f"dropped characters {self.kept_chars}-{self.total_chars}"
+        )
+
+
+def allocate(sizes: dict[str, int], priorities: dict[str, int], budget: int) -> dict[str, int]:
+    """Split ``budget`` tokens across documents of the given ``sizes``.
+
+    Priority tiers are served in order; within a tier the budget is shared
+    max-min fairly, so short documents are kept whole and the rest is split
+    evenly between the longer ones.
+    """
+    shares = {name: 0 for name in sizes}
+    remaining = max(budget, 0)
+    for priority in sorted(set(priorities[name] for name in sizes)):
+        tier = sorted((name for name in sizes if priorities[name] == priority), key=lambda name: sizes[name])
+        for position, name in enumerate(tier):
+            fair = remaining // (len(tier) - position)
+            shares[name] = min(sizes[name], fair)
+            remaining -= shares[name]
+    return shares
+
+
+def pack(
+    texts: dict[str, str],
+    priorities: dict[str, int],
+    build,
+    tokenizer: Tokenizer,
+    context_window: int = CONTEXT_WINDOW,
+    output_reserve: int = OUTPUT_RESERVE,
+) -> tuple[dict[str, str], list[Allocation]]:
+    """Cut ``texts`` so that ``build(texts)`` fits the context window.
+
+    ``build`` turns a ``{filename: text}`` mapping into the request messages;
+    it is used to measure the fixed prompt overhead and to verify the result.
+    """
+    limit = int((context_window - output_reserve) * (1 - SAFETY_MARGIN))
+    overhead = count_messages(tokenizer, build({name: "" for name in texts}))
+    sizes = {name: tokenizer.count(text) for name, text in texts.items()}
+    marker = tokenizer.count(TRUNCATION_MARKER.format(dropped=10**6, total=10**6))
+    budget = limit - overhead
+    while True:
+        shares = allocate(sizes, priorities, budget)
+        packed, allocations = {}, []
+        for name, text in texts.items():
+            kept = text if shares[name] >= sizes[name] else tokenizer.head(text, shares[name] - marker)
+            kept_tokens = tokenizer.count(kept)
+            packed[name] = kept
+            if len(kept) < len(text):
+                packed[name] += TRUNCATION_MARKER.format(dropped=sizes[name] - kept_tokens, total=sizes[name])
+            allocations.append(Allocation(name, priorities[name], sizes[name], kept_tokens, len(kept), len(text)))
+        excess = count_messages(tokenizer, build(packed)) - limit
+        if excess <= 0:
+            return packed, allocations
+        if budget <= 0:
+            raise ValueError(f"prompt overhead of {overhead} tokens leaves no room in a {context_window}-token window")
+        budget -= excess
+
+
+def overflow(exc: Exception) -> float | None:
+    """Share of its size a request rejected as too long must shrink to; ``None`` for other errors."""
+    message = str(exc)
+    if getattr(exc, "code", None) != "context_length_exceeded" and "maximum context length" not in message:
+        return None
+    match = _OVERFLOW.search(message)
+    if match is None:
+        return REPACK_FACTOR
+    limit, requested = int(match.group(1)), int(match.group(2))
+    # The provider's count includes the completion, so leave some slack.
+    return min(0.95 * limit / requested, REPACK_FACTOR) if requested else REPACK_FACTOR
+
+
+@contextlib.contextmanager
+def repacking(repack):
+    """Make ``repack(factor)`` the re-packing of the enclosed pair's judge messages.
+
+    ``repack`` returns the messages packed to ``factor`` of the document
+    budget; ``engine.complete`` calls it when the provider rejects a prompt
+    as too long.
+    """
+    token = _repack.set(repack)
+    try:
+        yield repack
+    finally:
+        _repack.reset(token)
+
+
+def current_repack():
+    return _repack.get()
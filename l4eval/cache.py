@@ -0,0 +1,235 @@
+"""Persistent, content-addressed cache for judge responses.
+
+Responses are keyed on everything that determines a completion: the judge
+model, the messages, the sampling parameters and the provider base URL.  They
+live in a local SQLite file; once the stored payloads exceed ``max_bytes`` the
+least recently used entries are evicted.
+
+``CachingClient`` wraps an ``AsyncOpenAI`` client and is a drop-in replacement
+for it, so ``response.choices[0].message.content`` works the same on a cached
+response as on a live one.  The key does not depend on the transport: a
+streamed answer is stored, once fully received, under the key of the same
+non-streamed request, and a cached answer is replayed to a streaming caller
+as a stream.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+import types
+from pathlib import Path
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from . import telemetry
+from .registry import REPO_ROOT
+
+CACHE_DIR = REPO_ROOT / ".l4eval"
+CACHE_PATH = CACHE_DIR / "responses.sqlite3"
+MAX_BYTES = 512 * 1024 * 1024
+
+
+def cache_key(base_url: str, params: dict) -> str:
+    payload = json.dumps({"base_url": str(base_url), **params}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path: str | Path = CACHE_PATH, max_bytes: int = MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._db = sqlite3.connect(self.path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._db.commit()
+
+    def get(self, key: str) -> str | None:
+        row = self._db.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+        self._db.commit()
+        return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (key, response, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+            (key, response, len(response.encode("utf-8")), now, now),
+        )
+        self._evict()
+        self._db.commit()
+
+    def _evict(self) -> None:
+        total = self.size()
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def size(self) -> int:
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        self._db.execute("DELETE FROM responses")
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def is_hit(response) -> bool:
+    """Whether ``response`` was served from the cache rather than the provider."""
+    return getattr(response, "_l4eval_cache_hit", False)
+
+
+class _ReplayedStream:
+    """A cached completion served to a streaming caller as one content chunk and a usage chunk."""
+
+    _l4eval_cache_hit = True
+
+    def __init__(self, response: ChatCompletion):
+        self.response = response
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def _chunks(self):
+        response = self.response
+        header = {"id": response.id, "object": "chat.completion.chunk", "created": response.created, "model": response.model}
+        for choice in response.choices:
+            delta = {"role": "assistant", "content": choice.message.content}
+            reasoning = getattr(choice.message, "reasoning_content", None)
+            if reasoning:
+                delta["reasoning_content"] = reasoning
+            yield ChatCompletionChunk.model_validate(
+                {**header, "choices": [{"index": choice.index, "delta": delta, "finish_reason": choice.finish_reason}]}
+            )
+        if response.usage is not None:
+            yield ChatCompletionChunk.model_validate({**header, "choices": [], "usage": response.usage.model_dump()})
+
+    async def close(self) -> None:
+        pass
+
+
+class _RecordingStream:
+    """A live stream that stores the assembled completion once it has been read to the end.
+
+    A stream closed early (an aborted answer) is not stored.
+    """
+
+    def __init__(self, stream, cache: ResponseCache, key: str):
+        self.stream = stream
+        self.cache = cache
+        self.key = key
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def _chunks(self):
+        chunks = []
+        async for chunk in self.stream:
+            chunks.append(chunk)
+            yield chunk
+        if chunks:
+            self.cache.put(self.key, _assemble(chunks).model_dump_json())
+
+    async def close(self) -> None:
+        await self.stream.close()
+
+
+def _assemble(chunks: list) -> ChatCompletion:
+    content, reasoning = [], []
+    finish_reason, usage = "stop", None
+    for chunk in chunks:
+        if chunk.usage is not None:
+            usage = chunk.usage.model_dump()
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        finish_reason = choice.finish_reason or finish_reason
+        content.append(choice.delta.content or "")
+        reasoning.append(getattr(choice.delta, "reasoning_content", None) or "")
+    message = {"role": "assistant", "content": "".join(content)}
+    if any(reasoning):
+        message["reasoning_content"] = "".join(reasoning)
+    last = chunks[-1]
+    return ChatCompletion.model_validate(
+        {
+            "id": last.id,
+            "object": "chat.completion",
+            "created": last.created,
+            "model": last.model,
+            "choices": [{"index": 0, "finish_reason": finish_reason, "message": message}],
+            "usage": usage,
+        }
+    )
+
+
+class _CachedCompletions:
+    def __init__(self, owner: "CachingClient"):
+        self._owner = owner
+
+    async def create(self, **params):
+        owner = self._owner
+        if owner.bypass:
+            return await owner.client.chat.completions.create(**params)
+        stream = bool(params.get("stream"))
+        # Keyed as the non-streamed request: the answer does not depend on the transport.
+        keyed = {key: value for key, value in params.items() if key != "stream_options"}
+        key = cache_key(owner.client.base_url, {**keyed, "stream": False} if stream else keyed)
+        if not owner.refresh:
+            cached = owner.cache.get(key)
+            if cached is not None:
+                telemetry.annotate(cache="hit")
+                response = ChatCompletion.model_validate_json(cached)
+                if stream:
+                    return _ReplayedStream(response)
+                response._l4eval_cache_hit = True
+                return response
+        response = await owner.client.chat.completions.create(**params)
+        if stream:
+            return _RecordingStream(response, owner.cache, key)
+        owner.cache.put(key, response.model_dump_json())
+        return response
+
+
+class CachingClient:
+    """``AsyncOpenAI`` look-alike that serves repeated requests from ``cache``.
+
+    ``bypass`` skips the cache entirely; ``refresh`` always calls the provider
+    but stores the fresh response over the cached one.
+    """
+
+    def __init__(self, client, cache: ResponseCache, bypass: bool = False, refresh: bool = False):
+        self.client = client
+        self.cache = cache
+        self.bypass = bypass
+        self.refresh = refresh
+        self.chat = types.SimpleNamespace(completions=_CachedCompletions(self))
+
+    @property
+    def base_url(self):
+        return self.client.base_url
@@ -0,0 +1,148 @@
+"""Cost-aware judge cascade: a cheap judge first, the reasoner only when uncertain.
+
+In cascade mode every pair is first sent to a fast non-reasoning judge
+(``deepseek-chat`` by default) with the usual prompt plus a request for a
+self-reported ``confidence`` per indicator block.  Its answer is kept unless
+one of the escalation rules fires, in which case the pair is judged again by
+``config.judge`` as in a normal run:
+
+- ``invalid``: the cheap answer is still invalid after the JSON fix follow-ups;
+- ``confidence``: a block's confidence is missing or below the threshold;
+- ``borderline``: a block scored 0.5, the partial-credit band where the
+  judges disagree most;
+- ``quotes``: a positive score has no evidence quote that verifies against
+  the model's documents;
+- ``prescreen``: a positive score where the deterministic pre-screen found
+  none of the indicator's disclosure terms in the model's documents (e.g. no
+  SPDX or license metadata anywhere for L4-2).
+
+Score files record the decision in a ``cascade`` entry of every block.  The
+sweep report gives the escalation rate and the judge time and cost saved
+against sending every pair to the reasoner, whose cost and latency are
+estimated from the escalated pairs of the sweep, else from the run logs.
+"""
+
+import copy
+import re
+
+from . import telemetry
+from .prompting import model_documents
+from .registry import FMTI, Model
+
+CHEAP_JUDGE = "deepseek-chat"
+CONFIDENCE = 0.8
+BORDERLINE = 0.5
+REASONS = ("invalid", "confidence", "borderline", "quotes", "prescreen")
+
+CONFIDENCE_INSTRUCTION = """
+In addition, add to each indicator object a field "confidence": a number between 0 and 1 giving
+your confidence that a careful expert evaluator would assign the same raw_score.
+"""
+
+# Terms without which a document cannot disclose what the indicator asks for.
+PRESCREEN_TERMS = {
+    "indicator_L4_1": r"licen[cs]",
+    "indicator_L4_2": r"\bSPDX\b|licen[cs]e (?:metadata|identifier|tag)",
+    "indicator_L4_coverage": r"demographic|locale|dialect|multilingual|languages",
+    "indicator_L4_gaps": r"limitation|known (?:issue|gap)|shortcoming",
+    "indicator_L4_safety_critical": r"prohibit|disallow|usage polic|acceptable use|high[- ]risk|safety[- ]critical",
+}
+
+
+def confident_messages(messages: list[dict]) -> list[dict]:
+    """``messages`` with the confidence request appended to the last user turn."""
+    messages = copy.deepcopy(messages)
+    messages[-1]["content"] = f"{messages[-1]['content'].rstrip()}\n{CONFIDENCE_INSTRUCTION}"
+    return messages
+
+
+def prescreen(model: Model, index) -> dict[str, float | None]:
+    """Expected score per output key: 0 when none of its terms occur, else no opinion.
+
+    ``index`` is the ``quotes.QuoteIndex`` of the documents; the FMTI is not
+    searched, since it describes every indicator.
+    """
+    texts = [index.documents[document.filename].text for document in model_documents(model) if document != FMTI]
+    return {
+        key: None if any(re.search(pattern, text, re.IGNORECASE) for text in texts) else 0
+        for key, pattern in PRESCREEN_TERMS.items()
+    }
+
+
+def escalation_reasons(scores: dict, output_keys, expected: dict, threshold: float = CONFIDENCE) -> list[str]:
+    """The escalation rules fired by the cheap judge's annotated ``scores``."""
+    reasons = []
+    for key in output_keys:
+        block = scores[key]
+        score = block["raw_score"]
+        confidence = block.get("confidence")
+        if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) or confidence < threshold:
+            reasons.append("confidence")
+        if score == BORDERLINE:
+            reasons.append("borderline")
+        if score > 0 and not any(item.get("verification", {}).get("verified") for item in block["evidence"]):
+            reasons.append("quotes")
+        if score > 0 and expected.get(key) == 0:
+            reasons.append("prescreen")
+    return list(dict.fromkeys(reasons))
+
+
+def mark(scores: dict, output_keys, record: dict, cheap: dict | None) -> None:
+    """Record the cascade decision in a ``cascade`` entry of every block of ``scores``.
+
+    ``cheap`` is the cheap judge's answer, if it parsed; its confidences are
+    moved out of the blocks into the entry.
+    """
+    for key in output_keys:
+        answer = (cheap or {}).get(key) or {}
+        entry = {
+            "judge": record["judge"],
+            "escalated": record["escalated"],
+            "reasons": record["reasons"],
+            "cheap_score": answer.get("raw_score"),
+            "confidence": answer.get("confidence"),
+        }
+        scores[key].pop("confidence", None)
+        scores[key]["cascade"] = entry
+
+
+def report(results, judge: str, history=None) -> str:
+    """Escalation rate and the judge time and cost saved by the cascade.
+
+    ``results`` are engine results with a ``cascade`` record; ``history`` is
+    ``hedging.load_history(judge)``, used for the reasoner estimates when no
+    pair of the sweep was escalated.
+    """
+    cascaded = [result for result in results if result.cascade is not None]
+    escalated = [result for result in cascaded if result.cascade["escalated"]]
+    latencies, _, completions = history or ({}, {}, [])
+    spent = [result.elapsed for result in escalated if not result.error]
+    latency = sum(spent) / len(spent) if spent else None
+    if latency is None and any(latencies.values()):
+        latency = telemetry.percentile([value for values in latencies.values() for value in values], 50)
+    tokens = [(result.usage or {}).get("completion_tokens") for result in escalated]
+    tokens = [value for value in tokens if value] or completions
+    completion_tokens = sum(tokens) / len(tokens) if tokens else None
+
+    saved_cost = saved_time = 0.0
+    for result in cascaded:
+        cheap = result.cascade
+        cheap_cost = telemetry.estimate_cost(cheap["judge"], cheap["usage"]) or 0.0
+        if cheap["escalated"]:
+            saved_cost -= cheap_cost
+            saved_time -= cheap["elapsed"]
+            continue
+        if completion_tokens is not None:
+            usage = {**(cheap["usage"] or {}), "completion_tokens": completion_tokens}
+            saved_cost += (telemetry.estimate_cost(judge, usage) or 0.0) - cheap_cost
+        if latency is not None:
+            saved_time += latency - cheap["elapsed"]
+
+    reasons = {reason: sum(reason in result.cascade["reasons"] for result in escalated) for reason in REASONS}
+    rate = len(escalated) / len(cascaded) if cascaded else 0.0
+    line = f"{len(escalated)}/{len(cascaded)} pairs escalated to {judge} ({rate:.0%})"
+    if escalated:
+        line += " [" + ", ".join(f"{reason} {count}" for reason, count in reasons.items() if count) + "]"
+    time_text = f"{saved_time:+.1f}s" if latency is not None else "n/a (no reasoner latency yet)"
+    cost_text = f"{saved_cost:+.4f} USD" if completion_tokens is not None else "n/a (no reasoner usage yet)"
+    return f"{line}; saved vs. {judge} only: judge time {time_text}, cost {cost_text} estimated"
@@ -0,0 +1,769 @@
+"""Command-line entry point: ``python -m l4eval <command> ...``."""
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from . import (
+    accuracy,
+    backends,
+    batch,
+    bench,
+    budget,
+    cache,
+    cascade,
+    engine,
+    hedging,
+    journal,
+    judge,
+    mockserver,
+    output,
+    prompting,
+    pruning,
+    quotes,
+    ratelimit,
+    registry,
+    retrieval,
+    rubric,
+    store,
+    telemetry,
+    textnorm,
+)
+
+
+def _print_results(results: list[engine.Result]) -> None:
+    for result in results:
+        status = result.error or f"wrote {result.output_path}" + (" (batched)" if result.batched else "")
+        usage = result.usage or {}
+        tokens = ""
+        if usage.get("prompt_cache_hit_tokens") is not None:
+            tokens = f"  cache hit/miss {usage['prompt_cache_hit_tokens']}/{usage['prompt_cache_miss_tokens']} tokens"
+        ttft = f" (ttft {result.ttft:.1f}s)" if result.ttft is not None else ""
+        votes = ""
+        if result.votes:
+            votes = "  votes " + " ".join(f"{key}={counts}" for key, counts in result.votes.items())
+        if result.cascade is not None:
+            reasons = ",".join(result.cascade["reasons"])
+            votes += f"  escalated ({reasons})" if result.cascade["escalated"] else f"  by {result.cascade['judge']}"
+        print(f"[{result.model} / {result.indicator}] {result.elapsed:.1f}s{ttft}{tokens}{votes}  {status}")
+
+
+def _priority(value: str) -> tuple[str, int]:
+    filename, _, priority = value.rpartition("=")
+    if not filename:
+        raise argparse.ArgumentTypeError(f"expected FILE=N, got {value!r}")
+    return filename, int(priority)
+
+
+def _percentile(value: str) -> float:
+    pct = float(value)
+    if not 0 < pct < 100:
+        raise argparse.ArgumentTypeError(f"expected a percentile between 0 and 100 exclusive, got {value}")
+    return pct
+
+
+def _backend(value: str) -> backends.Backend:
+    try:
+        return backends.resolve(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
+def _journal_path(args: argparse.Namespace) -> Path | None:
+    if args.resume is not None:
+        path = journal.latest() if args.resume == "latest" else Path(args.resume)
+        if path is None or not path.exists():
+            raise SystemExit(f"no journal to resume from: {path or journal.JOURNALS_DIR}")
+        print(f"[journal] resuming from {path}")
+        return path
+    if args.no_journal:
+        return None
+    return args.journal or journal.default_path()
+
+
+def run_config(args: argparse.Namespace) -> engine.RunConfig:
+    return engine.RunConfig(
+        judge=args.judge,
+        temperature=args.temperature,
+        concurrency=args.concurrency,
+        context=args.context,
+        layout=args.layout,
+        warm_prefix=args.warm_prefix,
+        batched=args.batched,
+        stream=args.stream,
+        stream_retries=args.stream_retries,
+        json_mode=args.json_mode,
+        fix_judge=args.fix_judge,
+        fix_retries=args.fix_retries,
+        samples=args.samples,
+        agreement=args.agreement,
+        verify_quotes=args.verify_quotes,
+        map_judge=args.map_judge,
+        max_chars=args.max_chars,
+        normalize=args.normalize,
+        rubric=args.rubric,
+        hedge=args.hedge,
+        hedge_budget=args.hedge_budget,
+        cascade=args.cascade,
+        confidence=args.confidence,
+        prune=() if args.prune is None else tuple(dict.fromkeys(args.prune or pruning.CATEGORIES)),
+        top_k=args.top_k,
+        token_budget=args.token_budget,
+        context_window=args.context_window,
+        output_reserve=args.output_reserve,
+        priorities=dict(args.priority),
+        run_log=None if args.no_run_log else args.run_log or telemetry.default_log_path(),
+        journal=_journal_path(args),
+        store_path=None if args.no_store else args.store,
+        scores_dir=args.scores_dir,
+    )
+
+
+def _run(pairs, args: argparse.Namespace, config: engine.RunConfig) -> int:
+    if args.judges:
+        return _run_judges(pairs, args, config)
+    client = make_client(args, http_client=backends.shared_http_client())
+    results = asyncio.run(engine.run_matrix(pairs, client=client, config=config))
+    _print_results(results)
+    scheduler = find_scheduler(client)
+    if scheduler is not None:
+        print("[pacing] " + ", ".join(f"{key}={value:g}" for key, value in scheduler.stats.items()))
+    if config.run_log is not None:
+        print(f"[telemetry] spans written to {config.run_log}")
+    return 1 if any(result.error for result in results) else 0
+
+
+def _run_judges(pairs, args: argparse.Namespace, config: engine.RunConfig) -> int:
+    http_client = backends.shared_http_client()
+    clients = {}
+    for backend in dict.fromkeys(args.judges):
+        clients[backend] = make_client(args, backend, http_client)
+    results = asyncio.run(engine.run_judges(pairs, clients, config))
+    for name, judge_results in results.items():
+        print(f"== {name}")
+        _print_results(judge_results)
+    names = list(results)
+    print(f"\n{'model / block':<36}" + "".join(f"{name[:22]:>24}" for name in names))
+    for row in engine.compare_judges(results):
+        cells = []
+        for name in names:
+            cell = row["judges"].get(name)
+            if cell is None:
+                text = "-"
+            else:
+                text = f"{'error' if cell['error'] else cell['raw_score']} ({cell['elapsed']:.1f}s)"
+            cells.append(f"{text:>24}")
+        label = f"{row['model']} / {row['output_key']}"
+        print(f"{label:<36}" + "".join(cells))
+    print(f"[judges] comparison written to {Path(config.scores_dir) / engine.JUDGES_DIR / 'comparison.json'}")
+    return 1 if any(result.error for judge_results in results.values() for result in judge_results) else 0
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    config = run_config(args)
+    return _run(registry.select(args.models, args.indicators), args, config)
+
+
+def cmd_make(args: argparse.Namespace) -> int:
+    if args.judges:
+        print("make tracks one judge's score files; run --judges through 'run' instead")
+        return 2
+    config = run_config(args)
+    if args.adopt:
+        for model, indicator in engine.adopt_outputs(registry.select(args.models, args.indicators), config):
+            print(f"[{model.key} / {indicator.key}] adopted {indicator.output_file(model)}")
+        return 0
+    plan = engine.plan_matrix(registry.select(args.models, args.indicators), config)
+    for model, indicator in plan.reused:
+        print(f"[{model.key} / {indicator.key}] up to date, reusing {indicator.output_file(model)}")
+    for model, indicator in plan.stale:
+        reasons = "; ".join(plan.reasons[f"{model.key}/{indicator.key}"])
+        print(f"[{model.key} / {indicator.key}] stale: {reasons}")
+    print(f"[make] {len(plan.stale)} stale, {len(plan.reused)} reused")
+    if args.dry_run or not plan.stale:
+        return 0
+    return _run(plan.stale, args, config)
+
+
+def cmd_batch_submit(args: argparse.Namespace) -> int:
+    if args.cascade:
+        print("the judge cascade decides per pair after each answer; it cannot be compiled into a batch")
+        return 2
+    config = run_config(args)
+    state = batch.write_requests(registry.select(args.models, args.indicators), config, args.name)
+    print(f"[batch] {state['name']}: {state['requests']} requests written to {state['input_path']}")
+    if args.no_upload:
+        return 0
+
+    async def submit():
+        client = judge.make_client(args.api_key, args.base_url)
+        try:
+            return await batch.submit(client, state)
+        finally:
+            await client.close()
+
+    state = asyncio.run(submit())
+    print(f"[batch] {state['name']}: submitted as {state['batch_id']} ({state['status']})")
+    return 0
+
+
+def cmd_batch_collect(args: argparse.Namespace) -> int:
+    state = batch.load_state(args.name)
+    run_log = None if args.no_run_log else args.run_log or telemetry.default_log_path()
+    config = batch.run_config(state, run_log=run_log)
+    if args.results:
+        lines = batch.read_results(*args.results)
+    else:
+
+        async def poll():
+            client = judge.make_client(args.api_key, args.base_url)
+            try:
+                return await batch.wait(client, state, args.poll, block=args.wait)
+            finally:
+                await client.close()
+
+        state = asyncio.run(poll())
+        print(f"[batch] {state['name']}: {state['status']} {state.get('request_counts', '')}")
+        if state["status"] != "completed":
+            return 0 if state["status"] not in batch.TERMINAL else 1
+        lines = batch.read_results(state.get("output_path"), state.get("error_path"))
+
+    results = asyncio.run(batch.ingest(make_client(args), lines, state, config))
+    _print_results(results)
+    print(f"[batch] estimated cost {batch.estimated_cost(results, config.judge):.4f} USD at batch pricing")
+    if config.run_log is not None:
+        print(f"[telemetry] spans written to {config.run_log}")
+    return 1 if any(result.error for result in results) else 0
+
+
+def cmd_store(args: argparse.Namespace) -> int:
+    score_store = store.ScoreStore(args.store)
+    try:
+        if args.store_command == "import":
+            run_id, blocks = score_store.import_scores_dir(args.scores_dir, args.judge)
+            print(f"[store] imported {blocks} indicator blocks from {args.scores_dir} as run {run_id}")
+        elif args.store_command == "leaderboard":
+            rows = score_store.leaderboard(args.indicator, args.judge)
+            print(f"{'model':<10} {'blocks':>6} {'total':>6} {'mean':>6}")
+            for row in rows:
+                print(f"{row['model']:<10} {row['indicators']:>6} {row['total']:>6.2f} {row['mean']:>6.3f}")
+        elif args.store_command == "history":
+            for row in score_store.history(args.model, args.indicator, args.judge, args.limit):
+                when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["created"]))
+                votes = f"  votes {row['votes']}" if row["votes"] else ""
+                print(f"{when}  {row['raw_score']!s:>4}  judge={row['judge']}  run={row['run_id'][:12]}{votes}")
+        else:
+            for row in score_store.runs(args.limit):
+                when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["created"]))
+                print(f"{when}  {row['id'][:12]}  {row['source']:<6}  judge={row['judge']}  {row['blocks']} blocks")
+    finally:
+        score_store.close()
+    return 0
+
+
+def cmd_normalize(args: argparse.Namespace) -> int:
+    tokenizer = budget.Tokenizer()
+    print(f"token counts: {tokenizer.name}")
+    total_before = total_after = 0
+    for path in sorted(Path(args.documents_dir).glob("*.txt")):
+        text = path.read_text(encoding="utf-8")
+        normalized, report = textnorm.normalize(text)
+        before, after = tokenizer.count(text), tokenizer.count(normalized)
+        total_before += before
+        total_after += after
+        print(
+            f"{path.name}: {before} -> {after} tokens ({(before - after) / max(before, 1):.1%} saved), "
+            f"{report.unicode_changes} unicode fixes, {report.page_numbers} page numbers, "
+            f"{report.furniture_lines} header/footer lines, {report.dehyphenated} line-break hyphens, "
+            f"{report.segmented} glued runs split"
+        )
+        for example in report.examples[: args.examples]:
+            print(f"    {example}")
+        if args.write_dir:
+            Path(args.write_dir).mkdir(parents=True, exist_ok=True)
+            (Path(args.write_dir) / path.name).write_text(normalized, encoding="utf-8")
+        textnorm.save(text, normalized)
+    print(f"total: {total_before} -> {total_after} tokens ({(total_before - total_after) / max(total_before, 1):.1%} saved)")
+    return 0
+
+
+def cmd_rubric(args: argparse.Namespace) -> int:
+    config = run_config(args)
+    indicators = [registry.INDICATORS[key] for key in args.indicators or registry.INDICATORS]
+    text = engine.fmti_text(config)
+    full = retrieval.estimate_tokens(text)
+    if args.show:
+        records = {indicator.key: rubric.extract(indicator, text) for indicator in indicators}
+    else:
+        client = make_client(args)
+        records = asyncio.run(engine.distill_rubrics(indicators, client, config, force=args.force))
+    print(f"FMTI {rubric.fmti_digest(text)[:16]}: ~{full} tokens")
+    for indicator in indicators:
+        record = records[indicator.key]
+        tokens = retrieval.estimate_tokens(rubric.render(record, indicator))
+        rejected = f", {record['rejected']}/{record['proposed']} proposed passages rejected" if record["proposed"] else ""
+        print(
+            f"[{indicator.key}] {len(record['passages'])} passages ({record['method']}{rejected}), "
+            f"~{tokens} tokens ({1 - tokens / max(full, 1):.1%} smaller), "
+            f"summary: {'yes' if record['rubric_summary'] else 'no'}"
+        )
+    return 0
+
+
+def cmd_prune(args: argparse.Namespace) -> int:
+    tokenizer = budget.Tokenizer()
+    categories = args.categories or pruning.CATEGORIES
+    unknown = sorted(set(categories) - set(pruning.CATEGORIES))
+    if unknown:
+        print(f"unknown categories: {', '.join(unknown)}; choose from {', '.join(pruning.CATEGORIES)}")
+        return 1
+    print(f"token counts: {tokenizer.name}; pruning {', '.join(categories)}")
+    total_before = total_after = 0
+    for path in sorted(Path(args.documents_dir).glob("*.txt")):
+        text = path.read_text(encoding="utf-8")
+        if args.normalize:
+            text = textnorm.normalized(text)
+        pruned, spans = pruning.prune(text, categories)
+        before, after = tokenizer.count(text), tokenizer.count(pruned)
+        total_before += before
+        total_after += after
+        lines = text.split("\n")
+        removed = {}
+        for span in spans:
+            removed[span.category] = removed.get(span.category, 0) + tokenizer.count("\n".join(lines[span.start : span.end]))
+        detail = ", ".join(f"{category} {tokens}" for category, tokens in removed.items()) or "nothing"
+        print(f"{path.name}: {before} -> {after} tokens ({(before - after) / max(before, 1):.1%} saved; removed {detail})")
+        for span in spans:
+            if span.heading:
+                print(f"    {span.category}: lines {span.start + 1}-{span.end} under {span.heading!r}")
+        if args.diff:
+            Path(args.diff).mkdir(parents=True, exist_ok=True)
+            diff_path = Path(args.diff) / f"{path.stem}.diff"
+            diff_path.write_text(pruning.audit_diff(text, pruned, path.name), encoding="utf-8")
+            print(f"    diff: {diff_path}")
+    print(f"total: {total_before} -> {total_after} tokens ({(total_before - total_after) / max(total_before, 1):.1%} saved)")
+    return 0
+
+
+def cmd_verify(args: argparse.Namespace) -> int:
+    index = quotes.build_index()
+    start = time.perf_counter()
+    failed = 0
+    for path in sorted(Path(args.scores_dir).glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            scores = json.load(f)
+        model = quotes.model_for(scores)
+        if model is None:
+            print(f"{path.name}: unknown model {scores.get('model')!r}, skipped")
+            continue
+        verified, total = quotes.annotate(scores, index, model)
+        failed += total - verified
+        print(f"{path.name}: {verified}/{total} quotes verified")
+        for block in scores.values():
+            for item in block.get("evidence", []) if isinstance(block, dict) else ():
+                record = item.get("verification", {})
+                if not record.get("verified"):
+                    print(f"  unverified (score {record.get('score')}): {item['quote'][:100]!r}")
+        if args.write:
+            engine.write_scores(scores, path)
+    print(f"verified in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 1 if failed else 0
+
+
+def cmd_trace(args: argparse.Namespace) -> int:
+    path = args.log or telemetry.latest_log()
+    if path is None:
+        print(f"no run logs in {telemetry.RUNS_DIR}")
+        return 1
+    records = telemetry.load(path)
+    if args.run:
+        records = [record for record in records if record["run"] == args.run]
+    print(f"{path}")
+    print(telemetry.summarize(records, top=args.top))
+    return 0
+
+
+def _mock_config(args: argparse.Namespace) -> mockserver.MockConfig:
+    return mockserver.MockConfig(
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        score_noise=args.score_noise,
+        seed=args.seed,
+    )
+
+
+def cmd_mock_server(args: argparse.Namespace) -> int:
+    server = mockserver.make_server(args.host, args.port, _mock_config(args))
+    host, port = server.server_address[:2]
+    print(f"mock judge listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    run_options = {"context": args.context, "layout": args.layout, "batched": args.batched, "stream": args.stream}
+    report = bench.run_benchmark(args.levels, _mock_config(args), run_options, args.models, args.indicators)
+    print(bench.format_report(report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            found = bench.regressions(report, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        return 1 if found else 0
+    return 0
+
+
+def cmd_accuracy(args: argparse.Namespace) -> int:
+    if args.seed_gold:
+        if args.gold.exists() and not args.force:
+            print(f"the gold set {args.gold} is pinned; pass --force to seed it again")
+            return 2
+        gold = accuracy.seed(args.scores_dir, args.gold)
+        blocks = sum(len(keys) for keys in gold["scores"].values())
+        print(f"[accuracy] gold set of {blocks} blocks from {len(gold['sources'])} score files written to {args.gold}")
+        return 0
+    if not args.gold.exists():
+        print(f"no gold set at {args.gold}; seed it with 'accuracy --seed-gold'")
+        return 2
+    gold = accuracy.load_gold(args.gold)
+    variants = dict(accuracy.VARIANTS)
+    if args.variants_file:
+        with open(args.variants_file, "r", encoding="utf-8") as f:
+            for name, overrides in json.load(f).items():
+                if "prune" in overrides:
+                    overrides["prune"] = tuple(overrides["prune"])
+                variants[name] = overrides
+    unknown = [name for name in args.variants or () if name not in variants]
+    if unknown:
+        print(f"unknown variants {unknown}; expected any of {sorted(variants)}")
+        return 2
+    variants = {name: variants[name] for name in args.variants or variants}
+    base = engine.RunConfig(judge=args.judge, temperature=args.temperature, concurrency=args.concurrency)
+    if args.offline:
+        client = accuracy.OfflineClient(str(judge.make_client("offline", args.base_url).base_url))
+    else:
+        # The variant journals are the recording; cached responses would hide the judges' latency.
+        args.no_cache = True
+        client = make_client(args, http_client=backends.shared_http_client())
+    report = asyncio.run(accuracy.run_benchmark(variants, client, gold, base, args.models, args.indicators))
+    print(accuracy.format_report(report))
+    for failure in report["failed"]:
+        print(f"[accuracy] {failure['variant']}: failed: {failure['error']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    # A variant that raised, or one whose judge failed on some pair, fails the command.
+    return 1 if report["failed"] or any(row["errors"] for row in report["variants"]) or not report["variants"] else 0
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = mockserver.MockConfig()
+    parser.add_argument("--latency-median", type=float, default=defaults.latency_median, help="seconds")
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma, help="log-normal sigma")
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--completion-tokens", type=int, default=defaults.completion_tokens, help="simulated reasoning tokens")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="share of 500 responses")
+    parser.add_argument("--throttle-rate", type=float, default=defaults.throttle_rate, help="share of 429 responses")
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after, help="Retry-After on 429, seconds")
+    parser.add_argument("--score-noise", type=float, default=defaults.score_noise, help="share of answers with a random score")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def make_client(args: argparse.Namespace, backend: backends.Backend | None = None, http_client=None):
+    """The judge client for ``args`` (or ``backend``): rate limited, then cached."""
+    if backend is None:
+        client = judge.make_client(args.api_key, args.base_url, max_retries=0 if args.pacing else 2, http_client=http_client)
+    else:
+        client = judge.make_client(
+            backend.api_key(args.api_key), backend.base_url, max_retries=0 if args.pacing else 2, http_client=http_client
+        )
+    if args.pacing:
+        scheduler = ratelimit.Scheduler(
+            rpm=args.rpm,
+            tpm=args.tpm,
+            initial_concurrency=args.initial_concurrency,
+            max_concurrency=getattr(args, "concurrency", ratelimit.MAX_CONCURRENCY),
+            max_retries=args.max_retries,
+        )
+        client = ratelimit.ScheduledClient(client, scheduler)
+    if args.no_cache:
+        return client
+    response_cache = cache.ResponseCache(args.cache_path, max_bytes=args.cache_max_mb * 1024 * 1024)
+    return cache.CachingClient(client, response_cache, refresh=args.refresh_cache)
+
+
+def find_scheduler(client):
+    """The ``Scheduler`` behind a chain of wrapping clients, if any."""
+    while client is not None:
+        if isinstance(client, ratelimit.ScheduledClient):
+            return client.scheduler
+        client = getattr(client, "client", None)
+    return None
+
+
+def add_client_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--api-key", default=None, help="defaults to $DEEPSEEK_API_KEY")
+    parser.add_argument("--base-url", default=judge.BASE_URL)
+    parser.add_argument("--judge", default=judge.JUDGE_MODEL)
+    parser.add_argument("--temperature", type=float, default=judge.TEMPERATURE)
+    parser.add_argument(
+        "--pacing",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="rate-limit, adapt concurrency and back off on 429/5xx (default on)",
+    )
+    parser.add_argument("--rpm", type=float, default=None, help="requests per minute (default unlimited)")
+    parser.add_argument("--tpm", type=float, default=None, help="estimated tokens per minute (default unlimited)")
+    parser.add_argument("--initial-concurrency", type=int, default=ratelimit.INITIAL_CONCURRENCY)
+    parser.add_argument("--max-retries", type=int, default=ratelimit.MAX_RETRIES)
+    parser.add_argument("--no-cache", action="store_true", help="bypass the response cache entirely")
+    parser.add_argument("--refresh-cache", action="store_true", help="ignore cached responses but store fresh ones")
+    parser.add_argument("--cache-path", type=Path, default=cache.CACHE_PATH)
+    parser.add_argument("--cache-max-mb", type=int, default=cache.MAX_BYTES // (1024 * 1024))
+
+
+def add_matrix_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--models", nargs="+", choices=sorted(registry.MODELS), default=None)
+    parser.add_argument("--indicators", nargs="+", choices=sorted(registry.INDICATORS), default=None)
+
+
+def add_run_arguments(run: argparse.ArgumentParser) -> None:
+    add_matrix_arguments(run)
+    add_client_arguments(run)
+    run.add_argument("--concurrency", type=int, default=engine.CONCURRENCY)
+    run.add_argument(
+        "--judges",
+        nargs="+",
+        type=_backend,
+        default=None,
+        metavar="BACKEND",
+        help=f"compare several judges side by side: any of {', '.join(backends.BACKENDS)} or MODEL@URL",
+    )
+    run.add_argument("--context", choices=engine.CONTEXT_MODES, default="truncate")
+    run.add_argument("--layout", choices=prompting.LAYOUTS, default="legacy", help="prompt layout; 'prefix' is cache friendly")
+    run.add_argument("--warm-prefix", action="store_true", help="send each model's first indicator before the rest")
+    run.add_argument("--batched", action="store_true", help="score all of a model's indicators in one request")
+    run.add_argument("--stream", action="store_true", help="stream answers and abort ones that cannot be valid")
+    run.add_argument("--stream-retries", type=int, default=1, help="retries after an aborted stream")
+    run.add_argument(
+        "--json-mode",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="request the provider's JSON response format (default: when the judge supports it)",
+    )
+    run.add_argument("--fix-judge", default=output.FIX_JUDGE, help="cheap judge for 'fix this JSON' follow-ups")
+    run.add_argument("--fix-retries", type=int, default=1, help="JSON fix follow-ups per invalid answer")
+    run.add_argument(
+        "--hedge",
+        nargs="?",
+        type=_percentile,
+        const=hedging.PERCENTILE,
+        default=None,
+        metavar="PCT",
+        help=f"duplicate judge requests slower than this latency percentile (default {hedging.PERCENTILE})",
+    )
+    run.add_argument("--hedge-budget", type=float, default=hedging.BUDGET, help="cap on estimated extra USD spent on hedges")
+    run.add_argument(
+        "--cascade",
+        nargs="?",
+        const=cascade.CHEAP_JUDGE,
+        default=None,
+        metavar="JUDGE",
+        help=f"ask a cheap judge (default {cascade.CHEAP_JUDGE}) first and escalate to --judge only when uncertain",
+    )
+    run.add_argument(
+        "--confidence",
+        type=float,
+        default=cascade.CONFIDENCE,
+        help="self-reported confidence below which the cascade escalates",
+    )
+    run.add_argument("--samples", type=int, default=1, help="judge samples per indicator for majority voting")
+    run.add_argument("--agreement", type=int, default=3, help="matching samples after which voting stops early")
+    run.add_argument(
+        "--verify-quotes",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="check evidence quotes against the documents and record the result",
+    )
+    run.add_argument("--normalize", action="store_true", help="repair PDF-extraction damage in the documents first")
+    run.add_argument(
+        "--rubric",
+        choices=rubric.RUBRIC_MODES,
+        default="full",
+        help="send the full FMTI, or the distilled per-indicator rubric extract",
+    )
+    run.add_argument(
+        "--prune",
+        nargs="*",
+        choices=pruning.CATEGORIES,
+        default=None,
+        metavar="CATEGORY",
+        help=f"drop low-value sections before prompting; no value drops all of {', '.join(pruning.CATEGORIES)}",
+    )
+    run.add_argument("--max-chars", type=int, default=engine.MAX_CHARS, help="head length per document (truncate)")
+    run.add_argument("--map-judge", default=None, help="judge for the map step (mapreduce); defaults to --judge")
+    run.add_argument("--top-k", type=int, default=retrieval.TOP_K, help="chunks sent per pair (retrieval)")
+    run.add_argument("--token-budget", type=int, default=retrieval.TOKEN_BUDGET, help="tokens sent per pair (retrieval)")
+    run.add_argument("--context-window", type=int, default=budget.CONTEXT_WINDOW, help="judge context tokens (budget)")
+    run.add_argument("--output-reserve", type=int, default=budget.OUTPUT_RESERVE, help="tokens kept for the answer (budget)")
+    run.add_argument(
+        "--priority",
+        type=_priority,
+        action="append",
+        default=[],
+        metavar="FILE=N",
+        help="document priority for budget packing; lower is kept first (default 0)",
+    )
+    run.add_argument("--scores-dir", type=Path, default=registry.SCORES_DIR)
+    run.add_argument("--store", type=Path, default=store.STORE_PATH, help="append-only score history database")
+    run.add_argument("--no-store", action="store_true", help="do not append the scores to the store")
+    run.add_argument("--run-log", type=Path, default=None, help=f"JSONL span log (default: a new file in {telemetry.RUNS_DIR})")
+    run.add_argument("--no-run-log", action="store_true", help="do not record telemetry spans")
+    run.add_argument(
+        "--journal", type=Path, default=None, help=f"fsync'd request/response journal (default: a new file in {journal.JOURNALS_DIR})"
+    )
+    run.add_argument("--no-journal", action="store_true", help="do not journal judge calls")
+    run.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        default=None,
+        metavar="JOURNAL",
+        help="replay the calls finished in JOURNAL (default: the latest) and send only the missing ones",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="l4eval", description="Evaluate L4 indicators for every model concurrently.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="evaluate the model x indicator matrix")
+    add_run_arguments(run)
+    run.set_defaults(func=cmd_run)
+
+    make = commands.add_parser("make", help="re-evaluate only pairs whose documents, prompt or settings changed")
+    add_run_arguments(make)
+    make.add_argument("--dry-run", action="store_true", help="only report stale and reused score files")
+    make.add_argument("--adopt", action="store_true", help="mark existing score files as up to date for the current inputs")
+    make.set_defaults(func=cmd_make)
+
+    batch_parser = commands.add_parser("batch", help="run the matrix through the provider's Batch API")
+    batch_commands = batch_parser.add_subparsers(dest="batch_command", required=True)
+    submit = batch_commands.add_parser("submit", help="compile the matrix into a batch file and submit it")
+    add_run_arguments(submit)
+    submit.add_argument("--name", default=None, help="batch name (default: batch-<timestamp>)")
+    submit.add_argument("--no-upload", action="store_true", help="only write the batch JSONL file")
+    submit.set_defaults(func=cmd_batch_submit)
+    collect = batch_commands.add_parser("collect", help="poll a batch and write the score files from its results")
+    collect.add_argument("name")
+    add_client_arguments(collect)
+    collect.add_argument("--wait", action="store_true", help="poll until the batch has ended")
+    collect.add_argument("--poll", type=float, default=batch.POLL_SECONDS, help="seconds between polls")
+    collect.add_argument("--results", type=Path, nargs="+", default=None, help="ingest these result files instead of downloading")
+    collect.add_argument("--run-log", type=Path, default=None)
+    collect.add_argument("--no-run-log", action="store_true")
+    collect.set_defaults(func=cmd_batch_collect)
+
+    store_parser = commands.add_parser("store", help="import into and query the score history")
+    store_parser.add_argument("--store", type=Path, default=store.STORE_PATH)
+    store_commands = store_parser.add_subparsers(dest="store_command", required=True)
+    store_import = store_commands.add_parser("import", help="append existing score files as one run")
+    store_import.add_argument("--scores-dir", type=Path, default=registry.SCORES_DIR)
+    store_import.add_argument("--judge", default=None, help="judge that produced the files, if known")
+    leaderboard = store_commands.add_parser("leaderboard", help="mean latest score per model")
+    leaderboard.add_argument("--indicator", default=None, help="output key, e.g. indicator_L4_gaps")
+    leaderboard.add_argument("--judge", default=None)
+    history = store_commands.add_parser("history", help="scores of one model and indicator block, newest first")
+    history.add_argument("model", choices=sorted(registry.MODELS))
+    history.add_argument("indicator", help="output key, e.g. indicator_L4_gaps")
+    history.add_argument("--judge", default=None)
+    history.add_argument("--limit", type=int, default=20)
+    runs = store_commands.add_parser("runs", help="most recent runs")
+    runs.add_argument("--limit", type=int, default=20)
+    store_parser.set_defaults(func=cmd_store)
+
+    normalize = commands.add_parser("normalize", help="report token savings of document normalization and cache it")
+    normalize.add_argument("--documents-dir", type=Path, default=registry.DOCUMENTS_DIR)
+    normalize.add_argument("--examples", type=int, default=3, help="glued-run splits shown per document")
+    normalize.add_argument("--write-dir", type=Path, default=None, help="also write the normalized texts here")
+    normalize.set_defaults(func=cmd_normalize)
+
+    rubric_parser = commands.add_parser("rubric", help="distil and cache the per-indicator FMTI rubric extracts")
+    add_run_arguments(rubric_parser)
+    rubric_parser.add_argument("--force", action="store_true", help="distil again even when an extract is cached")
+    rubric_parser.add_argument("--show", action="store_true", help="only report the cached (or BM25) extracts")
+    rubric_parser.set_defaults(func=cmd_rubric)
+
+    prune = commands.add_parser("prune", help="report token savings of section pruning and diff what it removes")
+    prune.add_argument("categories", nargs="*", metavar="CATEGORY", help=f"any of {', '.join(pruning.CATEGORIES)} (default: all)")
+    prune.add_argument("--documents-dir", type=Path, default=registry.DOCUMENTS_DIR)
+    prune.add_argument("--normalize", action="store_true", help="prune the normalized texts, as a run would")
+    prune.add_argument("--diff", type=Path, default=None, metavar="DIR", help="write original-vs-pruned diffs here for audit")
+    prune.set_defaults(func=cmd_prune)
+
+    verify = commands.add_parser("verify", help="check evidence quotes in score files against the documents")
+    verify.add_argument("--scores-dir", type=Path, default=registry.SCORES_DIR)
+    verify.add_argument("--write", action="store_true", help="store the verification next to each evidence item")
+    verify.set_defaults(func=cmd_verify)
+
+    trace = commands.add_parser("trace", help="summarize the slowest and most expensive calls of a run log")
+    trace.add_argument("log", type=Path, nargs="?", default=None, help="run log (default: the latest)")
+    trace.add_argument("--run", default=None, help="only this run id of the log")
+    trace.add_argument("--top", type=int, default=1, help="calls listed per indicator and model")
+    trace.set_defaults(func=cmd_trace)
+
+    mock = commands.add_parser("mock-server", help="serve an offline OpenAI-compatible mock judge")
+    mock.add_argument("--host", default="127.0.0.1")
+    mock.add_argument("--port", type=int, default=8000)
+    add_mock_arguments(mock)
+    mock.set_defaults(func=cmd_mock_server)
+
+    bench_parser = commands.add_parser("bench", help="benchmark full sweeps against the mock judge")
+    add_matrix_arguments(bench_parser)
+    add_mock_arguments(bench_parser)
+    bench_parser.add_argument("--levels", type=int, nargs="+", default=list(bench.LEVELS), help="concurrency levels")
+    bench_parser.add_argument("--context", choices=engine.CONTEXT_MODES, default="truncate")
+    bench_parser.add_argument("--layout", choices=prompting.LAYOUTS, default="legacy")
+    bench_parser.add_argument("--batched", action="store_true")
+    bench_parser.add_argument("--stream", action="store_true")
+    bench_parser.add_argument("--output", type=Path, default=None, help="write the JSON report here")
+    bench_parser.add_argument("--baseline", type=Path, default=None, help="fail on regressions against this report")
+    bench_parser.add_argument("--tolerance", type=float, default=bench.TOLERANCE)
+    bench_parser.set_defaults(func=cmd_bench)
+
+    accuracy_parser = commands.add_parser("accuracy", help="score pipeline variants against the gold set, with their cost")
+    add_matrix_arguments(accuracy_parser)
+    add_client_arguments(accuracy_parser)
+    accuracy_parser.add_argument("--concurrency", type=int, default=engine.CONCURRENCY)
+    accuracy_parser.add_argument(
+        "--variants", nargs="+", default=None, metavar="NAME", help=f"variants to run (default: all of {', '.join(accuracy.VARIANTS)})"
+    )
+    accuracy_parser.add_argument(
+        "--variants-file", type=Path, default=None, help="JSON object of extra variants: name -> RunConfig overrides"
+    )
+    accuracy_parser.add_argument("--offline", action="store_true", help="only replay the recorded responses; never call a judge")
+    accuracy_parser.add_argument("--gold", type=Path, default=accuracy.GOLD_PATH, help="pinned gold set")
+    accuracy_parser.add_argument("--seed-gold", action="store_true", help="write the gold set from --scores-dir and exit")
+    accuracy_parser.add_argument("--force", action="store_true", help="seed the gold set again even though it exists")
+    accuracy_parser.add_argument("--scores-dir", type=Path, default=registry.SCORES_DIR, help="score files seeding the gold set")
+    accuracy_parser.add_argument("--output", type=Path, default=None, help="write the JSON report here")
+    accuracy_parser.set_defaults(func=cmd_accuracy)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
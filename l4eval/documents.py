@@ -0,0 +1,70 @@
+"""Loading of the plain-text source documents."""
+
+import bisect
+import os
+from pathlib import Path
+
+from . import pruning, textnorm
+from .registry import DOCUMENTS_DIR
+
+
+def read_txt(path: str | Path, max_chars: int | None = None, normalize: bool = False, prune=()) -> str:
+    """Read a document as the scripts do.
+
+    ``normalize`` repairs extraction damage first (see ``textnorm``);
+    ``prune`` drops sections of those categories (see ``pruning``) before
+    truncation.
+    """
+    print(f"[read_txt] trying to read: {path} | exists: {os.path.exists(path)}")
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if normalize:
+        text = textnorm.normalized(text)
+    if prune:
+        text, _ = pruning.prune(text, prune)
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars] + "\n\n[TRUNCATED BY SCRIPT...]"
+    return text
+
+
+def load_documents(
+    filenames,
+    max_chars: int | None = None,
+    documents_dir: Path = DOCUMENTS_DIR,
+    normalize: bool = False,
+    prune=(),
+) -> dict[str, str]:
+    """Read every distinct file once, keyed by filename."""
+    return {
+        name: read_txt(Path(documents_dir) / name, max_chars=max_chars, normalize=normalize, prune=prune)
+        for name in dict.fromkeys(filenames)
+    }
+
+
+def chunk_text(text: str, chunk_chars: int, overlap_chars: int = 0) -> list[tuple[int, int]]:
+    """Split ``text`` into overlapping ``(start, end)`` spans on line boundaries.
+
+    Spans are at most ``chunk_chars`` long unless a single line is longer;
+    consecutive spans share roughly ``overlap_chars`` characters.
+    """
+    if overlap_chars >= chunk_chars:
+        raise ValueError("overlap_chars must be smaller than chunk_chars")
+    breaks = [i + 1 for i, ch in enumerate(text) if ch == "\n"]
+    if not breaks or breaks[-1] != len(text):
+        breaks.append(len(text))
+    spans = []
+    start = 0
+    while start < len(text):
+        # Last line break that keeps the span within chunk_chars, or the
+        # first one after start when a single line is longer than that.
+        i = bisect.bisect_right(breaks, start + chunk_chars) - 1
+        if i < 0 or breaks[i] <= start:
+            i = bisect.bisect_right(breaks, start)
+        end = breaks[i]
+        spans.append((start, end))
+        if end >= len(text):
+            break
+        # Resume at a line start so chunks never begin mid-word.
+        j = bisect.bisect_left(breaks, max(end - overlap_chars, start + 1))
+        start = breaks[j] if breaks[j] < end else end
+    return spans
@@ -0,0 +1,821 @@
+"""Concurrent evaluation of the whole model x indicator matrix.
+
+Each ``L4_DEV_*`` script performs one blocking ``chat.completions.create``
+call.  The engine builds the same system/user messages for every selected
+(model, indicator) pair and sends them all at once on ``AsyncOpenAI``, bounded
+by a semaphore, so a sweep takes about as long as its slowest call.
+"""
+
+import asyncio
+import copy
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from openai import AsyncOpenAI, BadRequestError
+
+from . import (
+    budget,
+    cache,
+    cascade,
+    hedging,
+    journal,
+    manifest,
+    mapreduce,
+    output,
+    quotes,
+    retrieval,
+    rubric,
+    store,
+    streaming,
+    telemetry,
+    voting,
+)
+from .documents import load_documents, read_txt
+from .judge import JUDGE_MODEL, TEMPERATURE, make_client, split_usage, supports_json_mode, usage_dict
+from .prompting import LAYOUTS, build_batched_messages, build_messages, model_documents
+from .registry import DOCUMENTS_DIR, FMTI, INDICATORS, SCORES_DIR, Indicator, Model
+
+MAX_CHARS = 150000
+CONCURRENCY = 8
+CONTEXT_MODES = ("truncate", "budget", "retrieval", "mapreduce")
+# Per-judge score files of a multi-judge run live in scores_dir/JUDGES_DIR/<backend>.
+JUDGES_DIR = "judges"
+# Sent with every sample after the first so that the response cache keeps them apart.
+SAMPLE_HEADER = "X-L4eval-Sample"
+
+
+@dataclass
+class RunConfig:
+    """Settings shared by every call of a sweep."""
+
+    judge: str = JUDGE_MODEL
+    temperature: float = TEMPERATURE
+    concurrency: int = CONCURRENCY
+    context: str = "truncate"
+    layout: str = "legacy"
+    warm_prefix: bool = False
+    batched: bool = False
+    stream: bool = False
+    stream_retries: int = 1
+    json_mode: bool | None = None
+    fix_judge: str = output.FIX_JUDGE
+    fix_retries: int = 1
+    samples: int = 1
+    agreement: int = 3
+    verify_quotes: bool = True
+    record_manifest: bool = True
+    store_path: Path | None = None
+    map_judge: str | None = None
+    max_chars: int | None = MAX_CHARS
+    normalize: bool = False
+    prune: tuple[str, ...] = ()
+    rubric: str = "full"
+    hedge: float | None = None
+    hedge_budget: float = hedging.BUDGET
+    confidence: float = cascade.CONFIDENCE
+    cascade: str | None = None
+    top_k: int = retrieval.TOP_K
+    token_budget: int = retrieval.TOKEN_BUDGET
+    context_window: int = budget.CONTEXT_WINDOW
+    output_reserve: int = budget.OUTPUT_RESERVE
+    priorities: dict[str, int] = field(default_factory=dict)
+    run_log: Path | None = None
+    journal: Path | None = None
+    documents_dir: Path = DOCUMENTS_DIR
+    scores_dir: Path = SCORES_DIR
+
+    def __post_init__(self):
+        if self.context not in CONTEXT_MODES:
+            raise ValueError(f"unknown context mode {self.context!r}; expected one of {CONTEXT_MODES}")
+        if self.layout not in LAYOUTS:
+            raise ValueError(f"unknown layout {self.layout!r}; expected one of {LAYOUTS}")
+        if self.rubric not in rubric.RUBRIC_MODES:
+            raise ValueError(f"unknown rubric mode {self.rubric!r}; expected one of {rubric.RUBRIC_MODES}")
+        if self.batched and self.context != "truncate":
+            raise ValueError("batched judging shares one document context and requires context='truncate'")
+        if self.hedge is not None and not 0 < self.hedge < 100:
+            raise ValueError("hedge is a latency percentile and must lie between 0 and 100")
+        if self.samples < 1 or self.agreement < 1:
+            raise ValueError("samples and agreement must be at least 1")
+        if self.samples > 1 and self.batched:
+            raise ValueError("voting draws separate samples per indicator and cannot be combined with batched judging")
+        if self.cascade is not None and self.batched:
+            raise ValueError("the judge cascade escalates single pairs and cannot be combined with batched judging")
+
+
+@dataclass
+class Result:
+    model: str
+    indicator: str
+    raw_output: str | None = None
+    scores: dict | None = None
+    output_path: Path | None = None
+    elapsed: float = 0.0
+    usage: dict | None = None
+    ttft: float | None = None
+    attempts: int = 0
+    repairs: int = 0
+    batched: bool = False
+    votes: dict | None = None
+    cascade: dict | None = None
+    error: str | None = None
+
+
+def write_scores(scores: dict, path: Path) -> None:
+    """Write ``scores`` atomically: a crash leaves the old file or the new one, never half of one."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(scores, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        Path(temp).unlink(missing_ok=True)
+        raise
+
+
+def fmti_text(config: RunConfig) -> str:
+    """The FMTI as the run reads it, before any truncation."""
+    return read_txt(Path(config.documents_dir) / FMTI.filename, normalize=config.normalize, prune=config.prune)
+
+
+def rubric_texts(indicators, config: RunConfig) -> dict[str, str]:
+    """Rendered FMTI rubric extract per indicator key (see ``rubric``)."""
+    text = fmti_text(config)
+    rendered = {}
+    for indicator in dict.fromkeys(indicators):
+        record = rubric.extract(indicator, text)
+        rendered[indicator.key] = rubric.render(record, indicator)
+        print(
+            f"[rubric] {indicator.key}: {len(record['passages'])} FMTI passages ({record['method']}), "
+            f"~{retrieval.estimate_tokens(rendered[indicator.key])} tokens"
+        )
+    return rendered
+
+
+async def distill_rubrics(indicators, client: AsyncOpenAI, config: RunConfig, force: bool = False) -> dict[str, dict]:
+    """Distil (once) the FMTI rubric extract of every indicator with ``config.judge``."""
+    text = fmti_text(config)
+    records = {}
+    pending = []
+    for indicator in dict.fromkeys(indicators):
+        cached = None if force else rubric.load(indicator, text)
+        if cached is not None:
+            records[indicator.key] = cached
+        else:
+            pending.append(indicator)
+    distilled = await asyncio.gather(
+        *(rubric.distill(client, indicator, text, config.judge, config.temperature) for indicator in pending)
+    )
+    for indicator, record in zip(pending, distilled):
+        records[indicator.key] = record
+    return records
+
+
+def pair_texts(pairs: list[tuple[Model, Indicator]], config: RunConfig) -> dict[tuple[str, str], dict[str, str]]:
+    """Document texts to send for each pair, keyed by ``(model.key, indicator.key)``.
+
+    ``truncate`` sends the head of every document, as the scripts do;
+    ``budget`` packs the documents into the judge's context window by
+    priority (``config.priorities``, default 0 for every file);
+    ``retrieval`` sends the BM25 chunks that best match the indicator rubric;
+    ``mapreduce`` keeps the full texts for the map step to chunk.
+
+    With ``config.rubric == "extract"`` the FMTI is replaced by the cached
+    per-indicator rubric extract (all of a model's extracts when batched).
+    """
+    filenames = [doc.filename for model, _ in pairs for doc in model_documents(model)]
+    reading = {"documents_dir": config.documents_dir, "normalize": config.normalize, "prune": config.prune}
+    extracts = rubric_texts([indicator for _, indicator in pairs], config) if config.rubric == "extract" else {}
+
+    def with_rubric(texts: dict[str, str], model: Model, indicator: Indicator) -> dict[str, str]:
+        if not extracts:
+            return texts
+        keys = [other.key for owner, other in pairs if owner.key == model.key] if config.batched else [indicator.key]
+        return {**texts, FMTI.filename: "\n\n".join(extracts[key] for key in keys)}
+
+    if config.context in ("truncate", "mapreduce"):
+        limit = config.max_chars if config.context == "truncate" else None
+        texts = load_documents(filenames, max_chars=limit, **reading)
+        return {(model.key, indicator.key): with_rubric(texts, model, indicator) for model, indicator in pairs}
+
+    if config.context == "budget":
+        texts = load_documents(filenames, **reading)
+        tokenizer = budget.Tokenizer(config.judge)
+        packed = {}
+        for model, indicator in pairs:
+            names = [doc.filename for doc in model_documents(model)]
+            packed[model.key, indicator.key], allocations = budget.pack(
+                with_rubric({name: texts[name] for name in names}, model, indicator),
+                {name: config.priorities.get(name, 0) for name in names},
+                lambda pair: build_messages(model, indicator, pair, config.layout),
+                tokenizer,
+                context_window=config.context_window,
+                output_reserve=config.output_reserve,
+            )
+            for allocation in allocations:
+                print(f"[budget] {model.key} / {indicator.key}: {allocation.describe()}")
+        return packed
+
+    index = retrieval.load_or_build(load_documents(filenames, **reading))
+    return {
+        (model.key, indicator.key): with_rubric(
+            retrieval.retrieve_texts(
+                index,
+                [doc.filename for doc in model_documents(model) if not (extracts and doc == FMTI)],
+                indicator.system_prompt(model),
+                top_k=config.top_k,
+                token_budget=config.token_budget,
+            ),
+            model,
+            indicator,
+        )
+        for model, indicator in pairs
+    }
+
+
+def record_store(results: list[Result], config: RunConfig, source: str = "run") -> None:
+    """Append the written scores of ``results`` to the score store, if one is configured."""
+    if config.store_path is None:
+        return
+    score_store = store.ScoreStore(config.store_path)
+    try:
+        settings = {name: getattr(config, name) for name in manifest.SETTINGS}
+        score_store.record_results(results, config.judge, settings, source)
+    finally:
+        score_store.close()
+
+
+def fingerprints(pairs, texts, config: RunConfig) -> dict[tuple[str, str], dict]:
+    return {
+        (model.key, indicator.key): manifest.fingerprint(model, indicator, texts[model.key, indicator.key], config)
+        for model, indicator in pairs
+    }
+
+
+def plan_matrix(pairs: list[tuple[Model, Indicator]], config: RunConfig) -> manifest.Plan:
+    """Split ``pairs`` into stale ones and ones whose score file is still current."""
+    return manifest.plan(pairs, fingerprints(pairs, pair_texts(pairs, config), config), config.scores_dir)
+
+
+def adopt_outputs(pairs: list[tuple[Model, Indicator]], config: RunConfig) -> list[tuple[Model, Indicator]]:
+    """Record existing score files as produced by the current inputs, without calling the judge."""
+    existing = [(model, indicator) for model, indicator in pairs if (Path(config.scores_dir) / indicator.output_file(model)).exists()]
+    current = fingerprints(existing, pair_texts(existing, config), config)
+    manifest.record(
+        config.scores_dir,
+        [
+            (model, indicator, current[model.key, indicator.key], Path(config.scores_dir) / indicator.output_file(model))
+            for model, indicator in existing
+        ],
+    )
+    return existing
+
+
+def request_params(messages: list[dict], config: RunConfig) -> dict:
+    """Chat-completion parameters of a judge request, without the streaming options."""
+    params = {"model": config.judge, "messages": messages, "temperature": config.temperature}
+    if config.json_mode if config.json_mode is not None else supports_json_mode(config.judge):
+        params["response_format"] = {"type": "json_object"}
+    return params
+
+
+async def complete(
+    client: AsyncOpenAI,
+    messages: list[dict],
+    semaphore: asyncio.Semaphore,
+    config: RunConfig,
+    result: Result,
+    output_keys=(),
+    partial_path: Path | None = None,
+    require_all: bool = True,
+    sample: int = 0,
+):
+    """Send one judge request, recording timings and attempts on ``result``.
+
+    A request the provider rejects as longer than the judge's context window
+    is re-packed by the active ``budget.repacking`` callback and sent once
+    more; without one the error propagates.
+    """
+    args = (semaphore, config, result, output_keys, partial_path, require_all, sample)
+    try:
+        return await _complete(client, messages, *args)
+    except BadRequestError as exc:
+        repack, factor = budget.current_repack(), budget.overflow(exc)
+        if repack is None or factor is None:
+            raise
+        print(f"[{result.model} / {result.indicator}] context window exceeded; re-packing to {factor:.0%} of the budget")
+        return await _complete(client, repack(factor), *args)
+
+
+async def _complete(
+    client: AsyncOpenAI,
+    messages: list[dict],
+    semaphore: asyncio.Semaphore,
+    config: RunConfig,
+    result: Result,
+    output_keys=(),
+    partial_path: Path | None = None,
+    require_all: bool = True,
+    sample: int = 0,
+):
+    """One judge request of ``complete``.
+
+    In streaming mode the answer is checked against ``output_keys`` as it
+    arrives; a request aborted by the checker (an invalid score) is retried
+    up to ``config.stream_retries`` times before ``StreamAborted``
+    propagates.  Repairable defects are left to ``validate_answer``.
+    Under an active ``hedging.Hedger`` a slow request is duplicated and the
+    first valid answer kept.
+    """
+    params = request_params(messages, config)
+    if sample:
+        params["extra_headers"] = {SAMPLE_HEADER: str(sample)}
+    hedger = hedging.current()
+    run_journal = journal.current()
+    if run_journal is not None:
+        key = run_journal.key(client, {**params, "stream": config.stream})
+        ids = {"purpose": "judge", "model": result.model, "indicator": result.indicator, "judge": config.judge, "sample": sample}
+        replayed = run_journal.replay(key)
+        if replayed is not None:
+            with telemetry.span("request", purpose="judge", judge=config.judge, journal="replay"):
+                return replayed
+
+    async def send(copy: int, started):
+        result.attempts += 1
+        if run_journal is not None:
+            run_journal.request(key, attempt=result.attempts, copy=copy, **ids)
+        if not config.stream:
+            return await client.chat.completions.create(**params, stream=False), None
+        checker = streaming.IncrementalJSONChecker(output_keys, require_all)
+        path = partial_path
+        if copy and partial_path is not None:
+            path = partial_path.with_name(partial_path.name.replace(".partial", ".hedge.partial"))
+        try:
+            return await streaming.stream_completion(client, params, checker, path, first_token=started)
+        finally:
+            if path is not partial_path:
+                path.unlink(missing_ok=True)
+
+    def valid(answer) -> bool:
+        response, _ = answer
+        if not require_all:
+            return True
+        return not output.parse_scores(response.choices[0].message.content, output_keys)[1]
+
+    async def attempt():
+        if hedger is None:
+            return await send(0, None)
+        return await hedger.race(result.indicator, messages, send, valid, stream=config.stream)
+
+    with telemetry.span("queue"):
+        await semaphore.acquire()
+    try:
+        start = time.perf_counter()
+        with telemetry.span("request", purpose="judge", judge=config.judge, stream=config.stream):
+            try:
+                if not config.stream:
+                    response, _ = await attempt()
+                else:
+                    for retry in range(config.stream_retries + 1):
+                        try:
+                            response, result.ttft = await attempt()
+                            break
+                        except streaming.StreamAborted as exc:
+                            print(f"[{result.model} / {result.indicator}] stream aborted: {exc}")
+                            if retry == config.stream_retries:
+                                raise
+            except Exception as exc:
+                if run_journal is not None:
+                    run_journal.error(key, exc, **ids)
+                raise
+            finally:
+                result.elapsed = time.perf_counter() - start
+                telemetry.annotate(attempts=result.attempts, ttft=result.ttft)
+            if run_journal is not None:
+                run_journal.response(key, response, result.elapsed, attempts=result.attempts, **ids)
+            telemetry.record_usage(config.judge, usage_dict(response), cached=cache.is_hit(response))
+            if hedger is not None and not cache.is_hit(response):
+                hedger.observe(result.indicator, result.elapsed, result.ttft)
+        return response
+    finally:
+        semaphore.release()
+
+
+async def repair(client: AsyncOpenAI, raw_output: str | None, errors: list[str], output_keys, semaphore, config: RunConfig):
+    """Ask ``config.fix_judge`` to fix an invalid answer; returns ``(scores, errors)``.
+
+    Only the broken answer and the validation errors are sent, not the
+    documents.
+    """
+    params = {
+        "model": config.fix_judge,
+        "messages": output.fix_messages(raw_output, errors, output_keys),
+        "temperature": 0.0,
+        "stream": False,
+    }
+    if supports_json_mode(config.fix_judge):
+        params["response_format"] = {"type": "json_object"}
+    run_journal = journal.current()
+    if run_journal is not None:
+        key = run_journal.key(client, params)
+        response = run_journal.replay(key)
+        if response is not None:
+            return output.parse_scores(response.choices[0].message.content, output_keys)
+        run_journal.request(key, purpose="repair", judge=config.fix_judge)
+    async with semaphore:
+        with telemetry.span("request", purpose="repair", judge=config.fix_judge):
+            start = time.perf_counter()
+            response = await client.chat.completions.create(**params)
+            telemetry.record_usage(config.fix_judge, usage_dict(response), cached=cache.is_hit(response))
+    if run_journal is not None:
+        run_journal.response(key, response, time.perf_counter() - start, purpose="repair", judge=config.fix_judge)
+    return output.parse_scores(response.choices[0].message.content, output_keys)
+
+
+async def evaluate(
+    client: AsyncOpenAI,
+    model: Model,
+    indicator: Indicator,
+    messages: list[dict],
+    semaphore: asyncio.Semaphore,
+    config: RunConfig,
+) -> Result:
+    result = Result(model.key, indicator.key)
+    with telemetry.span("evaluate", model=model.key, indicator=indicator.key) as span:
+        await _evaluate(client, model, indicator, messages, semaphore, config, result)
+        if span is not None:
+            span.set(repairs=result.repairs, votes=result.votes, error=result.error)
+    return result
+
+
+class InvalidAnswer(ValueError):
+    """A judge answer that is still invalid after the JSON fix follow-ups."""
+
+
+async def validate_answer(client, indicator: Indicator, raw_output, semaphore, config: RunConfig, result: Result, sample=0) -> dict:
+    """Parse and validate a judge answer, asking ``config.fix_judge`` to repair it if needed.
+
+    Raises ``InvalidAnswer`` when it is still invalid after ``config.fix_retries`` follow-ups.
+    """
+    with telemetry.span("parse", sample=sample):
+        scores, errors = output.parse_scores(raw_output, indicator.output_keys)
+        telemetry.annotate(errors=len(errors))
+    for _ in range(config.fix_retries):
+        if not errors:
+            break
+        result.repairs += 1
+        try:
+            scores, errors = await repair(client, raw_output, errors, indicator.output_keys, semaphore, config)
+        except Exception as exc:
+            errors = [f"JSON repair call failed: {type(exc).__name__}: {exc}"]
+    if errors:
+        raise InvalidAnswer("; ".join(errors))
+    return scores
+
+
+async def _draw(client, indicator, messages, semaphore, config: RunConfig, result: Result, partial_path, sample=0):
+    """One parsed and validated judge answer; returns ``(scores, raw_output)``."""
+    response = await complete(client, messages, semaphore, config, result, indicator.output_keys, partial_path, sample=sample)
+    result.usage = voting.add_usage(result.usage, usage_dict(response))
+    raw_output = result.raw_output = response.choices[0].message.content
+    return await validate_answer(client, indicator, raw_output, semaphore, config, result, sample), raw_output
+
+
+async def _vote(client, indicator, messages, semaphore, config: RunConfig, result: Result, partial_path) -> dict:
+    """Majority scores over up to ``config.samples`` answers, stopping early (see ``voting``)."""
+
+    async def draw(sample: int):
+        path = partial_path.with_name(partial_path.name.replace(".partial", f".{sample}.partial"))
+        try:
+            with telemetry.span("sample", sample=sample):
+                return await _draw(client, indicator, messages, semaphore, config, result, path, sample)
+        finally:
+            path.unlink(missing_ok=True)
+
+    start = time.perf_counter()
+    first = min(config.agreement, config.samples)
+    pending = {asyncio.ensure_future(draw(sample)) for sample in range(first)}
+    drawn = first
+    answers, failures = [], []
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    failures.append(task.exception())
+                else:
+                    answers.append(task.result())
+            votes = voting.tally([scores for scores, _ in answers], indicator.output_keys)
+            remaining = len(pending) + config.samples - drawn
+            if answers and voting.settled(votes, config.agreement, remaining):
+                break
+            if not pending and drawn < config.samples:
+                pending = {asyncio.ensure_future(draw(sample)) for sample in range(drawn, config.samples)}
+                drawn = config.samples
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    if not answers:
+        raise failures[0]
+    scores, representative = voting.combine([scores for scores, _ in answers], indicator.output_keys)
+    result.raw_output = answers[representative][1]
+    result.votes = {key: scores[key]["votes"] for key in indicator.output_keys}
+    result.elapsed = time.perf_counter() - start
+    return scores
+
+
+async def _cascade(client, model, indicator, messages, semaphore, config: RunConfig, result: Result, partial_path) -> dict | None:
+    """Ask the cheap judge first; returns its scores, or ``None`` if it gave no valid answer.
+
+    The decision (see ``cascade``) and the cheap judge's usage and timing are
+    recorded in ``result.cascade``; an accepted answer's timing and attempts
+    become those of ``result``.
+    """
+    cheap_config = replace(config, judge=config.cascade, samples=1)
+    cheap = Result(model.key, indicator.key)
+    scores, reasons = None, []
+    with telemetry.span("cascade", judge=config.cascade) as span:
+        try:
+            # Hedging thresholds are per judge; the cheap judge is not hedged.
+            with hedging.hedging(None):
+                scores, _ = await _draw(client, indicator, cascade.confident_messages(messages), semaphore, cheap_config, cheap, partial_path)
+        except Exception as exc:
+            print(f"[{model.key} / {indicator.key}] cascade: {config.cascade} answer rejected: {exc}")
+            reasons.append("invalid")
+        else:
+            index = quotes.shared_index(config.documents_dir)
+            annotated = copy.deepcopy(scores)
+            quotes.annotate(annotated, index, model)
+            expected = cascade.prescreen(model, index)
+            reasons = cascade.escalation_reasons(annotated, indicator.output_keys, expected, config.confidence)
+        result.cascade = {
+            "judge": config.cascade,
+            "escalated": bool(reasons),
+            "reasons": reasons,
+            "usage": cheap.usage,
+            "elapsed": cheap.elapsed,
+        }
+        if span is not None:
+            span.set(escalated=int(bool(reasons)), reasons=",".join(reasons) or None)
+    if not reasons:
+        result.raw_output, result.usage, result.elapsed = cheap.raw_output, cheap.usage, cheap.elapsed
+        result.attempts, result.repairs = cheap.attempts, cheap.repairs
+    return scores
+
+
+async def _evaluate(client, model, indicator, messages, semaphore, config: RunConfig, result: Result) -> None:
+    partial_path = Path(config.scores_dir) / (indicator.output_file(model) + ".partial")
+    cheap = None
+    try:
+        if config.cascade is not None:
+            cheap = await _cascade(client, model, indicator, messages, semaphore, config, result, partial_path)
+        if result.cascade is not None and not result.cascade["escalated"]:
+            result.scores = cheap
+        elif config.samples > 1:
+            result.scores = await _vote(client, indicator, messages, semaphore, config, result, partial_path)
+        else:
+            result.scores, _ = await _draw(client, indicator, messages, semaphore, config, result, partial_path)
+    except InvalidAnswer as exc:
+        result.error = str(exc)
+        return
+    except Exception as exc:
+        result.error = f"{type(exc).__name__}: {exc}"
+        return
+    if result.cascade is not None:
+        cascade.mark(result.scores, indicator.output_keys, result.cascade, cheap)
+    finish(model, indicator, config, result)
+
+
+def finish(model: Model, indicator: Indicator, config: RunConfig, result: Result) -> None:
+    """Verify the evidence quotes of ``result.scores`` and write its score file."""
+    if config.verify_quotes:
+        with telemetry.span("quotes"):
+            verified, total = quotes.annotate(result.scores, quotes.shared_index(config.documents_dir), model)
+            telemetry.annotate(verified=verified, total=total)
+    result.output_path = Path(config.scores_dir) / indicator.output_file(model)
+    with telemetry.span("write"):
+        write_scores(result.scores, result.output_path)
+
+
+async def evaluate_batched(
+    client: AsyncOpenAI,
+    model: Model,
+    indicators: list[Indicator],
+    texts: dict[str, str],
+    semaphore: asyncio.Semaphore,
+    config: RunConfig,
+) -> list[Result]:
+    """Score all ``indicators`` of ``model`` in one request and fan the answer out.
+
+    Indicators whose blocks are missing or invalid in the combined answer are
+    re-evaluated with their own single-indicator request.
+    """
+    batch = Result(model.key, "+".join(indicator.key for indicator in indicators), batched=True)
+    output_keys = [key for indicator in indicators for key in indicator.output_keys]
+    partial_path = Path(config.scores_dir) / f"{model.key}_batched.json.partial"
+    data = {}
+    with telemetry.span("evaluate", model=model.key, indicator=batch.indicator, batched=True):
+        try:
+            with telemetry.span("prompt.build", layout="batched"):
+                messages = build_batched_messages(model, indicators, texts)
+            # Missing blocks are tolerated here: they fall back to their own request.
+            response = await complete(client, messages, semaphore, config, batch, output_keys, partial_path, require_all=False)
+            batch.usage = usage_dict(response)
+            batch.raw_output = response.choices[0].message.content
+            with telemetry.span("parse"):
+                data, _ = output.parse_scores(batch.raw_output, output_keys)
+        except Exception as exc:
+            print(f"[{model.key} / batched] falling back to per-indicator calls: {type(exc).__name__}: {exc}")
+
+    results = []
+    fallbacks = [indicator for indicator in indicators if output.validate(data, indicator.output_keys)]
+    served = [indicator for indicator in indicators if indicator not in fallbacks]
+    # The batch request's tokens are shared between the indicators it served.
+    for indicator, usage in zip(served, split_usage(batch.usage, len(served))):
+        scores = {"model": data.get("model", model.name), **{key: data[key] for key in indicator.output_keys}}
+        if config.verify_quotes:
+            quotes.annotate(scores, quotes.shared_index(config.documents_dir), model)
+        result = replace(batch, indicator=indicator.key, scores=scores, usage=usage)
+        result.output_path = Path(config.scores_dir) / indicator.output_file(model)
+        write_scores(scores, result.output_path)
+        results.append(result)
+
+    results.extend(
+        await asyncio.gather(
+            *(
+                evaluate(client, model, indicator, build_messages(model, indicator, texts, config.layout), semaphore, config)
+                for indicator in fallbacks
+            )
+        )
+    )
+    return results
+
+
+async def run_matrix(
+    pairs: list[tuple[Model, Indicator]],
+    client: AsyncOpenAI | None = None,
+    config: RunConfig | None = None,
+) -> list[Result]:
+    """Evaluate every (model, indicator) pair concurrently.
+
+    With ``config.warm_prefix`` the first indicator of each model is sent
+    alone and the model's remaining indicators only once it has completed, so
+    that they can reuse the provider's cached document prefix.  With
+    ``config.batched`` each model's indicators share a single request.
+    """
+    client = client or make_client()
+    config = config or RunConfig()
+    with telemetry.tracing(config.run_log), journal.journaling(config.journal) as run_journal:
+        results = await _run_matrix(pairs, client, config)
+    _report_replays(run_journal)
+    return results
+
+
+def _report_replays(run_journal: journal.Journal | None) -> None:
+    if run_journal is not None and run_journal.replayed:
+        print(f"[journal] {run_journal.replayed} responses replayed from {run_journal.path}")
+
+
+async def _run_matrix(pairs: list[tuple[Model, Indicator]], client: AsyncOpenAI, config: RunConfig) -> list[Result]:
+    hedger = None
+    if config.hedge is not None:
+        history = hedging.load_history(config.judge, exclude=config.run_log)
+        hedger = hedging.Hedger(config.judge, config.hedge, config.hedge_budget, history)
+    with hedging.hedging(hedger):
+        results = await _evaluate_matrix(pairs, client, config)
+    if hedger is not None:
+        print(f"[hedging] {config.judge}: {hedger.report()}")
+    if config.cascade is not None:
+        history = hedging.load_history(config.judge, exclude=config.run_log)
+        print(f"[cascade] {config.cascade} first: {cascade.report(results, config.judge, history)}")
+    return results
+
+
+async def _evaluate_matrix(pairs: list[tuple[Model, Indicator]], client: AsyncOpenAI, config: RunConfig) -> list[Result]:
+    if config.rubric == "extract":
+        with telemetry.span("rubric.distill"):
+            await distill_rubrics([indicator for _, indicator in pairs], client, config)
+    with telemetry.span("documents.load", context=config.context, pairs=len(pairs)):
+        texts = pair_texts(pairs, config)
+    if config.verify_quotes:
+        with telemetry.span("quotes.index"):
+            quotes.shared_index(config.documents_dir)
+    semaphore = asyncio.Semaphore(config.concurrency)
+
+    by_model: dict[str, list[tuple[Model, Indicator]]] = {}
+    for model, indicator in pairs:
+        by_model.setdefault(model.key, []).append((model, indicator))
+
+    async def evaluate_pair(model: Model, indicator: Indicator) -> Result:
+        pair = texts[model.key, indicator.key]
+        with telemetry.span("prompt.build", model=model.key, indicator=indicator.key, context=config.context, layout=config.layout):
+            if config.context == "mapreduce":
+                try:
+                    messages = await mapreduce.reduce_messages(
+                        client, model, indicator, model_documents(model), pair, semaphore,
+                        judge=config.map_judge or config.judge, temperature=config.temperature,
+                    )
+                except mapreduce.MapFailed as exc:
+                    return Result(model.key, indicator.key, error=f"MapFailed: {exc}")
+            else:
+                messages = build_messages(model, indicator, pair, config.layout)
+        if config.context != "budget":
+            return await evaluate(client, model, indicator, messages, semaphore, config)
+        repacked = {}
+
+        def repack(factor: float) -> list[dict]:
+            # Packed once per pair: later samples reuse the smaller prompt.
+            if not repacked:
+                window = int((config.context_window - config.output_reserve) * factor) + config.output_reserve
+                smaller = pair_texts([(model, indicator)], replace(config, context_window=window))
+                texts.update(smaller)
+                repacked["messages"] = build_messages(model, indicator, smaller[model.key, indicator.key], config.layout)
+            return repacked["messages"]
+
+        with budget.repacking(repack):
+            return await evaluate(client, model, indicator, messages, semaphore, config)
+
+    async def evaluate_model(model_pairs: list[tuple[Model, Indicator]]) -> list[Result]:
+        if config.batched:
+            model = model_pairs[0][0]
+            indicators = [indicator for _, indicator in model_pairs]
+            return await evaluate_batched(client, model, indicators, texts[model.key, indicators[0].key], semaphore, config)
+        first = await evaluate_pair(*model_pairs[0])
+        rest = await asyncio.gather(*(evaluate_pair(model, indicator) for model, indicator in model_pairs[1:]))
+        return [first, *rest]
+
+    if not (config.warm_prefix or config.batched):
+        results = list(await asyncio.gather(*(evaluate_pair(model, indicator) for model, indicator in pairs)))
+    else:
+        grouped = await asyncio.gather(*(evaluate_model(model_pairs) for model_pairs in by_model.values()))
+        results = [result for results in grouped for result in results]
+
+    if config.record_manifest:
+        by_key = {(model.key, indicator.key): (model, indicator) for model, indicator in pairs}
+        current = fingerprints(pairs, texts, config)
+        manifest.record(
+            config.scores_dir,
+            [
+                (*by_key[result.model, result.indicator], current[result.model, result.indicator], result.output_path)
+                for result in results
+                if result.output_path is not None
+            ],
+        )
+    record_store(results, config)
+    return results
+
+
+def judge_config(config: RunConfig, backend) -> RunConfig:
+    """``config`` for one backend of a multi-judge run."""
+    return replace(config, judge=backend.model, scores_dir=Path(config.scores_dir) / JUDGES_DIR / backend.name)
+
+
+def compare_judges(results: dict[str, list[Result]]) -> list[dict]:
+    """One row per (model, indicator block) with every judge's score and latency side by side."""
+    rows: dict[tuple[str, str, str], dict] = {}
+    for name, judge_results in results.items():
+        for result in judge_results:
+            for key in INDICATORS[result.indicator].output_keys:
+                block = (result.scores or {}).get(key) or {}
+                row = rows.setdefault(
+                    (result.model, result.indicator, key),
+                    {"model": result.model, "indicator": result.indicator, "output_key": key, "judges": {}},
+                )
+                row["judges"][name] = {
+                    "raw_score": block.get("raw_score"),
+                    "elapsed": round(result.elapsed, 3),
+                    "error": result.error,
+                }
+    return list(rows.values())
+
+
+async def run_judges(pairs: list[tuple[Model, Indicator]], clients: dict, config: RunConfig) -> dict[str, list[Result]]:
+    """Evaluate the matrix with several judges concurrently.
+
+    ``clients`` maps each ``backends.Backend`` to its client.  Every judge
+    writes its score files under ``scores_dir/judges/<backend>``; the
+    side-by-side comparison of ``compare_judges`` is written next to them.
+    """
+    backends = list(clients)
+    with telemetry.tracing(config.run_log), journal.journaling(config.journal) as run_journal:
+        if config.rubric == "extract":
+            # Distil once with the first judge rather than once per judge.
+            with telemetry.span("rubric.distill"):
+                await distill_rubrics([indicator for _, indicator in pairs], clients[backends[0]], judge_config(config, backends[0]))
+        grouped = await asyncio.gather(
+            *(_run_matrix(pairs, clients[backend], judge_config(config, backend)) for backend in backends)
+        )
+    _report_replays(run_journal)
+    results = {backend.name: judge_results for backend, judge_results in zip(backends, grouped)}
+    comparison = {"judges": {backend.name: backend.model for backend in backends}, "rows": compare_judges(results)}
+    write_scores(comparison, Path(config.scores_dir) / JUDGES_DIR / "comparison.json")
+    return results
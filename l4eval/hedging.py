@@ -0,0 +1,173 @@
+"""Hedged judge requests against tail latency.
+
+A hedged request starts a duplicate when the original has neither finished
+nor streamed its first token after the ``percentile``-th percentile of the
+latency seen so far for the same (judge, indicator).  Whole-request latency
+is used without streaming and time to first token with it.  The first valid
+answer wins and the other request is cancelled.
+
+Latency history comes from the recent run logs (``telemetry``) and grows with
+every request of the current run.  A pair is only hedged once it has
+``MIN_SAMPLES`` observations.  Duplicates are charged against a spend cap
+in USD, estimated from the prompt size, and against ``MAX_FRACTION`` of the
+requests sent.  The run's request spans record ``hedged``, ``hedge_won`` and
+``hedge_cost``, and ``Hedger.report`` compares the run's p99 with the
+history's.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from . import telemetry
+from .budget import CHARS_PER_TOKEN
+
+PERCENTILE = 95
+BUDGET = 1.0
+MIN_SAMPLES = 8
+MAX_FRACTION = 0.2
+MAX_LOGS = 20
+COMPLETION_TOKENS = 2000
+
+_hedger: contextvars.ContextVar["Hedger | None"] = contextvars.ContextVar("l4eval_hedger", default=None)
+
+
+def load_history(judge: str, runs_dir: Path = telemetry.RUNS_DIR, max_logs: int = MAX_LOGS, exclude: Path | None = None):
+    """``(latencies, ttfts, completion tokens)`` of past judge requests, by indicator."""
+    latencies, ttfts, completions = defaultdict(list), defaultdict(list), []
+    logs = sorted(Path(runs_dir).glob("*.jsonl"), key=lambda path: path.stat().st_mtime)[-max_logs:]
+    for path in logs:
+        if exclude is not None and path.resolve() == Path(exclude).resolve():
+            continue
+        try:
+            records = telemetry.load(path)
+        except (OSError, ValueError):
+            continue
+        for record in records:
+            if record["name"] != "request" or record.get("purpose") != "judge" or record.get("judge") != judge:
+                continue
+            if record.get("error") or record.get("cache") == "hit":
+                continue
+            indicator = record.get("indicator", "?")
+            latencies[indicator].append(record["duration"])
+            if record.get("ttft") is not None:
+                ttfts[indicator].append(record["ttft"])
+            if record.get("completion_tokens"):
+                completions.append(record["completion_tokens"])
+    return latencies, ttfts, completions
+
+
+class Hedger:
+    def __init__(self, judge: str, percentile: float = PERCENTILE, budget: float = BUDGET, history=None):
+        self.judge = judge
+        self.percentile = percentile
+        self.budget = budget
+        latencies, ttfts, completions = history or ({}, {}, [])
+        self.latencies = defaultdict(list, {key: list(values) for key, values in latencies.items()})
+        self.ttfts = defaultdict(list, {key: list(values) for key, values in ttfts.items()})
+        self.baseline = [value for values in latencies.values() for value in values]
+        self.completion_tokens = sum(completions) / len(completions) if completions else COMPLETION_TOKENS
+        self.observed: list[float] = []
+        self.requests = 0
+        self.fired = 0
+        self.won = 0
+        self.capped = 0
+        self.spent = 0.0
+
+    def threshold(self, indicator: str, stream: bool = False) -> float | None:
+        samples = (self.ttfts if stream else self.latencies)[indicator]
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return telemetry.percentile(samples, self.percentile)
+
+    def estimated_cost(self, messages: list[dict]) -> float:
+        prompt = len(json.dumps(messages, ensure_ascii=False)) / CHARS_PER_TOKEN
+        usage = {"prompt_tokens": int(prompt), "completion_tokens": int(self.completion_tokens)}
+        return telemetry.estimate_cost(self.judge, usage) or 0.0
+
+    def allow(self, cost: float) -> bool:
+        if self.spent + cost > self.budget or self.fired + 1 > MAX_FRACTION * self.requests:
+            self.capped += 1
+            return False
+        self.spent += cost
+        self.fired += 1
+        return True
+
+    def observe(self, indicator: str, elapsed: float, ttft: float | None) -> None:
+        self.observed.append(elapsed)
+        self.latencies[indicator].append(elapsed)
+        if ttft is not None:
+            self.ttfts[indicator].append(ttft)
+
+    async def race(self, indicator: str, messages: list[dict], launch, accept=lambda value: True, stream: bool = False):
+        """Run ``launch(copy, started)`` and hedge it once it is slow.
+
+        ``launch`` returns a coroutine for one request; ``started`` is an
+        ``asyncio.Event`` it sets on the first streamed token.  Returns the
+        first result that ``accept`` approves, else the first one that did not
+        fail.
+        """
+        self.requests += 1
+        threshold = self.threshold(indicator, stream)
+        started = asyncio.Event()
+        primary = asyncio.ensure_future(launch(0, started))
+        if threshold is not None:
+            waiter = asyncio.ensure_future(started.wait())
+            try:
+                await asyncio.wait({primary, waiter}, timeout=threshold, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                waiter.cancel()
+        if threshold is None or primary.done() or started.is_set():
+            return await primary
+        cost = self.estimated_cost(messages)
+        if not self.allow(cost):
+            return await primary
+        telemetry.annotate(hedged=1, hedge_threshold=round(threshold, 3), hedge_cost=cost)
+        hedge = asyncio.ensure_future(launch(1, asyncio.Event()))
+        pending = {primary, hedge}
+        completed = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        completed.append(task)
+                        if accept(task.result()):
+                            pending = set()
+                            break
+        finally:
+            for task in pending | {primary, hedge}:
+                task.cancel()
+            await asyncio.gather(primary, hedge, return_exceptions=True)
+        if not completed:
+            # Both failed: report the original request's error.
+            return primary.result()
+        winner = next((task for task in completed if accept(task.result())), completed[0])
+        self.won += winner is hedge
+        telemetry.annotate(hedge_won=int(winner is hedge))
+        return winner.result()
+
+    def report(self) -> str:
+        p99 = telemetry.percentile(self.observed, 99)
+        baseline = f"{telemetry.percentile(self.baseline, 99):.1f}s" if self.baseline else "n/a"
+        return (
+            f"fired={self.fired}/{self.requests}, hedge won={self.won}, capped={self.capped}, "
+            f"extra≈{self.spent:.4f} USD, p99 history {baseline} -> this run {p99:.1f}s"
+        )
+
+
+@contextlib.contextmanager
+def hedging(hedger: Hedger | None):
+    """Make ``hedger`` active for the judge requests of the enclosed block."""
+    token = _hedger.set(hedger)
+    try:
+        yield hedger
+    finally:
+        _hedger.reset(token)
+
+
+def current() -> Hedger | None:
+    return _hedger.get()
@@ -0,0 +1,121 @@
+"""Append-only, fsync'd journal of the judge calls of a sweep.
+
+Every judge and repair request is recorded as it is sent, with the model,
+indicator, judge and attempt, and so is its raw response as soon as it
+arrives.  Each line is flushed and fsync'd, so a crash or dropped connection
+loses at most the calls still in flight.
+
+Requests are identified by a hash of their parameters and endpoint.  A run
+that appends to an existing journal (``--resume``) replays the responses it
+already holds instead of calling the judge again; only the missing calls are
+sent.  A changed prompt, document or setting changes the hash, so stale
+responses are never replayed.
+"""
+
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from openai.types.chat import ChatCompletion
+
+from .cache import CACHE_DIR
+
+JOURNALS_DIR = CACHE_DIR / "journals"
+
+_journal: contextvars.ContextVar["Journal | None"] = contextvars.ContextVar("l4eval_journal", default=None)
+
+
+def request_key(base_url, params: dict) -> str:
+    payload = json.dumps({"base_url": str(base_url), **params}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def default_path() -> Path:
+    return JOURNALS_DIR / time.strftime("run-%Y%m%d-%H%M%S.jsonl")
+
+
+def latest(journals_dir: Path = JOURNALS_DIR) -> Path | None:
+    journals = sorted(Path(journals_dir).glob("*.jsonl"), key=lambda path: path.stat().st_mtime)
+    return journals[-1] if journals else None
+
+
+class Journal:
+    """Appends records to ``path``; responses already in it can be replayed."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.responses: dict[str, str] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # The last line of a crashed run may be torn.
+                        continue
+                    if record.get("type") == "response":
+                        self.responses[record["key"]] = record["response"]
+        self.replayed = 0
+        # Keys of the responses replayed or recorded by this run.
+        self.used: set[str] = set()
+        self.lock = threading.Lock()
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, record: dict) -> None:
+        line = json.dumps({"time": round(time.time(), 3), **record}, ensure_ascii=False, default=str)
+        with self.lock:
+            self.file.write(line + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def key(self, client, params: dict) -> str:
+        return request_key(client.base_url, params)
+
+    def replay(self, key: str) -> ChatCompletion | None:
+        raw = self.responses.get(key)
+        if raw is None:
+            return None
+        self.replayed += 1
+        self.used.add(key)
+        return ChatCompletion.model_validate_json(raw)
+
+    def request(self, key: str, **ids) -> None:
+        self.write({"type": "request", "key": key, **ids})
+
+    def response(self, key: str, response, elapsed: float, **ids) -> None:
+        raw = response.model_dump_json()
+        self.responses[key] = raw
+        self.used.add(key)
+        self.write({"type": "response", "key": key, "elapsed": round(elapsed, 3), "response": raw, **ids})
+
+    def error(self, key: str, error: BaseException, **ids) -> None:
+        self.write({"type": "error", "key": key, "error": f"{type(error).__name__}: {error}", **ids})
+
+    def close(self) -> None:
+        self.file.close()
+
+
+@contextlib.contextmanager
+def journaling(path: str | Path | None):
+    """Make a ``Journal`` at ``path`` active for the enclosed block; a no-op for ``None``."""
+    if path is None:
+        yield None
+        return
+    journal = Journal(path)
+    token = _journal.set(journal)
+    try:
+        yield journal
+    finally:
+        _journal.reset(token)
+        journal.close()
+
+
+def current() -> Journal | None:
+    return _journal.get()
+
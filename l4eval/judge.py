@@ -0,0 +1,61 @@
+"""Judge client construction and response accounting."""
+
+import os
+
+from openai import AsyncOpenAI
+
+BASE_URL = "https://api.deepseek.com"
+JUDGE_MODEL = "deepseek-reasoner"
+TEMPERATURE = 0.1
+
+# Judges known to reject ``response_format={"type": "json_object"}``.
+NO_JSON_MODE = frozenset({"deepseek-reasoner"})
+
+
+def make_client(
+    api_key: str | None = None, base_url: str = BASE_URL, max_retries: int = 2, http_client=None
+) -> AsyncOpenAI:
+    """``http_client`` shares a pooled transport between clients (see ``backends``)."""
+    return AsyncOpenAI(
+        api_key=api_key or os.environ.get("DEEPSEEK_API_KEY", ""),
+        base_url=base_url,
+        max_retries=max_retries,
+        http_client=http_client,
+    )
+
+
+def supports_json_mode(judge: str) -> bool:
+    return judge not in NO_JSON_MODE
+
+
+def usage_dict(response) -> dict:
+    """Token usage of ``response``, including provider prefix-cache accounting."""
+    usage = response.usage
+    if usage is None:
+        return {}
+    details = getattr(usage, "completion_tokens_details", None)
+    prompt_details = getattr(usage, "prompt_tokens_details", None)
+    record = {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "reasoning_tokens": getattr(details, "reasoning_tokens", None),
+        # DeepSeek reports hit/miss directly; OpenAI reports cached_tokens.
+        "prompt_cache_hit_tokens": getattr(usage, "prompt_cache_hit_tokens", None),
+        "prompt_cache_miss_tokens": getattr(usage, "prompt_cache_miss_tokens", None),
+    }
+    cached = getattr(prompt_details, "cached_tokens", None)
+    if record["prompt_cache_hit_tokens"] is None and cached is not None:
+        record["prompt_cache_hit_tokens"] = cached
+        record["prompt_cache_miss_tokens"] = usage.prompt_tokens - cached
+    return record
+
+
+def split_usage(usage: dict | None, parts: int) -> list[dict | None]:
+    """Share the token counts of one call between ``parts`` results; the shares add up to ``usage``."""
+    if usage is None:
+        return [None] * parts
+    shares = [{} for _ in range(parts)]
+    for key, value in usage.items():
+        for index, share in enumerate(shares):
+            share[key] = None if value is None else value // parts + (index < value % parts)
+    return shares
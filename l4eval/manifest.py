@@ -0,0 +1,161 @@
+"""Dependency manifest for score files and incremental re-evaluation.
+
+For every score file the manifest records what produced it: a hash of each
+document text exactly as it was sent (the truncated head, the packed slice or
+the retrieved excerpts), a hash of the prompt template with the rubric and
+instructions, a hash of the judge settings and a hash of the score file
+itself.  ``plan`` compares those against the current inputs and the file on
+disk so that ``make`` re-evaluates only the stale (model, indicator) pairs.
+
+The manifest lives next to the score files as ``l4eval.manifest`` (JSON), so
+it does not match the ``*.json`` score file glob.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .prompting import build_batched_messages, build_messages, model_documents
+from .registry import Indicator, Model
+
+MANIFEST_NAME = "l4eval.manifest"
+VERSION = 1
+
+# RunConfig fields that change what the judge is asked or how its answer is
+# turned into a score file.  Context settings such as max_chars or the token
+# budget are covered by the document hashes instead.
+SETTINGS = (
+    "judge",
+    "temperature",
+    "context",
+    "layout",
+    "batched",
+    "json_mode",
+    "fix_judge",
+    "samples",
+    "agreement",
+    "verify_quotes",
+)
+
+
+def digest(data) -> str:
+    if not isinstance(data, (str, bytes)):
+        data = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def pair_key(model: Model, indicator: Indicator) -> str:
+    return f"{model.key}/{indicator.key}"
+
+
+def fingerprint(model: Model, indicator: Indicator, texts: dict[str, str], config) -> dict:
+    """Hashes of everything that determines the score file of one pair.
+
+    In batched mode the prompt hash covers the batch template with this
+    indicator alone, so that it does not depend on which other indicators
+    happened to share the request.
+    """
+    placeholders = {document.filename: "" for document in model_documents(model)}
+    if config.batched:
+        template = build_batched_messages(model, [indicator], placeholders)
+    else:
+        template = build_messages(model, indicator, placeholders, config.layout)
+    settings = {name: getattr(config, name) for name in SETTINGS}
+    if config.context == "mapreduce":
+        settings["map_judge"] = config.map_judge or config.judge
+    if config.cascade is not None:
+        settings["cascade"] = [config.cascade, config.confidence]
+    return {
+        "documents": {document.filename: digest(texts[document.filename]) for document in model_documents(model)},
+        "prompt": digest(template),
+        "settings": digest(settings),
+    }
+
+
+def path(scores_dir: Path) -> Path:
+    return Path(scores_dir) / MANIFEST_NAME
+
+
+def load(scores_dir: Path) -> dict:
+    try:
+        with open(path(scores_dir), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {"version": VERSION, "outputs": {}}
+    if manifest.get("version") != VERSION:
+        return {"version": VERSION, "outputs": {}}
+    return manifest
+
+
+def save(scores_dir: Path, manifest: dict) -> None:
+    target = path(scores_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp, target)
+
+
+def record(scores_dir: Path, entries: list[tuple[Model, Indicator, dict, Path]]) -> None:
+    """Store the fingerprints of freshly written score files."""
+    manifest = load(scores_dir)
+    for model, indicator, fingerprint_, output_path in entries:
+        with open(output_path, "rb") as f:
+            output_hash = digest(f.read())
+        manifest["outputs"][pair_key(model, indicator)] = {
+            "output": Path(output_path).name,
+            "output_hash": output_hash,
+            "updated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            **fingerprint_,
+        }
+    save(scores_dir, manifest)
+
+
+@dataclass
+class Plan:
+    stale: list[tuple[Model, Indicator]] = field(default_factory=list)
+    reused: list[tuple[Model, Indicator]] = field(default_factory=list)
+    reasons: dict[str, list[str]] = field(default_factory=dict)
+
+
+def staleness(entry: dict | None, current: dict, output_path: Path) -> list[str]:
+    """Why the score file of a pair must be regenerated; empty when it is fresh."""
+    if not output_path.exists():
+        return ["score file missing"]
+    if entry is None:
+        return ["not in manifest"]
+    reasons = []
+    with open(output_path, "rb") as f:
+        if entry.get("output_hash") != digest(f.read()):
+            reasons.append("score file changed since it was written")
+    for filename, value in current["documents"].items():
+        if entry.get("documents", {}).get(filename) != value:
+            reasons.append(f"document changed: {filename}")
+    if entry.get("prompt") != current["prompt"]:
+        reasons.append("prompt changed")
+    if entry.get("settings") != current["settings"]:
+        reasons.append("judge settings changed")
+    return reasons
+
+
+def plan(pairs: list[tuple[Model, Indicator]], fingerprints: dict[tuple[str, str], dict], scores_dir: Path) -> Plan:
+    outputs = load(scores_dir)["outputs"]
+    result = Plan()
+    for model, indicator in pairs:
+        reasons = staleness(
+            outputs.get(pair_key(model, indicator)),
+            fingerprints[model.key, indicator.key],
+            Path(scores_dir) / indicator.output_file(model),
+        )
+        if reasons:
+            result.stale.append((model, indicator))
+            result.reasons[pair_key(model, indicator)] = reasons
+        else:
+            result.reused.append((model, indicator))
+    return result
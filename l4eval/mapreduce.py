@@ -0,0 +1,169 @@
+"""Map-reduce evaluation that covers every character of every document.
+
+The map step splits each document into overlapping chunks and asks the judge,
+one concurrent call per chunk, for verbatim evidence quotes relevant to the
+indicator.  The reduce step sends the indicator's usual system prompt with the
+collected evidence in place of the documents, so the answer keeps the
+existing JSON schema.  If any map call fails the pair is not reduced: an
+answer built on part of the evidence could score a disclosure as missing.
+"""
+
+import asyncio
+
+from . import cache, telemetry
+from .documents import chunk_text
+from .judge import supports_json_mode, usage_dict
+from .output import loads_lenient
+from .registry import Document, Indicator, Model
+
+CHUNK_CHARS = 24000
+OVERLAP_CHARS = 1000
+
+MAP_SYSTEM_PROMPT = """
+You are assisting an expert evaluator of AI model transparency.
+
+The evaluator will score the {model} model on the indicator below. Their full instructions are:
+
+<<<EVALUATOR INSTRUCTIONS
+{rubric}
+EVALUATOR INSTRUCTIONS>>>
+
+You will receive ONE chunk of ONE source document. Do NOT score anything. Your only task is to
+extract every passage in this chunk that is relevant evidence for the indicator (supporting or
+undermining a higher score), or that defines the scoring rubric if the chunk comes from the FMTI.
+
+Output a single JSON object:
+
+{{
+  "evidence": [
+    {{
+      "location": "page/section heading if visible in the chunk, or 'unknown'",
+      "quote": "verbatim English quote copied exactly from the chunk"
+    }}
+  ]
+}}
+
+Constraints:
+- Quotes MUST be copied verbatim from the chunk. Do NOT paraphrase or merge passages.
+- Return {{"evidence": []}} if nothing in the chunk is relevant.
+- Your entire response must be valid JSON. Do NOT include any commentary outside the JSON object.
+"""
+
+MAP_USER_PROMPT = """
+[DOCUMENT: {label}] (chunk {index} of {total}, characters {start}-{end})
+{text}
+
+Extract the relevant evidence from this chunk and output ONLY the JSON object.
+"""
+
+REDUCE_PREAMBLE = (
+    "The documents were too long to send in full. Every chunk of every document was read and the "
+    "passages relevant to this indicator were extracted verbatim; they are listed below per document. "
+    "Treat them as the complete relevant content of the documents."
+)
+
+
+class MapFailed(RuntimeError):
+    """Some chunks of the documents could not be searched for evidence."""
+
+
+def parse_evidence(raw_output: str | None) -> list[dict]:
+    data, _ = loads_lenient(raw_output)
+    return [item for item in data.get("evidence", []) if isinstance(item, dict) and item.get("quote")]
+
+
+async def map_chunk(
+    client,
+    model: Model,
+    indicator: Indicator,
+    document: Document,
+    text: str,
+    span: tuple[int, int],
+    index: int,
+    total: int,
+    semaphore: asyncio.Semaphore,
+    judge: str,
+    temperature: float,
+) -> list[dict]:
+    start, end = span
+    messages = [
+        {"role": "system", "content": MAP_SYSTEM_PROMPT.format(model=model.name, rubric=indicator.system_prompt(model))},
+        {
+            "role": "user",
+            "content": MAP_USER_PROMPT.format(
+                label=document.label, index=index, total=total, start=start, end=end, text=text[start:end]
+            ),
+        },
+    ]
+    params = {"model": judge, "messages": messages, "temperature": temperature, "stream": False}
+    if supports_json_mode(judge):
+        params["response_format"] = {"type": "json_object"}
+    async with semaphore:
+        with telemetry.span("request", purpose="map", judge=judge, document=document.filename, chunk=f"{start}-{end}"):
+            response = await client.chat.completions.create(**params)
+            telemetry.record_usage(judge, usage_dict(response), cached=cache.is_hit(response))
+    evidence = parse_evidence(response.choices[0].message.content)
+    for item in evidence:
+        item["chunk"] = f"{start}-{end}"
+    return evidence
+
+
+async def reduce_messages(
+    client,
+    model: Model,
+    indicator: Indicator,
+    documents: tuple[Document, ...],
+    texts: dict[str, str],
+    semaphore: asyncio.Semaphore,
+    judge: str,
+    temperature: float,
+    chunk_chars: int = CHUNK_CHARS,
+    overlap_chars: int = OVERLAP_CHARS,
+) -> list[dict]:
+    """Run the map step over ``documents`` and return the reduce-step messages.
+
+    Raises ``MapFailed`` if any chunk's map call failed.
+    """
+    jobs = []
+    for document in documents:
+        text = texts[document.filename]
+        spans = chunk_text(text, chunk_chars, overlap_chars)
+        for index, span in enumerate(spans, 1):
+            jobs.append(
+                (
+                    document,
+                    map_chunk(
+                        client, model, indicator, document, text, span, index, len(spans),
+                        semaphore, judge, temperature,
+                    ),
+                )
+            )
+    outcomes = await asyncio.gather(*(job for _, job in jobs), return_exceptions=True)
+
+    failures = [(document, outcome) for (document, _), outcome in zip(jobs, outcomes) if isinstance(outcome, BaseException)]
+    if failures:
+        counts = {}
+        for document, _ in failures:
+            counts[document.label] = counts.get(document.label, 0) + 1
+        first = failures[0][1]
+        raise MapFailed(
+            f"{len(failures)} of {len(jobs)} map chunks failed ("
+            + ", ".join(f"{label}: {count}" for label, count in counts.items())
+            + f"); first error: {type(first).__name__}: {first}"
+        )
+
+    sections = {document.label: [] for document in documents}
+    for (document, _), outcome in zip(jobs, outcomes):
+        for item in outcome:
+            location = item.get("location") or "unknown"
+            sections[document.label].append(f"- (location: {location}; chunk chars {item['chunk']}) \"{item['quote']}\"")
+
+    parts = [REDUCE_PREAMBLE]
+    for label, lines in sections.items():
+        body = "\n".join(lines) if lines else "(no relevant passages found)"
+        parts.append(f"[EVIDENCE FROM DOCUMENT: {label}]\n{body}")
+    parts.append(indicator.instruction(model).strip())
+    return [
+        {"role": "system", "content": indicator.system_prompt(model)},
+        {"role": "user", "content": "\n" + "\n\n".join(parts) + "\n"},
+    ]
@@ -0,0 +1,425 @@
+"""Offline stand-in for an OpenAI-compatible chat-completions provider.
+
+The server answers ``POST /chat/completions`` (and ``/v1/chat/completions``),
+streamed or not, with canned JSON shaped like ``Scores/*.json``: the
+indicator blocks requested in the prompt (with a random ``confidence`` when
+one is asked for), evidence lists for map-step prompts.  Latency is drawn
+from a log-normal distribution plus a per-token generation time, and a share
+of requests can be failed with 500 or throttled with 429 + ``Retry-After``.
+Usage includes DeepSeek-style prefix-cache hit/miss counts from a simulated
+block-level prefix cache.
+
+It also implements the parts of the Files and Batch APIs used by
+``l4eval.batch``: uploading a batch JSONL file, creating a batch, polling it
+and downloading its output file.  A batch completes ``batch_seconds`` after
+creation, each line answered like a live request but without the latency.
+
+Run it with ``python -m l4eval mock-server --port 8000`` and point the
+engine at ``--base-url http://127.0.0.1:8000``.
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from .output import VALID_SCORES
+from .registry import SCORES_DIR
+
+CHARS_PER_TOKEN = 4
+CACHE_BLOCK_CHARS = 256
+_OUTPUT_KEY = re.compile(r'"(indicator_L4_\w+)"')
+
+
+@dataclass
+class MockConfig:
+    latency_median: float = 0.5
+    latency_sigma: float = 0.5
+    tokens_per_second: float = 2000.0
+    completion_tokens: int = 600
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+    chunk_chars: int = 64
+    score_noise: float = 0.0
+    batch_seconds: float = 2.0
+    seed: int | None = None
+
+
+def load_canned_blocks(scores_dir: Path = SCORES_DIR) -> dict[str, dict]:
+    """Indicator blocks from the score files, keyed by output key."""
+    blocks = {}
+    for path in sorted(Path(scores_dir).glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for key, block in data.items():
+            if key.startswith("indicator_") and isinstance(block, dict):
+                blocks.setdefault(key, block)
+    return blocks
+
+
+GENERIC_BLOCK = {
+    "rubric_summary": "Canned rubric summary from the offline mock judge.",
+    "raw_score": 0.5,
+    "raw_scale": "0, 0.5, or 1",
+    "normalized_score_0_1": 0.5,
+    "justification": "Canned justification from the offline mock judge.",
+    "evidence": [{"doc": "unknown", "location": "unknown", "quote": "canned quote"}],
+}
+
+
+class MockJudge:
+    """Request handling logic, independent of the HTTP plumbing."""
+
+    def __init__(self, config: MockConfig, blocks: dict[str, dict] | None = None):
+        self.config = config
+        self.blocks = load_canned_blocks() if blocks is None else blocks
+        self.random = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.prefixes: set[bytes] = set()
+        self.requests = 0
+        self.files: dict[str, dict] = {}
+        self.contents: dict[str, bytes] = {}
+        self.batches: dict[str, dict] = {}
+
+    def answer(self, messages: list[dict]) -> str:
+        system = messages[0].get("content", "") if messages else ""
+        text = "\n".join(message.get("content") or "" for message in messages)
+        if "extract every passage" in system:
+            chunk = messages[-1].get("content", "")
+            quote = " ".join(chunk.split()[20:45])
+            return json.dumps({"evidence": [{"location": "unknown", "quote": quote}] if quote else []})
+        if "distil the" in system:
+            lines = [line.strip() for line in messages[-1].get("content", "").splitlines() if len(line.split()) >= 8]
+            passages = [" ".join(lines[i : i + 3]) for i in range(40, min(len(lines), 200), 40)]
+            passages.append("The mock judge made this passage up, so it must not verify.")
+            summary = "Score 1 for explicit disclosure, 0.5 for partial disclosure and 0 otherwise."
+            return json.dumps({"rubric_summary": summary, "passages": passages})
+        keys = list(dict.fromkeys(_OUTPUT_KEY.findall(text))) or ["indicator_L4_1"]
+        answer = {"model": "mock"}
+        for key in keys:
+            answer[key] = self.noisy(self.blocks.get(key, GENERIC_BLOCK))
+            if '"confidence"' in text:
+                with self.lock:
+                    answer[key] = {**answer[key], "confidence": round(self.random.uniform(0.5, 1.0), 2)}
+        return json.dumps(answer, ensure_ascii=False, indent=2)
+
+    def noisy(self, block: dict) -> dict:
+        """``block``, with its score changed with probability ``score_noise``."""
+        with self.lock:
+            if self.random.random() >= self.config.score_noise:
+                return block
+            score = self.random.choice([score for score in VALID_SCORES if score != block.get("raw_score")])
+        return {**block, "raw_score": score, "normalized_score_0_1": float(score)}
+
+    def cache_usage(self, messages: list[dict]) -> tuple[int, int]:
+        """Prompt tokens served from / missing in the simulated prefix cache."""
+        prompt = json.dumps(messages, ensure_ascii=False)
+        digest = hashlib.sha256()
+        hit_blocks = 0
+        hit = True
+        new = []
+        for start in range(0, len(prompt) - CACHE_BLOCK_CHARS + 1, CACHE_BLOCK_CHARS):
+            digest.update(prompt[start : start + CACHE_BLOCK_CHARS].encode("utf-8"))
+            key = digest.digest()
+            with self.lock:
+                cached = key in self.prefixes
+            if hit and cached:
+                hit_blocks += 1
+            else:
+                hit = False
+                new.append(key)
+        with self.lock:
+            self.prefixes.update(new)
+        total = math.ceil(len(prompt) / CHARS_PER_TOKEN)
+        hits = hit_blocks * CACHE_BLOCK_CHARS // CHARS_PER_TOKEN
+        return hits, total - hits
+
+    def latency(self) -> float:
+        with self.lock:
+            return self.random.lognormvariate(math.log(self.config.latency_median), self.config.latency_sigma)
+
+    def failure(self) -> int | None:
+        with self.lock:
+            self.requests += 1
+            roll = self.random.random()
+        if roll < self.config.throttle_rate:
+            return 429
+        if roll < self.config.throttle_rate + self.config.error_rate:
+            return 500
+        return None
+
+    def usage(self, messages: list[dict], content: str) -> dict:
+        hits, misses = self.cache_usage(messages)
+        completion = max(len(content) // CHARS_PER_TOKEN, 1) + self.config.completion_tokens
+        return {
+            "prompt_tokens": hits + misses,
+            "completion_tokens": completion,
+            "total_tokens": hits + misses + completion,
+            "prompt_cache_hit_tokens": hits,
+            "prompt_cache_miss_tokens": misses,
+            "completion_tokens_details": {"reasoning_tokens": self.config.completion_tokens},
+        }
+
+    def completion(self, request: dict) -> dict:
+        """Non-streamed ``chat.completion`` body answering ``request``."""
+        messages = request.get("messages", [])
+        content = self.answer(messages)
+        return {
+            "id": f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": self.usage(messages, content),
+        }
+
+    def add_file(self, filename: str, purpose: str, content: bytes) -> dict:
+        file_id = f"file-mock-{uuid.uuid4().hex[:12]}"
+        record = {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed",
+        }
+        with self.lock:
+            self.files[file_id] = record
+            self.contents[file_id] = content
+        return record
+
+    def create_batch(self, request: dict) -> dict:
+        batch_id = f"batch_mock_{uuid.uuid4().hex[:12]}"
+        batch = {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": request.get("endpoint", "/v1/chat/completions"),
+            "input_file_id": request["input_file_id"],
+            "completion_window": request.get("completion_window", "24h"),
+            "status": "in_progress",
+            "created_at": int(time.time()),
+            "in_progress_at": int(time.time()),
+            "metadata": request.get("metadata"),
+            "output_file_id": None,
+            "error_file_id": None,
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+        }
+        with self.lock:
+            self.batches[batch_id] = batch
+        timer = threading.Timer(self.config.batch_seconds, self.run_batch, args=(batch_id,))
+        timer.daemon = True
+        timer.start()
+        return batch
+
+    def run_batch(self, batch_id: str) -> None:
+        batch = self.batches[batch_id]
+        content = self.contents[batch["input_file_id"]].decode("utf-8")
+        lines = [json.loads(line) for line in content.splitlines() if line.strip()]
+        output, failed = [], 0
+        for line in lines:
+            if self.failure() is None:
+                response = {"status_code": 200, "request_id": uuid.uuid4().hex, "body": self.completion(line["body"])}
+                error = None
+            else:
+                failed += 1
+                response = None
+                error = {"code": "server_error", "message": "Internal error (mock)"}
+            output.append(
+                {"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": line["custom_id"], "response": response, "error": error}
+            )
+        content = "".join(json.dumps(item) + "\n" for item in output).encode("utf-8")
+        record = self.add_file(f"{batch_id}_output.jsonl", "batch_output", content)
+        with self.lock:
+            batch.update(
+                status="completed",
+                completed_at=int(time.time()),
+                output_file_id=record["id"],
+                request_counts={"total": len(lines), "completed": len(lines) - failed, "failed": failed},
+            )
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    judge: MockJudge
+    routes: dict = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def dispatch(self, method: str) -> None:
+        path = self.path.split("?", 1)[0].removeprefix("/v1")
+        for (route_method, pattern), handler in self.routes.items():
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                try:
+                    handler(self, *match.groups())
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up on the request (e.g. a cancelled vote sample).
+                    self.close_connection = True
+                return
+        self.read_body()
+        self.send_json(404, {"error": {"message": f"no route for {method} {path}"}})
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def chat_completions(self) -> None:
+        request = json.loads(self.read_body() or b"{}")
+        judge = self.judge
+        status = judge.failure()
+        if status == 429:
+            self.send_json(
+                429,
+                {"error": {"message": "Rate limit reached (mock)", "type": "rate_limit_error"}},
+                {"Retry-After": f"{judge.config.retry_after:g}"},
+            )
+            return
+        time.sleep(judge.latency())
+        if status == 500:
+            self.send_json(500, {"error": {"message": "Internal error (mock)", "type": "server_error"}})
+            return
+
+        body = judge.completion(request)
+        if not request.get("stream"):
+            time.sleep(body["usage"]["completion_tokens"] / judge.config.tokens_per_second)
+            self.send_json(200, body)
+            return
+        content = body["choices"][0]["message"]["content"]
+        self.stream(body["id"], body["model"], content, body["usage"], request.get("stream_options") or {})
+
+    def stream(self, completion_id: str, model: str, content: str, usage: dict, options: dict) -> None:
+        config = self.judge.config
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(delta: dict | None, finish: str | None = None, extra: dict | None = None) -> None:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish}],
+                **(extra or {}),
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        try:
+            event({"role": "assistant", "reasoning_content": "Thinking (mock)."})
+            time.sleep(config.completion_tokens / config.tokens_per_second)
+            per_chunk = config.chunk_chars / CHARS_PER_TOKEN / config.tokens_per_second
+            for start in range(0, len(content), config.chunk_chars):
+                event({"content": content[start : start + config.chunk_chars]})
+                time.sleep(per_chunk)
+            event({}, "stop")
+            if options.get("include_usage"):
+                event(None, extra={"usage": usage})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client aborted the stream, e.g. on an invalid answer.
+            pass
+
+    def upload_file(self) -> None:
+        body = self.read_body()
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode("latin-1") + body
+        )
+        fields, filename, content = {}, "upload", b""
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if part.get_filename() is not None:
+                filename, content = part.get_filename(), part.get_payload(decode=True)
+            else:
+                fields[name] = part.get_content().strip()
+        self.send_json(200, self.judge.add_file(filename, fields.get("purpose", "batch"), content))
+
+    def get_file(self, file_id: str) -> None:
+        record = self.judge.files.get(file_id)
+        if record is None:
+            self.send_json(404, {"error": {"message": f"no file {file_id}"}})
+            return
+        self.send_json(200, record)
+
+    def get_file_content(self, file_id: str) -> None:
+        content = self.judge.contents.get(file_id)
+        if content is None:
+            self.send_json(404, {"error": {"message": f"no file {file_id}"}})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def create_batch(self) -> None:
+        request = json.loads(self.read_body() or b"{}")
+        if request.get("input_file_id") not in self.judge.files:
+            self.send_json(400, {"error": {"message": f"no input file {request.get('input_file_id')}"}})
+            return
+        self.send_json(200, self.judge.create_batch(request))
+
+    def get_batch(self, batch_id: str) -> None:
+        batch = self.judge.batches.get(batch_id)
+        if batch is None:
+            self.send_json(404, {"error": {"message": f"no batch {batch_id}"}})
+            return
+        with self.judge.lock:
+            self.send_json(200, dict(batch))
+
+
+Handler.routes = {
+    ("POST", r"/chat/completions"): Handler.chat_completions,
+    ("POST", r"/files"): Handler.upload_file,
+    ("GET", r"/files/([\w-]+)"): Handler.get_file,
+    ("GET", r"/files/([\w-]+)/content"): Handler.get_file_content,
+    ("POST", r"/batches"): Handler.create_batch,
+    ("GET", r"/batches/(\w+)"): Handler.get_batch,
+}
+
+
+def make_server(host: str = "127.0.0.1", port: int = 0, config: MockConfig | None = None) -> ThreadingHTTPServer:
+    """A ready-to-serve mock server; ``port=0`` picks a free port."""
+    handler = type("MockHandler", (Handler,), {"judge": MockJudge(config or MockConfig())})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(config: MockConfig | None = None) -> tuple[ThreadingHTTPServer, str]:
+    """Serve on a free local port from a daemon thread; returns the base URL."""
+    server = make_server(config=config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
@@ -0,0 +1,225 @@
+"""Structured-output layer for judge answers.
+
+``parse_scores`` pulls the JSON object out of fenced or prefixed text,
+repairs common defects (smart-quote delimiters, trailing commas, raw control
+characters in strings, truncation), coerces trivially fixable fields and
+validates every indicator block.  Only when that fails does the engine ask a
+cheap judge to fix the JSON, sending the broken answer instead of the full
+document prompt again.
+"""
+
+import json
+import re
+
+VALID_SCORES = (0, 0.5, 1)
+FIX_JUDGE = "deepseek-chat"
+
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_SMART_CLOSER = re.compile(r"\s*[:,}\]]")
+
+FIX_SYSTEM_PROMPT = """
+You repair malformed JSON produced by another model. You do not evaluate anything yourself.
+
+Return the same content as a single valid JSON object that satisfies these rules:
+- Top-level keys: "model" and {keys}.
+- Each indicator block is an object with "rubric_summary", "raw_score", "raw_scale",
+  "normalized_score_0_1", "justification" and "evidence".
+- raw_score is one of 0, 0.5 or 1, and normalized_score_0_1 is exactly equal to raw_score.
+- evidence is a list of objects with "doc", "location" and "quote" strings.
+
+Keep every value from the input; only fix the structure. If a value is cut off, end it
+where it stops. Output ONLY the JSON object.
+"""
+
+FIX_USER_PROMPT = """
+Problems found:
+{errors}
+
+Malformed output:
+{raw}
+"""
+
+
+def extract_json(text: str) -> str:
+    """The outermost ``{...}`` in ``text``, or everything from the first ``{``
+    if the object is never closed."""
+    start = text.find("{")
+    if start < 0:
+        return text.strip()
+    depth, in_string, escape = 0, False, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+    return text[start:]
+
+
+def _escape_controls_and_close(text: str) -> str:
+    """Escape raw control characters inside strings and close whatever a
+    truncated answer left open."""
+    out, stack = [], []
+    in_string, escape = False, False
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            elif ch in "\n\r\t":
+                ch = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}[ch]
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+        out.append(ch)
+    if not stack and not in_string:
+        return "".join(out)
+    repaired = "".join(out)
+    if escape:
+        repaired = repaired[:-1]
+    if in_string:
+        repaired += '"'
+    # Drop a dangling separator or a key still waiting for its value.
+    repaired = re.sub(r'(,\s*"[^"]*"\s*:?\s*|[,:]\s*)$', "", repaired.rstrip())
+    return repaired + "".join(reversed(stack))
+
+
+def _smart_delimiters(text: str) -> str:
+    """Replace smart quotes used as string delimiters with ``"``.
+
+    Outside a string a smart quote opens one; inside a string it opened, a
+    smart quote followed by ``:``, ``,``, ``}`` or ``]`` closes it.  Smart
+    quotes within ordinary strings are content and are kept.
+    """
+    out = []
+    in_string, smart, escape = False, False, False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            elif ch in "“”" and smart and _SMART_CLOSER.match(text, i + 1):
+                ch, in_string = '"', False
+        elif ch == '"':
+            in_string, smart = True, False
+        elif ch in "“”":
+            ch, in_string, smart = '"', True, True
+        out.append(ch)
+    return "".join(out)
+
+
+def _strip_trailing_commas(text: str) -> str:
+    return _TRAILING_COMMA.sub(r"\1", text)
+
+
+def loads_lenient(text: str | None):
+    """``json.loads`` with extraction and repair; returns ``(data, repaired)``.
+
+    The repairs are tried one after another, each on top of the previous
+    ones, and parsing stops at the first that yields valid JSON.
+    """
+    text = text or ""
+    try:
+        return json.loads(text), False
+    except json.JSONDecodeError:
+        pass
+    candidate = extract_json(text)
+    for repair in (None, _smart_delimiters, _escape_controls_and_close, _strip_trailing_commas):
+        if repair is not None:
+            candidate = repair(candidate)
+        try:
+            return json.loads(candidate), True
+        except json.JSONDecodeError as exc:
+            error = exc
+    raise error
+
+
+def _as_score(value):
+    if isinstance(value, str):
+        try:
+            value = float(value.strip())
+        except ValueError:
+            return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value in VALID_SCORES:
+        return 0.5 if value == 0.5 else int(value)
+    return value
+
+
+def coerce_block(block: dict) -> None:
+    """Fix fields with a single obvious repair, in place."""
+    if "raw_score" in block:
+        block["raw_score"] = _as_score(block["raw_score"])
+        # A normalized score the judge gave is validated, not overwritten:
+        # disagreeing with raw_score is a defect for the fix call.
+        if "normalized_score_0_1" in block:
+            block["normalized_score_0_1"] = _as_score(block["normalized_score_0_1"])
+        elif block["raw_score"] in VALID_SCORES:
+            block["normalized_score_0_1"] = float(block["raw_score"])
+    if isinstance(block.get("evidence"), dict):
+        block["evidence"] = [block["evidence"]]
+
+
+def validate_block(key: str, block) -> list[str]:
+    if not isinstance(block, dict):
+        return [f"{key} is missing or not an object"]
+    errors = []
+    raw = block.get("raw_score")
+    if isinstance(raw, bool) or raw not in VALID_SCORES:
+        errors.append(f"{key}.raw_score must be one of {VALID_SCORES}, got {raw!r}")
+    elif block.get("normalized_score_0_1") != raw:
+        errors.append(f"{key}.normalized_score_0_1 must equal raw_score")
+    evidence = block.get("evidence")
+    if not isinstance(evidence, list):
+        errors.append(f"{key}.evidence must be a list")
+    else:
+        for i, item in enumerate(evidence):
+            if not isinstance(item, dict) or not isinstance(item.get("quote"), str):
+                errors.append(f"{key}.evidence[{i}] must be an object with a 'quote' string")
+    return errors
+
+
+def validate(scores, output_keys) -> list[str]:
+    if not isinstance(scores, dict):
+        return ["output is not a JSON object"]
+    return [error for key in output_keys for error in validate_block(key, scores.get(key))]
+
+
+def parse_scores(raw_output: str | None, output_keys) -> tuple[dict | None, list[str]]:
+    """Parse, repair and validate a judge answer; returns ``(scores, errors)``."""
+    try:
+        scores, _ = loads_lenient(raw_output)
+    except json.JSONDecodeError as exc:
+        return None, [f"output is not valid JSON even after repair: {exc}"]
+    if isinstance(scores, dict):
+        for key in output_keys:
+            if isinstance(scores.get(key), dict):
+                coerce_block(scores[key])
+    return scores, validate(scores, output_keys)
+
+
+def fix_messages(raw_output: str | None, errors: list[str], output_keys) -> list[dict]:
+    keys = ", ".join(f'"{key}"' for key in output_keys)
+    return [
+        {"role": "system", "content": FIX_SYSTEM_PROMPT.format(keys=keys)},
+        {"role": "user", "content": FIX_USER_PROMPT.format(errors="\n".join(f"- {e}" for e in errors), raw=raw_output)},
+    ]
@@ -0,0 +1,88 @@
+"""Assembly of the judge messages from indicator prompts and document texts."""
+
+from . import prompts
+from .prompts import DOCUMENTS_PREAMBLE
+from .registry import FMTI, Indicator, Model
+
+LAYOUTS = ("legacy", "prefix")
+
+# Shared by every indicator in the "prefix" layout, so that the system prompt
+# and the documents form a byte-identical prefix the provider can cache.
+SHARED_SYSTEM_PROMPT = """
+You are an expert evaluator of AI model transparency.
+
+The user message first lists the source documents you may use. It ends with the
+[EVALUATION TASK] section(s) holding the indicator, the scoring rubric, your tasks and
+the exact JSON output format. Follow them exactly and output ONLY the JSON object.
+"""
+
+BATCH_INSTRUCTION = """
+Perform each evaluation task above independently, applying only that task's rubric.
+
+Each task describes the JSON object it would produce on its own. Instead of separate objects,
+output ONE JSON object with a "model" key set to "{model}" and, as further top-level keys,
+the indicator block of every task exactly as specified there: {keys}.
+
+Your entire response must be valid JSON. Do NOT include any commentary outside the JSON object.
+"""
+
+
+def model_documents(model: Model):
+    """Documents sent for ``model``: its own documents followed by the FMTI."""
+    return (*model.documents, FMTI)
+
+
+def _documents_block(documents, texts: dict[str, str], preamble: str = DOCUMENTS_PREAMBLE, labels=None) -> list[str]:
+    parts = [preamble]
+    for document in documents:
+        label = (labels or {}).get(document.filename, document.label)
+        parts.append(f"[DOCUMENT: {label}]\n{texts[document.filename]}")
+    return parts
+
+
+def build_messages(model: Model, indicator: Indicator, texts: dict[str, str], layout: str = "legacy") -> list[dict]:
+    """Messages for one pair.
+
+    ``legacy`` reproduces the scripts byte for byte: the indicator prompt as
+    system message and the documents, worded as in the pair's script, in the
+    user message.  ``prefix`` puts a shared system
+    prompt and the documents (FMTI first) ahead of everything indicator
+    specific, so the second and later indicators of a model hit the provider's
+    prefix cache.
+    """
+    if layout == "prefix":
+        parts = _documents_block((FMTI, *model.documents), texts)
+        parts.append("[EVALUATION TASK]\n" + indicator.system_prompt(model).strip())
+        parts.append(indicator.instruction(model).strip())
+        return [
+            {"role": "system", "content": SHARED_SYSTEM_PROMPT},
+            {"role": "user", "content": "\n" + "\n\n".join(parts) + "\n"},
+        ]
+    if layout != "legacy":
+        raise ValueError(f"unknown layout {layout!r}; expected one of {LAYOUTS}")
+    key = (model.key, indicator.key)
+    preamble = prompts.DOCUMENTS_PREAMBLES.get(key, DOCUMENTS_PREAMBLE)
+    parts = _documents_block(model_documents(model), texts, preamble, prompts.DOCUMENT_LABELS.get(key))
+    if key in prompts.BLANK_LINE_BEFORE_FMTI:
+        parts[-1] = "\n" + parts[-1]
+    parts.append(indicator.instruction(model).strip())
+    return [
+        {"role": "system", "content": indicator.system_prompt(model)},
+        {"role": "user", "content": "\n" + "\n\n".join(parts) + "\n"},
+    ]
+
+
+def build_batched_messages(model: Model, indicators: list[Indicator], texts: dict[str, str]) -> list[dict]:
+    """One request scoring every indicator in ``indicators`` for ``model``.
+
+    Uses the prefix layout, with one numbered task per indicator.
+    """
+    parts = _documents_block((FMTI, *model.documents), texts)
+    for number, indicator in enumerate(indicators, 1):
+        parts.append(f"[EVALUATION TASK {number}: {indicator.title}]\n" + indicator.system_prompt(model).strip())
+    keys = ", ".join(f'"{key}"' for indicator in indicators for key in indicator.output_keys)
+    parts.append(BATCH_INSTRUCTION.format(model=model.name, keys=keys).strip())
+    return [
+        {"role": "system", "content": SHARED_SYSTEM_PROMPT},
+        {"role": "user", "content": "\n" + "\n\n".join(parts) + "\n"},
+    ]
@@ -0,0 +1,171 @@
+"""Removal of document sections that never carry transparency disclosures.
+
+``classify`` tags spans of a document's lines with one of ``CATEGORIES``:
+
+- ``references``: a "References"/"Bibliography" section, or any section
+  whose lines are mostly citations (``et al.``, ``arXiv``, URLs, years);
+- ``authors``: contributor and acknowledgement sections, or sections made
+  of short name-like lines;
+- ``toc``: tables of contents (a "Contents" heading or dotted leaders);
+- ``tables``: runs of lines carrying several numbers each, i.e. benchmark
+  tables.  Their captions are prose and stay.
+
+``prune`` drops the spans of the selected categories and leaves a one-line
+marker in their place, so the judge knows something was removed.  It runs
+before truncation, so the freed budget goes to the remaining text.
+``audit_diff`` shows exactly what was removed.
+"""
+
+import difflib
+import re
+from dataclasses import dataclass
+
+from .quotes import find_headings
+
+CATEGORIES = ("references", "authors", "toc", "tables")
+MARKER = "[PRUNED {category}: {lines} lines]"
+
+MIN_SECTION_LINES = 5
+CITATION_SHARE = 0.6
+NAME_SHARE = 0.7
+MIN_TABLE_LINES = 4
+TABLE_GAP = 2
+
+_TITLES = {
+    "references": re.compile(r"(?:\d+\.?\s+)?(?:references|bibliography)", re.I),
+    "authors": re.compile(
+        r"(?:\d+\.?\s+)?(?:authorship\b.*|(?:core\s+)?contributors?\b.*|contributions\b.*|acknowledge?ments?\b.*)", re.I
+    ),
+    "toc": re.compile(r"(?:table of )?contents", re.I),
+    None: re.compile(r"(?:[A-Z]\.?\s+)?appendix(?:\s+[A-Z0-9]+)?\.?|appendices", re.I),
+}
+_CITATION = re.compile(
+    r"\bet al\b|arxiv|\bdoi\b|https?://|\bproceedings\b|\bconference\b|\bpreprint\b|\bjournal\b|^\s*\[\d+\]|\b(?:19|20)\d\d\b[.,)]", re.I
+)
+_NAME_LINE = re.compile(r"[A-Z][\w'’.-]*(?:\s+[A-Z][\w'’.-]*){1,3}(?:\s+[\w&,/ -]{0,40}\b(?:lead|manager|co-lead))?,?")
+_DOTTED = re.compile(r"\.{4,}\s*\d+\s*$")
+_NUMBER = re.compile(r"[-–+±(<>≤≥~]?\d[\d.,]*[%×x)]?[*†]*")
+
+
+@dataclass
+class Span:
+    start: int
+    end: int
+    category: str
+    heading: str | None = None
+
+    @property
+    def lines(self) -> int:
+        return self.end - self.start
+
+
+def _section_starts(lines: list[str]) -> list[tuple[int, str | None]]:
+    """Line indices that open a section, with the category their title implies."""
+    text = "\n".join(lines)
+    line_of = {}
+    offset = 0
+    for i, line in enumerate(lines):
+        line_of[offset] = i
+        offset += len(line) + 1
+    # Section numbers stay small; "2023. URL ..." inside a reference list is
+    # a year, not a heading.
+    starts = {
+        line_of[offset]: None
+        for offset, heading in find_headings(text)
+        if offset in line_of and int(re.match(r"\d+", heading).group()) < 100
+    }
+    for i, line in enumerate(lines):
+        title = line.strip()
+        if len(title) > 80:
+            continue
+        for category, pattern in _TITLES.items():
+            if pattern.fullmatch(title):
+                starts[i] = category
+                break
+    return sorted(starts.items())
+
+
+def _share(lines: list[str], predicate) -> float:
+    content = [line for line in lines if line.strip()]
+    return sum(1 for line in content if predicate(line)) / len(content) if content else 0.0
+
+
+def _content_category(lines: list[str]) -> str | None:
+    if sum(1 for line in lines if line.strip()) < MIN_SECTION_LINES:
+        return None
+    if _share(lines, lambda line: bool(_CITATION.search(line))) >= CITATION_SHARE:
+        return "references"
+    if _share(lines, lambda line: bool(_DOTTED.search(line))) >= 0.5:
+        return "toc"
+    if _share(lines, lambda line: bool(_NAME_LINE.fullmatch(line.strip()))) >= NAME_SHARE:
+        return "authors"
+    return None
+
+
+def _is_table_row(line: str) -> bool:
+    tokens = line.split()
+    numbers = sum(1 for token in tokens if _NUMBER.fullmatch(token))
+    return numbers >= 2 and numbers >= 0.3 * len(tokens)
+
+
+def _table_spans(lines: list[str], start: int, end: int) -> list[Span]:
+    spans, first, last, rows = [], None, None, 0
+    for i in range(start, end + 1):
+        if i < end and _is_table_row(lines[i]):
+            if first is None:
+                first, rows = i, 0
+            last, rows = i, rows + 1
+        elif first is not None and (i == end or i - last > TABLE_GAP or len(lines[i].split()) > 8):
+            if rows >= MIN_TABLE_LINES:
+                spans.append(Span(first, last + 1, "tables"))
+            first = None
+    return spans
+
+
+def classify(text: str) -> list[Span]:
+    """Spans of ``text``'s lines (end exclusive) with their category."""
+    lines = text.split("\n")
+    starts = _section_starts(lines)
+    bounds = [(0, None, None)] + [(i, category, lines[i].strip()) for i, category in starts if i > 0]
+    spans = []
+    for (start, category, heading), (end, _, _) in zip(bounds, bounds[1:] + [(len(lines), None, None)]):
+        category = category or _content_category(lines[start:end])
+        if category:
+            spans.append(Span(start, end, category, heading))
+        else:
+            spans.extend(_table_spans(lines, start, end))
+    # Merge neighbouring spans of the same category (e.g. a references list
+    # split by spurious numbered "headings").
+    merged: list[Span] = []
+    for span in spans:
+        if merged and merged[-1].category == span.category and merged[-1].end == span.start:
+            merged[-1].end = span.end
+        else:
+            merged.append(span)
+    return merged
+
+
+def prune(text: str, categories=CATEGORIES) -> tuple[str, list[Span]]:
+    """``text`` without the spans of ``categories``; returns ``(pruned, removed spans)``."""
+    lines = text.split("\n")
+    removed = [span for span in classify(text) if span.category in categories]
+    out, position = [], 0
+    for span in removed:
+        out.extend(lines[position : span.start])
+        out.append(MARKER.format(category=span.category, lines=span.lines))
+        position = span.end
+    out.extend(lines[position:])
+    return "\n".join(out), removed
+
+
+def audit_diff(original: str, pruned: str, name: str = "document") -> str:
+    """Unified diff of the pruned view against the original text."""
+    return "".join(
+        difflib.unified_diff(
+            original.splitlines(keepends=True),
+            pruned.splitlines(keepends=True),
+            fromfile=f"{name} (original)",
+            tofile=f"{name} (pruned)",
+            n=1,
+        )
+    )
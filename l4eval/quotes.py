@@ -0,0 +1,173 @@
+"""Verification and location of verbatim evidence quotes.
+
+Documents are normalised to lower-case alphanumerics only, which makes the
+match insensitive to the glued words, broken hyphenation, ligatures and quote
+styles of the PDF extractions, and a k-gram hash index over the normalised
+text anchors approximate matches.  A quote is looked up exactly first; if
+that fails, the index votes for candidate alignments and the best one is
+scored with a bounded ``difflib`` alignment.  Each verified quote gets the
+character offset in the original text and the nearest preceding section
+heading.
+"""
+
+import bisect
+import functools
+import re
+import unicodedata
+from collections import Counter
+from difflib import SequenceMatcher
+from pathlib import Path
+
+from . import documents
+from .prompting import model_documents
+from .registry import DOCUMENTS_DIR, MODELS, Model
+
+K = 12
+STRIDE = 4
+MATCH_THRESHOLD = 0.85
+MIN_VOTES = 0.2
+CANDIDATES = 3
+
+_HEADING = re.compile(r"^(\d+(?:\.\d+)*\.?)[ \t]+([A-Z][^\n]{2,80})$", re.M)
+
+
+def normalize(text: str) -> tuple[str, list[int]]:
+    """Lower-case alphanumerics of ``text`` and their offsets in ``text``."""
+    chars, offsets = [], []
+    for i, ch in enumerate(text):
+        for folded in unicodedata.normalize("NFKC", ch).lower():
+            if folded.isalnum():
+                chars.append(folded)
+                offsets.append(i)
+    return "".join(chars), offsets
+
+
+def find_headings(text: str) -> list[tuple[int, str]]:
+    headings = []
+    for match in _HEADING.finditer(text):
+        title = match.group(2).strip()
+        # Table rows and wrapped sentences also start with numbers; real
+        # headings are short and carry few digits.
+        if len(title.split()) <= 10 and sum(ch.isdigit() for ch in title) <= 2 and not title.endswith((".", ",")):
+            headings.append((match.start(), f"{match.group(1)} {title}"))
+    return headings
+
+
+class DocumentIndex:
+    def __init__(self, filename: str, text: str):
+        self.filename = filename
+        self.text = text
+        self.normalized, self.offsets = normalize(text)
+        self.headings = find_headings(text)
+        self.heading_offsets = [offset for offset, _ in self.headings]
+        self.kgrams: dict[str, list[int]] = {}
+        for pos in range(0, len(self.normalized) - K + 1, STRIDE):
+            self.kgrams.setdefault(self.normalized[pos : pos + K], []).append(pos)
+
+    def section(self, offset: int) -> str | None:
+        i = bisect.bisect_right(self.heading_offsets, offset) - 1
+        return self.headings[i][1] if i >= 0 else None
+
+    def find(self, needle: str) -> int:
+        return self.normalized.find(needle)
+
+    def align(self, needle: str) -> tuple[float, int] | None:
+        """Best approximate ``(score, normalised start)`` of ``needle``.
+
+        Candidate starts are those where enough of the needle's k-grams line
+        up; only those are scored with ``difflib``.
+        """
+        votes = Counter()
+        for i in range(len(needle) - K + 1):
+            for pos in self.kgrams.get(needle[i : i + K], ()):
+                votes[(pos - i) // STRIDE] += 1
+        # An exact occurrence scores about (len - K) / STRIDE votes; anything
+        # far below MIN_VOTES of that cannot reach MATCH_THRESHOLD.
+        floor = max(1, MIN_VOTES * (len(needle) - K + 1) / STRIDE)
+        best = None
+        for bucket, count in votes.most_common(CANDIDATES):
+            if count < floor:
+                break
+            lo = max(bucket * STRIDE - STRIDE, 0)
+            window = self.normalized[lo : lo + len(needle) + len(needle) // 10 + STRIDE]
+            matcher = SequenceMatcher(None, needle, window, autojunk=False)
+            blocks = matcher.get_matching_blocks()
+            score = sum(block.size for block in blocks) / len(needle)
+            if best is None or score > best[0]:
+                best = (score, lo + blocks[0].b if blocks[0].size else lo)
+        return best
+
+
+class QuoteIndex:
+    """Quote lookup over a set of documents, keyed by filename."""
+
+    def __init__(self, texts: dict[str, str]):
+        self.documents = {name: DocumentIndex(name, text) for name, text in texts.items()}
+
+    def verify(self, quote: str, filenames=None, preferred: str | None = None) -> dict:
+        needle, _ = normalize(quote)
+        filenames = list(filenames or self.documents)
+        if preferred in filenames:
+            filenames.remove(preferred)
+            filenames.insert(0, preferred)
+        best = None
+        if needle:
+            for name in filenames:
+                pos = self.documents[name].find(needle)
+                if pos >= 0:
+                    best = (1.0, name, pos)
+                    break
+            else:
+                for name in filenames:
+                    found = self.documents[name].align(needle)
+                    if found is not None and (best is None or found[0] > best[0]):
+                        best = (found[0], name, found[1])
+        if best is None:
+            return {"verified": False, "score": 0.0, "document": None, "offset": None, "section": None}
+        score, name, start = best
+        document = self.documents[name]
+        offset = document.offsets[min(start, len(document.offsets) - 1)]
+        return {
+            "verified": score >= MATCH_THRESHOLD,
+            "score": round(score, 3),
+            "document": name,
+            "offset": offset,
+            "section": document.section(offset),
+        }
+
+
+def build_index(models=None, documents_dir: Path = DOCUMENTS_DIR) -> QuoteIndex:
+    filenames = [doc.filename for model in models or MODELS.values() for doc in model_documents(model)]
+    return QuoteIndex(documents.load_documents(filenames, documents_dir=documents_dir))
+
+
+@functools.lru_cache(maxsize=None)
+def shared_index(documents_dir: Path = DOCUMENTS_DIR) -> QuoteIndex:
+    """Index over every registered document, built once per process."""
+    return build_index(documents_dir=documents_dir)
+
+
+def model_for(scores: dict) -> Model | None:
+    name = scores.get("model") if isinstance(scores, dict) else None
+    return next((model for model in MODELS.values() if model.name == name), None)
+
+
+def annotate(scores: dict, index: QuoteIndex, model: Model) -> tuple[int, int]:
+    """Add a ``verification`` record to every evidence item in ``scores``.
+
+    Returns ``(verified, total)``.
+    """
+    documents = model_documents(model)
+    labels = {document.label: document.filename for document in documents}
+    verified = total = 0
+    for block in scores.values():
+        if not isinstance(block, dict) or not isinstance(block.get("evidence"), list):
+            continue
+        for item in block["evidence"]:
+            if not isinstance(item, dict) or not isinstance(item.get("quote"), str):
+                continue
+            record = index.verify(item["quote"], [document.filename for document in documents], labels.get(item.get("doc")))
+            item["verification"] = record
+            total += 1
+            verified += record["verified"]
+    return verified, total
@@ -0,0 +1,271 @@
+"""Provider-aware pacing of judge requests.
+
+``Scheduler`` combines three controls shared by every call of a sweep:
+
+- token buckets for requests per minute and tokens per minute, charged with
+  an estimate of each request's prompt and completion tokens;
+- an AIMD concurrency limit that grows by one slot per window of healthy
+  calls and halves on 429/5xx/timeouts (and shrinks gently when latency
+  drifts far above its running average);
+- retries with full-jitter exponential backoff that honour ``Retry-After``.
+
+A streamed call holds its slot until the stream is consumed or closed, and
+a 429/5xx raised mid-stream is retried as well.
+
+``ScheduledClient`` wraps an ``AsyncOpenAI`` client so that the engine's
+calls go through the scheduler unchanged.  Build the wrapped client with
+``max_retries=0`` so the SDK does not retry on its own as well.
+"""
+
+import asyncio
+import random
+import time
+import types
+from email.utils import parsedate_to_datetime
+
+import openai
+
+from . import telemetry
+from .budget import CHARS_PER_TOKEN
+from .streaming import StreamAborted
+
+MAX_RETRIES = 6
+BACKOFF_BASE = 2.0
+BACKOFF_CAP = 120.0
+OUTPUT_ESTIMATE = 4000
+INITIAL_CONCURRENCY = 4
+MAX_CONCURRENCY = 32
+LATENCY_FACTOR = 3.0
+
+RETRYABLE = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError)
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units per minute up to a burst of ``per_minute``."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, amount: float) -> float:
+        """Take ``amount`` units, waiting for them if needed; returns the wait."""
+        # A single request larger than the burst would otherwise wait forever.
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.level >= amount:
+                    self.level -= amount
+                    return waited
+                delay = (amount - self.level) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class AdaptiveLimit:
+    """AIMD concurrency limit driven by call outcomes and latency."""
+
+    def __init__(self, initial: int = INITIAL_CONCURRENCY, minimum: int = 1, maximum: int = MAX_CONCURRENCY):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.active = 0
+        self.latency: float | None = None
+        self.condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.active < int(self.limit))
+            self.active += 1
+
+    async def release(self, overloaded: bool, latency: float | None = None) -> None:
+        async with self.condition:
+            self.active -= 1
+            if overloaded:
+                self.limit = max(self.minimum, self.limit / 2)
+            elif latency is not None:
+                if self.latency is not None and latency > self.latency * LATENCY_FACTOR:
+                    self.limit = max(self.minimum, self.limit * 0.9)
+                else:
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self.condition.notify_all()
+
+
+def retry_after(exc: Exception) -> float | None:
+    """Delay requested by the provider through ``Retry-After``, in seconds."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(params: dict) -> int:
+    chars = sum(len(message.get("content") or "") for message in params.get("messages", ()))
+    return int(chars / CHARS_PER_TOKEN) + params.get("max_tokens", OUTPUT_ESTIMATE)
+
+
+class Scheduler:
+    def __init__(
+        self,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        initial_concurrency: int = INITIAL_CONCURRENCY,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.limit = AdaptiveLimit(initial_concurrency, maximum=max_concurrency)
+        self.max_retries = max_retries
+        self.stats = {"calls": 0, "retries": 0, "throttled": 0, "server_errors": 0, "waited": 0.0}
+
+    async def call(self, request, params: dict, first_attempt: int = 0):
+        """Run ``request(**params)`` under the rate limits, retrying overloads.
+
+        A streamed response keeps its concurrency slot, and is timed, until it
+        is consumed or closed (see ``ScheduledStream``).
+        """
+        for attempt in range(first_attempt, self.max_retries + 1):
+            waited = 0.0
+            if self.requests is not None:
+                waited += await self.requests.acquire(1)
+            if self.tokens is not None:
+                waited += await self.tokens.acquire(estimate_tokens(params))
+            if waited:
+                self.stats["waited"] += waited
+                telemetry.count("pacing_wait", round(waited, 3))
+            await self.limit.acquire()
+            start = time.monotonic()
+            try:
+                response = await request(**params)
+            except RETRYABLE as exc:
+                await self.back_off(exc, attempt)
+                continue
+            except BaseException:
+                await self.limit.release(overloaded=False)
+                raise
+            if params.get("stream"):
+                return ScheduledStream(self, request, params, response, start, attempt)
+            await self.done(start)
+            return response
+
+    async def done(self, start: float) -> None:
+        """Release the slot of a call that succeeded after starting at ``start``."""
+        self.stats["calls"] += 1
+        await self.limit.release(overloaded=False, latency=time.monotonic() - start)
+
+    async def back_off(self, exc: Exception, attempt: int) -> None:
+        """Release the slot of an overloaded call and wait before the next attempt.
+
+        Re-raises ``exc`` once ``attempt`` was the last one.
+        """
+        await self.limit.release(overloaded=True)
+        if isinstance(exc, openai.RateLimitError):
+            self.stats["throttled"] += 1
+            telemetry.count("throttled")
+        else:
+            self.stats["server_errors"] += 1
+        if attempt == self.max_retries:
+            raise exc
+        self.stats["retries"] += 1
+        telemetry.count("retries")
+        delay = retry_after(exc)
+        if delay is None:
+            delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+        await asyncio.sleep(delay)
+
+
+class ScheduledStream:
+    """A streamed response that holds its scheduler slot until consumed or closed.
+
+    A 429/5xx raised mid-stream is retried like one raised by the request:
+    before the first chunk the stream is reopened transparently; after it the
+    chunks already passed on cannot be taken back, so ``StreamAborted`` is
+    raised for the engine's stream retries.
+    """
+
+    def __init__(self, scheduler: Scheduler, request, params: dict, stream, start: float, attempt: int):
+        self.scheduler = scheduler
+        self.request = request
+        self.params = params
+        self.stream = stream
+        self.start = start
+        self.attempt = attempt
+        self.released = False
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def _chunks(self):
+        received = False
+        try:
+            async for chunk in self.stream:
+                received = True
+                yield chunk
+        except RETRYABLE as exc:
+            self.released = True
+            await self.stream.close()
+            await self.scheduler.back_off(exc, self.attempt)
+            if received:
+                raise StreamAborted(f"stream interrupted by {type(exc).__name__}; retrying") from exc
+            self.stream = await self.scheduler.call(self.request, self.params, first_attempt=self.attempt + 1)
+            async for chunk in self.stream:
+                yield chunk
+            return
+        except Exception:
+            if not self.released:
+                self.released = True
+                await self.scheduler.limit.release(overloaded=False)
+            raise
+        await self._release()
+
+    async def _release(self) -> None:
+        if not self.released:
+            self.released = True
+            await self.scheduler.done(self.start)
+
+    async def close(self) -> None:
+        await self.stream.close()
+        await self._release()
+
+
+class _ScheduledCompletions:
+    def __init__(self, owner: "ScheduledClient"):
+        self._owner = owner
+
+    async def create(self, **params):
+        return await self._owner.scheduler.call(self._owner.client.chat.completions.create, params)
+
+
+class ScheduledClient:
+    """``AsyncOpenAI`` look-alike that sends every request through ``scheduler``."""
+
+    def __init__(self, client, scheduler: Scheduler):
+        self.client = client
+        self.scheduler = scheduler
+        self.chat = types.SimpleNamespace(completions=_ScheduledCompletions(self))
+
+    @property
+    def base_url(self):
+        return self.client.base_url
@@ -0,0 +1,116 @@
+"""Registry of evaluated models (document sets) and L4 indicators.
+
+Every script under ``L4_DEV_*`` hard-codes one (model, indicator) pair; the
+engine instead looks both halves up here and evaluates any combination.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import prompts
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DOCUMENTS_DIR = REPO_ROOT / "Documents"
+SCORES_DIR = REPO_ROOT / "Scores"
+
+FMTI_DOCUMENT = "The_Foundation_Model_Transparency_Index_v1.1.txt"
+FMTI_LABEL = "Foundation Model Transparency Index v1.1"
+
+
+@dataclass(frozen=True)
+class Document:
+    label: str
+    filename: str
+
+
+@dataclass(frozen=True)
+class Model:
+    key: str
+    name: str
+    documents: tuple[Document, ...]
+
+
+@dataclass(frozen=True)
+class Indicator:
+    key: str
+    title: str
+    output_keys: tuple[str, ...]
+    output_files: dict[str, str] = field(hash=False)
+
+    def system_prompt(self, model: Model) -> str:
+        return prompts.SYSTEM_PROMPTS[(model.key, self.key)]
+
+    def instruction(self, model: Model) -> str:
+        return prompts.INSTRUCTIONS[(model.key, self.key)]
+
+    def output_file(self, model: Model) -> str:
+        return self.output_files[model.key]
+
+
+FMTI = Document(FMTI_LABEL, FMTI_DOCUMENT)
+
+MODELS = {
+    "gpt4o": Model(
+        key="gpt4o",
+        name="GPT-4o",
+        documents=(
+            Document("GPT-4o System Card", "gpt4o_system_card.txt"),
+            Document("GPT-4 Technical Report", "gpt4_technical_report.txt"),
+        ),
+    ),
+    "gemini": Model(
+        key="gemini",
+        name="Gemini 2.0 Pro",
+        documents=(
+            Document("Gemini 2.5 Pro Preview Model Card", "868214523-Gemini-2-5-Pro-Preview-Model-Card.txt"),
+            Document("Gemini v2.5 Report", "gemini_v2_5_report.txt"),
+        ),
+    ),
+}
+
+INDICATORS = {
+    "training_data": Indicator(
+        key="training_data",
+        title="L4-1 / L4-2: Training data sources and licenses; third-party dataset license metadata",
+        output_keys=("indicator_L4_1", "indicator_L4_2"),
+        output_files={"gpt4o": "gpt4o_L4_scores.json", "gemini": "gemini_L4_scores.json"},
+    ),
+    "coverage": Indicator(
+        key="coverage",
+        title="L4-1: Coverage across demographics or locales is characterized",
+        output_keys=("indicator_L4_coverage",),
+        output_files={"gpt4o": "gpt4o_L4_coverage_scores.json", "gemini": "gemini2_L4_coverage_scores.json"},
+    ),
+    "gaps": Indicator(
+        key="gaps",
+        title="L4-2: Known gaps and limitations documented with mitigation plan",
+        output_keys=("indicator_L4_gaps",),
+        output_files={"gpt4o": "gpt4o_L4_gaps_scores.json", "gemini": "gemini2_L4_gaps_scores.json"},
+    ),
+    "safety_critical": Indicator(
+        key="safety_critical",
+        title="L4_SafetyCritical: Safety-critical use cases explicitly disallowed in system policies",
+        output_keys=("indicator_L4_safety_critical",),
+        output_files={
+            "gpt4o": "gpt4o_L4_safety_critical_scores.json",
+            "gemini": "gemini_L4_safety_critical_scores.json",
+        },
+    ),
+}
+
+
+def select(models: list[str] | None = None, indicators: list[str] | None = None) -> list[tuple[Model, Indicator]]:
+    """Return the (model, indicator) matrix, optionally restricted by key."""
+    for key in models or ():
+        if key not in MODELS:
+            raise KeyError(f"unknown model {key!r}; expected one of {sorted(MODELS)}")
+    for key in indicators or ():
+        if key not in INDICATORS:
+            raise KeyError(f"unknown indicator {key!r}; expected one of {sorted(INDICATORS)}")
+    return [
+        (model, indicator)
+        for model in MODELS.values()
+        if not models or model.key in models
+        for indicator in INDICATORS.values()
+        if not indicators or indicator.key in indicators
+    ]
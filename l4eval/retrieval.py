@@ -0,0 +1,169 @@
+"""BM25 retrieval over the source documents.
+
+Instead of sending the first ``max_chars`` characters of every document, the
+retrieval context mode splits ``Documents/*.txt`` into overlapping chunks,
+indexes them once in an inverted BM25 index persisted under ``.l4eval/``, and
+sends only the chunks that best match the indicator rubric, up to a token
+budget.
+"""
+
+import hashlib
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from .cache import CACHE_DIR
+from .documents import chunk_text
+
+CHUNK_CHARS = 2000
+OVERLAP_CHARS = 200
+TOKEN_BUDGET = 12000
+TOP_K = 16
+K1 = 1.5
+B = 0.75
+
+_WORD = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be been but by can do does for from has have if in into is it its may "
+    "not of on or such that the their them then there these they this to was were which will with "
+    "you your must should only any all each than".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS and len(word) > 1]
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+@dataclass(frozen=True)
+class Chunk:
+    filename: str
+    start: int
+    end: int
+    text: str
+
+
+class BM25Index:
+    def __init__(self, chunks: list[Chunk], postings: dict[str, list[list[int]]], lengths: list[int]):
+        self.chunks = chunks
+        self.postings = postings
+        self.lengths = lengths
+        self.avg_length = sum(lengths) / len(lengths) if lengths else 0.0
+
+    @classmethod
+    def build(cls, texts: dict[str, str], chunk_chars: int = CHUNK_CHARS, overlap_chars: int = OVERLAP_CHARS):
+        chunks, lengths = [], []
+        postings: dict[str, list[list[int]]] = {}
+        for filename, text in texts.items():
+            for start, end in chunk_text(text, chunk_chars, overlap_chars):
+                chunk_id = len(chunks)
+                chunks.append(Chunk(filename, start, end, text[start:end]))
+                counts = Counter(tokenize(text[start:end]))
+                lengths.append(sum(counts.values()))
+                for term, tf in counts.items():
+                    postings.setdefault(term, []).append([chunk_id, tf])
+        return cls(chunks, postings, lengths)
+
+    def search(self, query: str, filenames=None) -> list[tuple[float, Chunk]]:
+        """Rank chunks (optionally only those of ``filenames``) against ``query``."""
+        allowed = set(filenames) if filenames is not None else None
+        n = len(self.chunks)
+        scores: dict[int, float] = {}
+        for term, qtf in Counter(tokenize(query)).items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, tf in postings:
+                norm = tf + K1 * (1 - B + B * self.lengths[chunk_id] / self.avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + qtf * idf * tf * (K1 + 1) / norm
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [
+            (score, self.chunks[chunk_id])
+            for chunk_id, score in ranked
+            if allowed is None or self.chunks[chunk_id].filename in allowed
+        ]
+
+    def to_json(self) -> dict:
+        return {
+            "chunks": [[c.filename, c.start, c.end] for c in self.chunks],
+            "postings": self.postings,
+            "lengths": self.lengths,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict, texts: dict[str, str]):
+        chunks = [Chunk(name, start, end, texts[name][start:end]) for name, start, end in data["chunks"]]
+        return cls(chunks, data["postings"], data["lengths"])
+
+
+def index_path(texts: dict[str, str], chunk_chars: int, overlap_chars: int, cache_dir: Path = CACHE_DIR) -> Path:
+    digest = hashlib.sha256(f"{chunk_chars}:{overlap_chars}".encode())
+    for filename in sorted(texts):
+        digest.update(filename.encode("utf-8"))
+        digest.update(hashlib.sha256(texts[filename].encode("utf-8")).digest())
+    return Path(cache_dir) / f"bm25-{digest.hexdigest()[:16]}.json"
+
+
+def load_or_build(
+    texts: dict[str, str],
+    chunk_chars: int = CHUNK_CHARS,
+    overlap_chars: int = OVERLAP_CHARS,
+    cache_dir: Path = CACHE_DIR,
+) -> BM25Index:
+    """Load the persisted index for exactly these texts, building it if needed."""
+    path = index_path(texts, chunk_chars, overlap_chars, cache_dir)
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            return BM25Index.from_json(json.load(f), texts)
+    index = BM25Index.build(texts, chunk_chars, overlap_chars)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index.to_json(), f)
+    return index
+
+
+def retrieve_texts(
+    index: BM25Index,
+    filenames,
+    query: str,
+    top_k: int = TOP_K,
+    token_budget: int = TOKEN_BUDGET,
+) -> dict[str, str]:
+    """The ``top_k`` best chunks of ``filenames`` for ``query`` within ``token_budget``.
+
+    Returns one text per filename, its selected chunks in document order and
+    labelled with their character offsets.
+    """
+    selected: dict[str, list[Chunk]] = {name: [] for name in filenames}
+    used = 0
+    for _, chunk in index.search(query, filenames)[:top_k * 4]:
+        if sum(map(len, selected.values())) >= top_k:
+            break
+        cost = estimate_tokens(chunk.text)
+        if used + cost > token_budget:
+            continue
+        selected[chunk.filename].append(chunk)
+        used += cost
+    texts = {}
+    for filename, chunks in selected.items():
+        if not chunks:
+            texts[filename] = "[NO RELEVANT PASSAGES RETRIEVED]"
+            continue
+        # Overlapping neighbours are merged so no passage is sent twice.
+        spans: list[list] = []
+        for chunk in sorted(chunks, key=lambda c: c.start):
+            if spans and chunk.start <= spans[-1][1]:
+                last = spans[-1]
+                last[2] += chunk.text[last[1] - chunk.start:]
+                last[1] = max(last[1], chunk.end)
+            else:
+                spans.append([chunk.start, chunk.end, chunk.text])
+        texts[filename] = "\n\n".join(f"[EXCERPT chars {start}-{end}]\n{text.strip()}" for start, end, text in spans)
+    return texts
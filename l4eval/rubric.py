@@ -0,0 +1,219 @@
+"""Per-indicator rubric extracts of the FMTI document.
+
+Every prompt used to carry the whole FMTI (about 30k tokens) only so that the
+judge could write a ``rubric_summary``.  The distillation step runs once per
+indicator: the judge reads the full FMTI and returns the passages that define
+the indicator's scoring rules, plus a rubric summary.  Each passage is checked
+against the FMTI with the quote verifier and replaced by the exact FMTI text
+it matched, so everything sent later is verbatim; unverified passages are
+dropped.  If no passage survives (or no judge is used), the BM25 best chunks
+for the indicator rubric are taken instead.
+
+Extracts are cached under ``.l4eval/rubrics`` keyed by the SHA-256 of the FMTI
+text, so editing, normalizing or pruning the FMTI invalidates them.  With the
+``extract`` rubric mode, evaluation sends the extract and the cached summary
+in place of the FMTI.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from . import cache, telemetry
+from .cache import CACHE_DIR
+from .judge import supports_json_mode, usage_dict
+from .output import loads_lenient
+from .quotes import MATCH_THRESHOLD, DocumentIndex, normalize
+from .registry import FMTI, MODELS, Indicator
+from .retrieval import BM25Index, estimate_tokens
+
+VERSION = 1
+RUBRIC_MODES = ("full", "extract")
+RUBRICS_DIR = CACHE_DIR / "rubrics"
+CHUNK_CHARS = 1200
+TOKEN_BUDGET = 3000
+MAX_PASSAGES = 8
+
+DISTILL_SYSTEM_PROMPT = """
+You are assisting an expert evaluator of AI model transparency.
+
+The evaluator will score foundation models on the indicator below, using the Foundation Model
+Transparency Index (FMTI) as the primary scoring rubric. Their full instructions are:
+
+<<<EVALUATOR INSTRUCTIONS
+{rubric}
+EVALUATOR INSTRUCTIONS>>>
+
+You will receive the complete FMTI text. Do NOT score any model. Your task is to distil the
+rubric the evaluator needs for this indicator:
+
+1. Select the FMTI passages (at most {max_passages}) that define or illustrate how FMTI scores
+   disclosures relevant to this indicator: the scoring scheme, the explicit-disclosure standard
+   and the related indicator definitions.
+2. Summarize the resulting scoring rules for this indicator in your own words.
+
+Output a single JSON object:
+
+{{
+  "rubric_summary": "Short description of the FMTI-style scoring rules for this indicator.",
+  "passages": ["verbatim passage copied exactly from the FMTI text"]
+}}
+
+Constraints:
+- Passages MUST be copied verbatim from the FMTI text. Do NOT paraphrase, shorten or merge them.
+- Your entire response must be valid JSON. Do NOT include any commentary outside the JSON object.
+"""
+
+DISTILL_USER_PROMPT = """
+[DOCUMENT: {label}]
+{text}
+
+Distil the rubric for this indicator and output ONLY the JSON object.
+"""
+
+EXTRACT_PREAMBLE = (
+    "[RUBRIC EXTRACT] The passages below are verbatim excerpts of the FMTI selected for the "
+    "indicator {title!r}; the rest of the document is omitted."
+)
+
+
+def fmti_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def rubric_prompt(indicator: Indicator) -> str:
+    """The indicator's rubric, as written in the prompt of its first model."""
+    return indicator.system_prompt(MODELS[next(iter(indicator.output_files))])
+
+
+def cache_path(indicator: Indicator, text: str, rubrics_dir: Path = RUBRICS_DIR) -> Path:
+    return Path(rubrics_dir) / f"{indicator.key}-v{VERSION}-{fmti_digest(text)[:16]}.json"
+
+
+def _merge(spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[list[int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def locate(document: DocumentIndex, passage: str) -> tuple[int, int] | None:
+    """Character span of ``document.text`` matching ``passage``, if it verifies."""
+    needle, _ = normalize(passage)
+    if not needle:
+        return None
+    pos = document.find(needle)
+    if pos < 0:
+        found = document.align(needle)
+        if found is None or found[0] < MATCH_THRESHOLD:
+            return None
+        pos = found[1]
+    last = min(pos + len(needle), len(document.offsets)) - 1
+    return document.offsets[pos], document.offsets[last] + 1
+
+
+def bm25_spans(indicator: Indicator, text: str, token_budget: int = TOKEN_BUDGET) -> list[tuple[int, int]]:
+    """Best-matching FMTI chunks for the indicator rubric, within ``token_budget``."""
+    index = BM25Index.build({FMTI.filename: text}, CHUNK_CHARS, 0)
+    spans, used = [], 0
+    for _, chunk in index.search(f"{indicator.title}\n{rubric_prompt(indicator)}"):
+        if len(spans) >= MAX_PASSAGES:
+            break
+        cost = estimate_tokens(chunk.text)
+        if used + cost > token_budget:
+            continue
+        spans.append((chunk.start, chunk.end))
+        used += cost
+    return _merge(spans)
+
+
+def build(indicator: Indicator, text: str, answer: str | None = None, judge: str | None = None) -> dict:
+    """The extract record for ``indicator`` from the judge's distillation ``answer``.
+
+    Without an answer, or when none of its passages verifies, the passages are
+    the BM25 chunks instead.
+    """
+    data, _ = loads_lenient(answer) if answer is not None else ({}, None)
+    proposed = [passage for passage in data.get("passages", []) if isinstance(passage, str) and passage.strip()]
+    document = DocumentIndex(FMTI.filename, text)
+    located = [locate(document, passage) for passage in proposed]
+    spans = _merge([span for span in located if span is not None])
+    method = "judge"
+    if not spans:
+        spans, method = bm25_spans(indicator, text), "bm25"
+    summary = data.get("rubric_summary")
+    return {
+        "version": VERSION,
+        "indicator": indicator.key,
+        "fmti_sha256": fmti_digest(text),
+        "method": method,
+        "judge": judge if answer is not None else None,
+        "rubric_summary": summary.strip() if isinstance(summary, str) and summary.strip() else None,
+        "proposed": len(proposed),
+        "rejected": sum(1 for span in located if span is None),
+        "passages": [{"start": start, "end": end, "text": text[start:end]} for start, end in spans],
+    }
+
+
+def save(record: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def load(indicator: Indicator, text: str, rubrics_dir: Path = RUBRICS_DIR) -> dict | None:
+    """The cached extract for this FMTI text, if present and still verbatim."""
+    path = cache_path(indicator, text, rubrics_dir)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if record.get("fmti_sha256") != fmti_digest(text):
+        return None
+    if any(text[passage["start"] : passage["end"]] != passage["text"] for passage in record["passages"]):
+        return None
+    return record
+
+
+def extract(indicator: Indicator, text: str, rubrics_dir: Path = RUBRICS_DIR) -> dict:
+    """The cached extract, or the BM25 one while the indicator is not distilled."""
+    return load(indicator, text, rubrics_dir) or build(indicator, text)
+
+
+async def distill(
+    client, indicator: Indicator, text: str, judge: str, temperature: float, rubrics_dir: Path = RUBRICS_DIR
+) -> dict:
+    """Ask ``judge`` for the indicator's rubric passages and cache the verified extract."""
+    messages = [
+        {
+            "role": "system",
+            "content": DISTILL_SYSTEM_PROMPT.format(rubric=rubric_prompt(indicator), max_passages=MAX_PASSAGES),
+        },
+        {"role": "user", "content": DISTILL_USER_PROMPT.format(label=FMTI.label, text=text)},
+    ]
+    params = {"model": judge, "messages": messages, "temperature": temperature, "stream": False}
+    if supports_json_mode(judge):
+        params["response_format"] = {"type": "json_object"}
+    with telemetry.span("request", purpose="rubric", judge=judge, indicator=indicator.key):
+        response = await client.chat.completions.create(**params)
+        telemetry.record_usage(judge, usage_dict(response), cached=cache.is_hit(response))
+    record = build(indicator, text, response.choices[0].message.content, judge)
+    save(record, cache_path(indicator, text, rubrics_dir))
+    return record
+
+
+def render(record: dict, indicator: Indicator) -> str:
+    """The text sent in place of the FMTI document."""
+    parts = [EXTRACT_PREAMBLE.format(title=indicator.title)]
+    for passage in record["passages"]:
+        parts.append(f"[EXCERPT chars {passage['start']}-{passage['end']}]\n{passage['text'].strip()}")
+    if record.get("rubric_summary"):
+        parts.append(f"[PRECOMPUTED RUBRIC SUMMARY]\n{record['rubric_summary']}")
+    return "\n\n".join(parts)
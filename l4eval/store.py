@@ -0,0 +1,251 @@
+"""Append-only SQLite store of every score ever produced.
+
+Score files are overwritten by each run; the store keeps the history.  It
+has one row per run, one row per (run, model, indicator block) in
+``scores`` and the block's evidence items in ``evidence``.  Rows are never
+updated or deleted (triggers enforce it), and ``scores`` is indexed for the
+two common questions: the latest score of every (model, indicator), for a
+leaderboard, and the history of one (model, indicator), optionally per judge.
+
+``import_scores_dir`` loads existing score files, such as ``Scores/``, as one
+run each.
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+
+from .judge import split_usage
+from .registry import INDICATORS, MODELS, REPO_ROOT, SCORES_DIR
+
+STORE_PATH = REPO_ROOT / ".l4eval" / "results.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    source TEXT NOT NULL,
+    judge TEXT,
+    settings TEXT
+);
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL REFERENCES runs (id),
+    created REAL NOT NULL,
+    model TEXT NOT NULL,
+    indicator TEXT NOT NULL,
+    output_key TEXT NOT NULL,
+    judge TEXT,
+    raw_score REAL,
+    normalized_score REAL,
+    raw_scale TEXT,
+    rubric_summary TEXT,
+    justification TEXT,
+    votes TEXT,
+    samples INTEGER,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    output_file TEXT
+);
+CREATE TABLE IF NOT EXISTS evidence (
+    score_id INTEGER NOT NULL REFERENCES scores (id),
+    position INTEGER NOT NULL,
+    doc TEXT,
+    location TEXT,
+    quote TEXT NOT NULL,
+    verified INTEGER,
+    match_score REAL,
+    section TEXT,
+    PRIMARY KEY (score_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS scores_key_created ON scores (output_key, model, created);
+CREATE INDEX IF NOT EXISTS scores_indicator_created ON scores (indicator, created);
+CREATE INDEX IF NOT EXISTS scores_judge_created ON scores (judge, created);
+CREATE INDEX IF NOT EXISTS scores_created ON scores (created);
+CREATE INDEX IF NOT EXISTS scores_run ON scores (run_id);
+"""
+
+APPEND_ONLY = [
+    f"CREATE TRIGGER IF NOT EXISTS {table}_no_{action} BEFORE {action.upper()} ON {table} "
+    f"BEGIN SELECT RAISE(ABORT, '{table} is append-only'); END"
+    for table in ("runs", "scores", "evidence")
+    for action in ("update", "delete")
+]
+
+
+def _files() -> dict[str, tuple[str, str]]:
+    """Score file name -> (model key, indicator key)."""
+    return {
+        indicator.output_file(model): (model.key, indicator.key)
+        for model in MODELS.values()
+        for indicator in INDICATORS.values()
+        if model.key in indicator.output_files
+    }
+
+
+class ScoreStore:
+    def __init__(self, path: str | Path = STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(SCHEMA)
+        for statement in APPEND_ONLY:
+            self._db.execute(statement)
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def add_run(self, source: str, judge: str | None = None, settings: dict | None = None, run_id: str | None = None, created: float | None = None) -> str:
+        run_id = run_id or uuid.uuid4().hex
+        self._db.execute(
+            "INSERT INTO runs (id, created, source, judge, settings) VALUES (?, ?, ?, ?, ?)",
+            (run_id, created or time.time(), source, judge, json.dumps(settings, default=str) if settings else None),
+        )
+        return run_id
+
+    def add_scores(
+        self,
+        run_id: str,
+        model: str,
+        indicator: str,
+        scores: dict,
+        judge: str | None = None,
+        usage: dict | None = None,
+        output_file: str | None = None,
+        created: float | None = None,
+    ) -> list[int]:
+        """Append every indicator block of a score file; returns the new score ids.
+
+        ``usage`` is the request's; it is split between the blocks, so that
+        the token columns of a run add up to what the judge used.
+        """
+        created = created or time.time()
+        blocks = [(key, block) for key, block in scores.items() if key.startswith("indicator_") and isinstance(block, dict)]
+        ids = []
+        for (key, block), share in zip(blocks, split_usage(usage, len(blocks))):
+            share = share or {}
+            cursor = self._db.execute(
+                "INSERT INTO scores (run_id, created, model, indicator, output_key, judge, raw_score, normalized_score,"
+                " raw_scale, rubric_summary, justification, votes, samples, prompt_tokens, completion_tokens, output_file)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, created, model, indicator, key, judge,
+                    _number(block.get("raw_score")), _number(block.get("normalized_score_0_1")),
+                    block.get("raw_scale"), block.get("rubric_summary"), block.get("justification"),
+                    json.dumps(block["votes"]) if block.get("votes") else None, block.get("samples"),
+                    share.get("prompt_tokens"), share.get("completion_tokens"), output_file,
+                ),
+            )
+            score_id = cursor.lastrowid
+            ids.append(score_id)
+            rows = []
+            for position, item in enumerate(block.get("evidence") or []):
+                if not isinstance(item, dict) or not isinstance(item.get("quote"), str):
+                    continue
+                verification = item.get("verification") or {}
+                rows.append(
+                    (
+                        score_id, position, item.get("doc"), item.get("location"), item["quote"],
+                        None if "verified" not in verification else int(verification["verified"]),
+                        verification.get("score"), verification.get("section"),
+                    )
+                )
+            self._db.executemany(
+                "INSERT INTO evidence (score_id, position, doc, location, quote, verified, match_score, section)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return ids
+
+    def record_results(self, results, judge: str, settings: dict | None = None, source: str = "run") -> str | None:
+        """Append the written score files of engine ``results`` as one run."""
+        written = [result for result in results if result.scores is not None and result.output_path is not None]
+        if not written:
+            return None
+        run_id = self.add_run(source, judge, settings)
+        for result in written:
+            # Pairs the judge cascade did not escalate were scored by its cheap judge.
+            scored_by = result.cascade["judge"] if result.cascade and not result.cascade["escalated"] else judge
+            self.add_scores(run_id, result.model, result.indicator, result.scores, scored_by, result.usage, Path(result.output_path).name)
+        self._db.commit()
+        return run_id
+
+    def import_scores_dir(self, scores_dir: Path = SCORES_DIR, judge: str | None = None) -> tuple[str, int]:
+        """Append the score files of ``scores_dir`` as one run; returns ``(run_id, blocks)``."""
+        files = _files()
+        paths = [path for path in sorted(Path(scores_dir).glob("*.json")) if path.name in files]
+        created = max((path.stat().st_mtime for path in paths), default=time.time())
+        run_id = self.add_run("import", judge, {"scores_dir": str(scores_dir)}, created=created)
+        blocks = 0
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                scores = json.load(f)
+            model, indicator = files[path.name]
+            blocks += len(self.add_scores(run_id, model, indicator, scores, judge, output_file=path.name, created=path.stat().st_mtime))
+        self._db.commit()
+        return run_id, blocks
+
+    def leaderboard(self, output_key: str | None = None, judge: str | None = None) -> list[dict]:
+        """Per model: mean of the latest normalized score of every indicator block, best first."""
+        latest = self.latest(output_key=output_key, judge=judge)
+        board: dict[str, list[float]] = {}
+        for row in latest:
+            if row["normalized_score"] is not None:
+                board.setdefault(row["model"], []).append(row["normalized_score"])
+        return sorted(
+            (
+                {"model": model, "indicators": len(values), "total": sum(values), "mean": sum(values) / len(values)}
+                for model, values in board.items()
+            ),
+            key=lambda row: row["mean"],
+            reverse=True,
+        )
+
+    def latest(self, model: str | None = None, output_key: str | None = None, judge: str | None = None) -> list[dict]:
+        """The most recent score row of every (model, indicator block)."""
+        where, params = _filters(model=model, output_key=output_key, judge=judge)
+        rows = self._db.execute(
+            "SELECT s.* FROM scores s JOIN ("
+            f" SELECT output_key, model, MAX(created) AS created FROM scores {where} GROUP BY output_key, model"
+            ") l ON s.output_key = l.output_key AND s.model = l.model AND s.created = l.created"
+            + (" AND s.judge = ?" if judge else "")
+            + " ORDER BY s.model, s.output_key",
+            params + ([judge] if judge else []),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def history(self, model: str, output_key: str, judge: str | None = None, limit: int = 100) -> list[dict]:
+        """Scores of one (model, indicator block), newest first."""
+        where, params = _filters(model=model, output_key=output_key, judge=judge)
+        rows = self._db.execute(
+            f"SELECT * FROM scores {where} ORDER BY created DESC LIMIT ?",
+            params + [limit],
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def evidence(self, score_id: int) -> list[dict]:
+        rows = self._db.execute("SELECT * FROM evidence WHERE score_id = ? ORDER BY position", (score_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def runs(self, limit: int = 20) -> list[dict]:
+        rows = self._db.execute(
+            "SELECT r.*, COUNT(s.id) AS blocks FROM runs r LEFT JOIN scores s ON s.run_id = r.id"
+            " GROUP BY r.id ORDER BY r.created DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _filters(**columns) -> tuple[str, list]:
+    clauses = [f"{name} = ?" for name, value in columns.items() if value is not None]
+    params = [value for value in columns.values() if value is not None]
+    return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
@@ -0,0 +1,285 @@
+"""Streaming judge calls with incremental JSON checking and early abort.
+
+``IncrementalJSONChecker`` consumes the answer as it streams in and raises
+``StreamAborted`` as soon as a score falls outside {0, 0.5, 1}: no repair
+can recover the judge's verdict from that, so the request is closed instead
+of paying for the rest of a doomed completion.
+
+Defects the repair layer handles (a prose prefix, smart quotes, trailing
+commas, commentary after the closing brace, fields of the wrong type,
+missing blocks) do not abort: the checker stops checking and the complete
+answer goes through ``output.parse_scores`` and the JSON fix call like a
+non-streamed one, which costs far less than sending the prompt again.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from openai.types.chat import ChatCompletion
+
+from . import cache, telemetry
+from .output import VALID_SCORES
+
+SCORE_KEYS = ("raw_score", "normalized_score_0_1")
+_SCALAR_START = set("-0123456789tfn")
+_SCALAR_CHARS = set("+-.0123456789eEtruefalsn")
+
+
+class StreamAborted(Exception):
+    """The streamed output can no longer be valid under the expected schema."""
+
+
+class IncrementalJSONChecker:
+    """Push-down JSON prefix validator with schema checks for score objects.
+
+    ``output_keys`` are the top-level indicator keys (``indicator_L4_gaps``,
+    ...) whose values must be objects with an ``evidence`` array and scores in
+    ``VALID_SCORES``; unless ``require_all`` is false, all of them must be
+    present.  A Markdown code fence around the object is tolerated.  After a
+    repairable defect ``defect`` says what it was and checking stops.
+    """
+
+    def __init__(self, output_keys, require_all: bool = True):
+        self.output_keys = set(output_keys)
+        self.require_all = require_all
+        self.stack: list[dict] = []
+        self.state = "start"  # start, fence, root, done
+        self.string: list[str] | None = None
+        self.string_is_key = False
+        self.escape = False
+        self.token: str | None = None
+        self.seen: set[str] = set()
+        self.consumed = 0
+        self.defect: str | None = None
+
+    def feed(self, text: str) -> None:
+        for ch in text:
+            if self.defect is not None:
+                return
+            self._step(ch)
+            self.consumed += 1
+
+    def finish(self) -> None:
+        """Check the end of the output; leaves ``defect`` set if it needs repair."""
+        if self.defect is None and self.token is not None:
+            self._scalar_done()
+        if self.defect is not None:
+            return
+        if self.state != "done":
+            self._defect("output ended before the JSON object was closed")
+            return
+        missing = self.output_keys - self.seen
+        if missing and self.require_all:
+            self._defect(f"output is missing indicator blocks: {sorted(missing)}")
+
+    def _abort(self, reason: str):
+        raise StreamAborted(f"{reason} (at output character {self.consumed})")
+
+    def _defect(self, reason: str) -> None:
+        """Stop checking: the answer needs the repair layer, not a new request."""
+        self.defect = f"{reason} (at output character {self.consumed})"
+
+    def _path(self) -> list:
+        return [frame["key"] if frame["type"] == "obj" else frame["index"] for frame in self.stack]
+
+    def _step(self, ch: str) -> None:
+        if self.string is not None:
+            if self.escape:
+                self.escape = False
+                self.string.append(ch)
+            elif ch == "\\":
+                self.escape = True
+            elif ch == '"':
+                value = "".join(self.string)
+                self.string = None
+                if self.string_is_key:
+                    self.stack[-1]["key"] = value
+                    self.stack[-1]["expect"] = "colon"
+                else:
+                    self._value_done(value)
+            else:
+                self.string.append(ch)
+            return
+        if self.token is not None:
+            if ch in _SCALAR_CHARS:
+                self.token += ch
+                return
+            self._scalar_done()
+        if self.state == "fence":
+            if ch == "\n":
+                self.state = "start"
+            return
+        if ch.isspace():
+            return
+        if self.state == "start":
+            if ch == "`":
+                self.state = "fence"
+            elif ch == "{":
+                self.state = "root"
+                self.stack.append({"type": "obj", "expect": "key_or_end", "key": None})
+            else:
+                self._defect("output does not start with a JSON object")
+            return
+        if self.state == "done":
+            if ch != "`":
+                self._defect("unexpected text after the JSON object")
+            return
+
+        frame = self.stack[-1]
+        expect = frame["expect"]
+        if expect in ("key", "key_or_end"):
+            if ch == '"':
+                self.string, self.string_is_key = [], True
+            elif ch == "}" and expect == "key_or_end":
+                self._close()
+            else:
+                self._defect("expected an object key")
+        elif expect == "colon":
+            if ch != ":":
+                self._defect("expected ':' after object key")
+                return
+            frame["expect"] = "value"
+        elif expect in ("value", "value_or_end"):
+            if ch == "]" and expect == "value_or_end":
+                self._close()
+            else:
+                self._start_value(ch)
+        elif expect == "comma_or_end":
+            if ch == ",":
+                if frame["type"] == "obj":
+                    frame["expect"] = "key"
+                else:
+                    frame["index"] += 1
+                    frame["expect"] = "value"
+            elif ch == ("}" if frame["type"] == "obj" else "]"):
+                self._close()
+            else:
+                self._defect("expected ',' or the end of the container")
+
+    def _start_value(self, ch: str) -> None:
+        path = self._path()
+        block = len(path) == 1 and path[0] in self.output_keys
+        field = len(path) == 2 and path[0] in self.output_keys and path[1]
+        if block and ch != "{":
+            self._defect(f"{path[0]} must be an object")
+        elif field == "evidence" and ch != "[":
+            self._defect(f"{path[0]}.evidence must be a list")
+        elif ch == "{":
+            self.stack.append({"type": "obj", "expect": "key_or_end", "key": None})
+        elif ch == "[":
+            self.stack.append({"type": "arr", "expect": "value_or_end", "index": 0})
+        elif ch == '"':
+            self.string, self.string_is_key = [], False
+        elif ch in _SCALAR_START:
+            self.token = ch
+        else:
+            self._defect("expected a JSON value")
+
+    def _scalar_done(self) -> None:
+        token, self.token = self.token, None
+        try:
+            value = json.loads(token)
+        except json.JSONDecodeError:
+            self._defect(f"invalid JSON literal {token!r}")
+            return
+        self._value_done(value)
+
+    def _value_done(self, value) -> None:
+        path = self._path()
+        if len(path) == 2 and path[0] in self.output_keys and path[1] in SCORE_KEYS:
+            # A quoted number is coerced by the repair layer; anything else
+            # that is not a valid score is a verdict no repair can recover.
+            if isinstance(value, str):
+                try:
+                    value = float(value.strip())
+                except ValueError:
+                    pass
+            if isinstance(value, bool) or value not in VALID_SCORES:
+                self._abort(f"{path[0]}.{path[1]} must be one of {VALID_SCORES}, got {value!r}")
+        self.stack[-1]["expect"] = "comma_or_end"
+
+    def _close(self) -> None:
+        self.stack.pop()
+        if not self.stack:
+            self.state = "done"
+            return
+        path = self._path()
+        if len(path) == 1 and path[0] in self.output_keys:
+            self.seen.add(path[0])
+        self.stack[-1]["expect"] = "comma_or_end"
+
+
+async def stream_completion(
+    client, params: dict, checker: IncrementalJSONChecker, partial_path: Path | None = None, first_token=None
+):
+    """Stream one completion through ``checker``; returns ``(response, ttft)``.
+
+    ``ttft`` is the time to the first streamed token, reasoning included, when
+    the optional ``first_token`` event is also set.  The
+    answer is appended to ``partial_path`` as it arrives; the file is removed
+    once the answer is complete.  Raises ``StreamAborted`` (after closing the
+    stream) if the checker rejects a score.
+    """
+    start = time.perf_counter()
+    ttft = None
+    content, reasoning = [], []
+    usage = None
+    finish_reason = "stop"
+    response_id, response_model, created = "stream", params["model"], int(time.time())
+    partial = None
+    if partial_path is not None:
+        partial_path.parent.mkdir(parents=True, exist_ok=True)
+        partial = open(partial_path, "w", encoding="utf-8")
+    stream = await client.chat.completions.create(
+        **params, stream=True, stream_options={"include_usage": True}
+    )
+    try:
+        async for chunk in stream:
+            response_id, response_model, created = chunk.id, chunk.model, chunk.created
+            if chunk.usage is not None:
+                usage = chunk.usage.model_dump()
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            finish_reason = choice.finish_reason or finish_reason
+            delta = choice.delta
+            thought = getattr(delta, "reasoning_content", None)
+            if ttft is None and (thought or delta.content):
+                ttft = time.perf_counter() - start
+                if first_token is not None:
+                    first_token.set()
+            if thought:
+                reasoning.append(thought)
+            if delta.content:
+                content.append(delta.content)
+                if partial is not None:
+                    partial.write(delta.content)
+                    partial.flush()
+                checker.feed(delta.content)
+        checker.finish()
+        if checker.defect is not None:
+            telemetry.annotate(stream_defect=checker.defect)
+    finally:
+        await stream.close()
+        if partial is not None:
+            partial.close()
+
+    if partial_path is not None:
+        partial_path.unlink(missing_ok=True)
+    message = {"role": "assistant", "content": "".join(content)}
+    if reasoning:
+        message["reasoning_content"] = "".join(reasoning)
+    response = ChatCompletion.model_validate(
+        {
+            "id": response_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": response_model,
+            "choices": [{"index": 0, "finish_reason": finish_reason, "message": message}],
+            "usage": usage,
+        }
+    )
+    if cache.is_hit(stream):
+        response._l4eval_cache_hit = True
+    return response, ttft
@@ -0,0 +1,239 @@
+"""Tracing spans for a sweep, written to a JSONL run log.
+
+Every stage of an evaluation runs inside ``span(name, **attributes)``:
+document loading, prompt assembly, queueing, the judge request (with TTFT,
+HTTP status, retries, token usage and estimated cost), parsing and
+validation.  Spans nest through a context variable, so the wrappers deeper
+in the client chain (scheduler, cache) can ``annotate`` the request span
+they run under.  Nothing is recorded unless a ``Tracer`` is active.
+
+One line is written per finished span::
+
+    {"run": ..., "span": 7, "parent": 3, "name": "request", "model": "gpt4o",
+     "indicator": "coverage", "start": 1760000000.0, "duration": 41.2, ...}
+"""
+
+import contextlib
+import contextvars
+import itertools
+import json
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+from .registry import REPO_ROOT
+
+RUNS_DIR = REPO_ROOT / ".l4eval" / "runs"
+
+# USD per million tokens: (prompt cache hit, prompt cache miss, completion).
+# List prices at the time of writing; costs in the run log are estimates.
+PRICES = {
+    "deepseek-chat": (0.07, 0.27, 1.10),
+    "deepseek-reasoner": (0.14, 0.55, 2.19),
+}
+
+_tracer: contextvars.ContextVar["Tracer | None"] = contextvars.ContextVar("l4eval_tracer", default=None)
+_current: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("l4eval_span", default=None)
+
+
+def estimate_cost(judge: str, usage: dict | None, discount: float = 1.0) -> float | None:
+    """Estimated USD cost of a call to ``judge`` from its ``usage_dict``.
+
+    ``discount`` scales list prices, e.g. 0.5 for batch pricing.
+    """
+    if not usage or judge not in PRICES:
+        return None
+    hit_price, miss_price, output_price = PRICES[judge]
+    hit = usage.get("prompt_cache_hit_tokens") or 0
+    miss = usage.get("prompt_cache_miss_tokens")
+    if miss is None:
+        miss = (usage.get("prompt_tokens") or 0) - hit
+    completion = usage.get("completion_tokens") or 0
+    return round(discount * (hit * hit_price + miss * miss_price + completion * output_price) / 1e6, 6)
+
+
+class Span:
+    def __init__(self, tracer: "Tracer", name: str, parent: "Span | None", attributes: dict):
+        self.tracer = tracer
+        self.name = name
+        self.id = next(tracer.ids)
+        self.parent = parent
+        # Model and indicator are inherited so that every span can be grouped.
+        inherited = {key: parent.attributes[key] for key in ("model", "indicator") if parent and key in parent.attributes}
+        self.attributes = {**inherited, **attributes}
+        self.start = time.time()
+        self.clock = time.perf_counter()
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def add(self, key: str, amount: float = 1) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def record(self, duration: float) -> dict:
+        return {
+            "run": self.tracer.run_id,
+            "span": self.id,
+            "parent": self.parent.id if self.parent else None,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration": round(duration, 6),
+            **self.attributes,
+        }
+
+
+class Tracer:
+    """Appends finished spans to ``path`` as JSON lines."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.run_id = uuid.uuid4().hex[:12]
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self.lock:
+            self.file.write(line + "\n")
+            self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def default_log_path() -> Path:
+    return RUNS_DIR / time.strftime("run-%Y%m%d-%H%M%S.jsonl")
+
+
+@contextlib.contextmanager
+def tracing(path: str | Path | None):
+    """Make a ``Tracer`` writing to ``path`` active; a no-op for ``None``."""
+    if path is None:
+        yield None
+        return
+    tracer = Tracer(path)
+    token = _tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer.reset(token)
+        tracer.close()
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes):
+    """Time the enclosed block as a child of the current span.
+
+    Exceptions are recorded as an ``error`` attribute (plus ``status`` when
+    they carry an HTTP status code) and re-raised.
+    """
+    tracer = _tracer.get()
+    if tracer is None:
+        yield None
+        return
+    current = Span(tracer, name, _current.get(), attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.set(error=f"{type(exc).__name__}: {exc}"[:500])
+        status = getattr(exc, "status_code", None)
+        if status is not None:
+            current.set(status=status)
+        raise
+    finally:
+        _current.reset(token)
+        tracer.write(current.record(time.perf_counter() - current.clock))
+
+
+def record_usage(judge: str, usage: dict, discount: float = 1.0, cached: bool = False) -> None:
+    """Attach a response's token usage and estimated cost to the current span.
+
+    A ``cached`` response was not paid for again: it is flagged and costs 0.
+    """
+    if cached:
+        annotate(status=200, **usage, cached=True, cost=0.0)
+    else:
+        annotate(status=200, **usage, cost=estimate_cost(judge, usage, discount))
+
+
+def annotate(**attributes) -> None:
+    """Set attributes on the current span, if any."""
+    current = _current.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+def count(key: str, amount: float = 1) -> None:
+    """Add ``amount`` to a numeric attribute of the current span, if any."""
+    current = _current.get()
+    if current is not None:
+        current.add(key, amount)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """The ``q``-th percentile of ``values``, interpolated between ranks; ``q`` is clamped to 0..100."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(max(q, 0.0), 100.0) / 100 * (len(ordered) - 1)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def load(path: str | Path) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def latest_log(runs_dir: Path = RUNS_DIR) -> Path | None:
+    logs = sorted(Path(runs_dir).glob("*.jsonl"), key=lambda path: path.stat().st_mtime)
+    return logs[-1] if logs else None
+
+
+def summarize(records: list[dict], top: int = 1) -> str:
+    """Per (indicator, model): call count, time, cost and the slowest and most expensive calls."""
+    requests = [record for record in records if record["name"] == "request"]
+    groups: dict[tuple[str, str], list[dict]] = defaultdict(list)
+    for record in requests:
+        groups[record.get("indicator", "?"), record.get("model", "?")].append(record)
+
+    stages: dict[str, list[float]] = defaultdict(list)
+    for record in records:
+        stages[record["name"]].append(record["duration"])
+
+    lines = [f"{len(requests)} requests, {sum(record.get('cost') or 0 for record in requests):.4f} USD estimated"]
+    lines.append("stage totals: " + ", ".join(f"{name} {sum(values):.1f}s/{len(values)}" for name, values in stages.items()))
+    judged = [record["duration"] for record in requests if record.get("purpose") == "judge" and record.get("cache") != "hit"]
+    if judged:
+        lines.append(f"judge requests: p50 {percentile(judged, 50):.1f}s, p99 {percentile(judged, 99):.1f}s")
+    hedged = [record for record in requests if record.get("hedged")]
+    if hedged:
+        won = sum(record.get("hedge_won") or 0 for record in hedged)
+        extra = sum(record.get("hedge_cost") or 0 for record in hedged)
+        lines.append(f"hedged {len(hedged)} requests, hedge won {won}, extra ~{extra:.4f} USD estimated")
+    for (indicator, model), calls in sorted(groups.items()):
+        cost = sum(call.get("cost") or 0 for call in calls)
+        lines.append(f"\n{indicator} / {model}: {len(calls)} calls, {sum(call['duration'] for call in calls):.1f}s, {cost:.4f} USD")
+        for call in sorted(calls, key=lambda call: call["duration"], reverse=True)[:top]:
+            lines.append(f"  slowest   {_describe(call)}")
+        for call in sorted(calls, key=lambda call: call.get("cost") or 0, reverse=True)[:top]:
+            lines.append(f"  priciest  {_describe(call)}")
+    return "\n".join(lines)
+
+
+def _describe(call: dict) -> str:
+    parts = [f"span {call['span']}", f"{call['duration']:.2f}s"]
+    if call.get("ttft") is not None:
+        parts.append(f"ttft {call['ttft']:.2f}s")
+    if call.get("cost") is not None:
+        parts.append(f"{call['cost']:.4f} USD")
+    for key in ("judge", "purpose", "prompt_tokens", "completion_tokens", "reasoning_tokens", "prompt_cache_hit_tokens", "retries", "status", "error"):
+        if call.get(key) not in (None, 0):
+            parts.append(f"{key}={call[key]}")
+    return "  ".join(parts)
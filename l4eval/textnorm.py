@@ -0,0 +1,258 @@
+"""Repair of PDF-extraction damage in the source documents.
+
+The ``.txt`` extractions contain glued words ("InthisSystemCard,"), words
+hyphenated across line breaks, ligature and math-alphabet code points, and
+page numbers and running headers between pages.  ``normalize`` fixes them in
+four passes:
+
+1. Unicode: NFKC (``ﬁ`` -> ``fi``, ``𝑁`` -> ``N``) and removal of zero-width
+   characters and soft hyphens.
+2. Page furniture: page-number lines that count up through the document,
+   and long lines repeated at least ``REPEATED_MIN`` times right next to
+   page breaks.
+3. De-hyphenation: ``improve-\\nment`` is joined to ``improvement`` when the
+   joined word occurs elsewhere in the document, otherwise to ``non-English``.
+4. Word segmentation: long letter runs that are not words themselves are
+   split into words of the document's own vocabulary (including the pieces
+   of runs glued at a case change) and a standard stopword list, taking the
+   cheapest split under a Zipf cost.  A split is kept when it follows the
+   run's lower-to-upper case changes, for a run starting in lower case or a
+   long run of three or more words; identifiers such as ``HandleFunc`` are
+   spared.  It is also kept when the run is long and splits into several
+   words including function words, or when it is longer than any word and
+   splits into known words only.  Rare words that merely split into known pieces stay as they are.
+
+Blank-line runs are collapsed as well.  The result depends on nothing but
+the input text, so it is cached on disk by content hash and computed once
+per document revision.  Quote matching (``quotes``) only compares letters
+and digits, so quotes taken from normalized text still verify against the
+original files.
+"""
+
+import hashlib
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .registry import REPO_ROOT
+
+VERSION = 3
+CACHE_DIR = REPO_ROOT / ".l4eval" / "normalized"
+REPEATED_MIN = 5
+PAGE_WINDOW = 2
+MIN_RUN = 8
+LONG_RUN = 12
+GLUED_RUN = 20
+MAX_WORD = 24
+FUNCTION_WORDS = frozenset(
+    "a an the of in on at to for and or with by from as is are was were be been this that these those we our "
+    "it its which has have not can also such than into over their they".split()
+)
+
+# A standard English stopword list: words too common to be missing from any
+# text, but which a document may only use inside glued runs.
+STOPWORDS = frozenset(
+    "a about above after again against all am an and any are as at be because been before being below between "
+    "both but by can could did do does doing down during each few for from further had has have having he her "
+    "here hers herself him himself his how i if in into is it its itself just me more most my myself no nor not "
+    "now of off on once only or other our ours ourselves out over own same she should so some such than that the "
+    "their theirs them themselves then there these they this those through to too under until up very was we "
+    "were what when where which while who whom why will with would you your yours yourself yourselves".split()
+)
+
+_INVISIBLE = dict.fromkeys(map(ord, "​‌‍⁠﻿­"))
+_PAGE_NUMBER = re.compile(r"\s*(\d{1,3})\s*")
+_HYPHENATED = re.compile(r"([A-Za-z]+)-\n([a-z]+)[ \t]*")
+_LETTER_RUN = re.compile(r"[A-Za-z]+")
+_WORD = re.compile(r"[A-Za-z]+")
+_GLUED = re.compile(r"[a-z]+[A-Z]")
+_CASE_CHANGE = re.compile(r"([a-z])([A-Z])")
+_BLANK_LINES = re.compile(r"\n[ \t]*(?:\n[ \t]*){2,}")
+_TRAILING_SPACE = re.compile(r"[ \t]+\n")
+
+
+@dataclass
+class Report:
+    unicode_changes: int = 0
+    page_numbers: int = 0
+    furniture_lines: int = 0
+    dehyphenated: int = 0
+    segmented: int = 0
+    examples: list[str] = field(default_factory=list)
+
+
+def normalize_unicode(text: str, report: Report) -> str:
+    report.unicode_changes = sum(
+        count for ch, count in Counter(text).items() if ord(ch) in _INVISIBLE or unicodedata.normalize("NFKC", ch) != ch
+    )
+    return unicodedata.normalize("NFKC", text).translate(_INVISIBLE)
+
+
+def page_number_lines(lines: list[str]) -> set[int]:
+    """Indices of standalone numbers that count up page by page."""
+    candidates = [(i, int(m.group(1))) for i, line in enumerate(lines) if (m := _PAGE_NUMBER.fullmatch(line))]
+    # Longest chain of candidates whose numbers increase by one.
+    best: dict[int, list[int]] = {}
+    for i, number in candidates:
+        chain = best.get(number - 1, []) + [i]
+        if len(chain) > len(best.get(number, [])):
+            best[number] = chain
+    longest = max(best.values(), key=len, default=[])
+    return set(longest) if len(longest) >= 3 else set()
+
+
+def remove_furniture(text: str, report: Report) -> str:
+    lines = text.split("\n")
+    pages = page_number_lines(lines)
+    near_break = set()
+    for i in pages:
+        near_break.update(range(i - PAGE_WINDOW, i + PAGE_WINDOW + 2))
+    counts = Counter(line.strip() for line in lines if len(line.strip()) >= 20)
+    repeated = {line for line, count in counts.items() if count >= REPEATED_MIN}
+    kept = []
+    for i, line in enumerate(lines):
+        if i in pages:
+            report.page_numbers += 1
+        elif i in near_break and line.strip() in repeated:
+            report.furniture_lines += 1
+        else:
+            kept.append(line)
+    return "\n".join(kept)
+
+
+def vocabulary(text: str) -> Counter:
+    # Runs glued at a case change ("evaluationMitigations") are no words,
+    # however often the extraction repeats them, but their pieces are.
+    words = Counter()
+    for word in _WORD.findall(text):
+        words.update(_CASE_CHANGE.sub(r"\1 \2", word).lower().split() if _GLUED.match(word) else [word.lower()])
+    return words
+
+
+def dehyphenate(text: str, vocab: Counter, report: Report) -> str:
+    def join(match: re.Match) -> str:
+        head, tail = match.group(1), match.group(2)
+        report.dehyphenated += 1
+        # A tail that is a word of its own suggests a real compound ("non-English").
+        if vocab[(head + tail).lower()] or not vocab[tail.lower()]:
+            return head + tail + "\n"
+        return f"{head}-{tail}\n"
+
+    return _HYPHENATED.sub(join, text)
+
+
+class Segmenter:
+    """Splits glued letter runs into words of a document's vocabulary.
+
+    Words the document uses at least twice are ranked by their count, then
+    the stopwords it lacks, then words of four to ``LONG_RUN`` letters it
+    uses once; longer words used once are likely glued runs themselves.
+    """
+
+    def __init__(self, vocab: Counter):
+        ranked = vocab.most_common()
+        known = [word for word, count in ranked if count >= 2 and (len(word) > 1 or word in FUNCTION_WORDS)]
+        known += sorted(word for word in (STOPWORDS | FUNCTION_WORDS) - {"i"} if vocab[word] < 2)
+        known += [word for word, count in ranked if count == 1 and 4 <= len(word) <= LONG_RUN]
+        scale = math.log(max(len(known), 2))
+        self.cost = {word: math.log((rank + 1) * scale) for rank, word in enumerate(known)}
+        self.words = frozenset(known)
+        self.vocab = vocab
+
+    def split(self, run: str) -> list[str] | None:
+        """Words of ``run`` with their original casing, or ``None`` to keep it."""
+        lower = run.lower()
+        if len(run) < MIN_RUN or self.vocab[lower] >= 2 or lower in STOPWORDS:
+            return None
+        # best[i] = (cost, start of last word) for the prefix of length i.
+        best = [(0.0, 0)] + [(math.inf, 0)] * len(lower)
+        for end in range(1, len(lower) + 1):
+            for start in range(max(0, end - MAX_WORD), end):
+                cost = self.cost.get(lower[start:end])
+                if cost is not None and best[start][0] + cost < best[end][0]:
+                    best[end] = (best[start][0] + cost, start)
+        if math.isinf(best[-1][0]):
+            return None
+        cuts, end = [], len(lower)
+        while end > 0:
+            cuts.append(end)
+            end = best[end][1]
+        bounds = [0, *reversed(cuts)]
+        words = [run[a:b] for a, b in zip(bounds, bounds[1:])]
+        if len(words) < 2:
+            return None
+        case_changes = {i for i in range(1, len(run)) if run[i - 1].islower() and run[i].isupper()}
+        # "thisGemini" or "BasicsFeedbackCapabilities", but not "HandleFunc".
+        if case_changes and set(bounds[1:-1]) <= case_changes and (run[0].islower() or (len(words) >= 3 and len(run) >= 20)):
+            return words
+        # Without case changes only prose-like runs are split: rare words such
+        # as "inability" or "transformations" also split into known pieces.
+        function = [word for word in words if word.lower() in FUNCTION_WORDS]
+        content = all(
+            len(word) >= 4 or word.isupper() or (len(word) in (2, 3) and word.lower() in STOPWORDS)
+            for word in words
+            if word.lower() not in FUNCTION_WORDS
+        )
+        # Capitalized pieces only ("EncodeToString") make an identifier.
+        identifier = all(word[0].isupper() for word in words)
+        if len(run) >= LONG_RUN and len(words) >= 3 and any(len(word) > 1 for word in function) and content and not identifier:
+            return words
+        # No single word is this long: "algorithmicenhancements".
+        if len(run) >= GLUED_RUN and content and all(word.lower() in self.words for word in words if len(word) > 1):
+            return words
+        return None
+
+
+def segment(text: str, vocab: Counter, report: Report) -> str:
+    segmenter = Segmenter(vocab)
+
+    def split(match: re.Match) -> str:
+        words = segmenter.split(match.group(0))
+        if words is None:
+            return match.group(0)
+        report.segmented += 1
+        if len(report.examples) < 10:
+            report.examples.append(f"{match.group(0)} -> {' '.join(words)}")
+        return " ".join(words)
+
+    return _LETTER_RUN.sub(split, text)
+
+
+def normalize(text: str) -> tuple[str, Report]:
+    report = Report()
+    text = normalize_unicode(text, report)
+    text = remove_furniture(text, report)
+    # Count words without the halves of hyphenated line breaks.
+    vocab = vocabulary(_HYPHENATED.sub(" ", text))
+    text = dehyphenate(text, vocab, report)
+    text = segment(text, vocabulary(text), report)
+    text = _TRAILING_SPACE.sub("\n", text)
+    text = _BLANK_LINES.sub("\n\n", text)
+    return text, report
+
+
+def cache_path(text: str, cache_dir: Path = CACHE_DIR) -> Path:
+    digest = hashlib.sha256(f"{VERSION}\0{text}".encode("utf-8")).hexdigest()
+    return Path(cache_dir) / f"{digest}.txt"
+
+
+def normalized(text: str, cache_dir: Path = CACHE_DIR) -> str:
+    """``normalize(text)``, computed once per distinct text and kept on disk."""
+    path = cache_path(text, cache_dir)
+    if path.exists():
+        return path.read_text(encoding="utf-8")
+    result, _ = normalize(text)
+    save(text, result, cache_dir)
+    return result
+
+
+def save(text: str, result: str, cache_dir: Path = CACHE_DIR) -> None:
+    """Cache ``result`` as the normalization of ``text``."""
+    path = cache_path(text, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_suffix(".tmp")
+    temp.write_text(result, encoding="utf-8")
+    temp.replace(path)
@@ -0,0 +1,87 @@
+"""Self-consistency voting over several judge answers.
+
+A single judge sample decides each score, and reruns can flip between
+adjacent scores.  With voting the engine draws ``agreement`` samples at once
+and stops when every indicator block already has ``agreement`` matching
+scores; only when they split does it draw the remaining samples, cancelling
+those still outstanding as soon as no block's majority can change.
+
+Ties go to the lower score, in line with the explicit-disclosure logic of
+the rubrics.  The combined block keeps the rubric summary and justification
+of the first sample that voted for the majority, the union of the evidence
+of all majority samples, and the vote distribution.
+"""
+
+import copy
+from collections import Counter
+
+from .output import VALID_SCORES
+from .quotes import normalize
+
+
+def tally(samples: list[dict], output_keys) -> dict[str, Counter]:
+    """Votes per score for every block of ``output_keys``."""
+    return {key: Counter(sample[key]["raw_score"] for sample in samples) for key in output_keys}
+
+
+def majority(votes: Counter):
+    """Most voted score; ties go to the lower score."""
+    return max(votes, key=lambda score: (votes[score], -score))
+
+
+def settled(votes: dict[str, Counter], agreement: int, remaining: int) -> bool:
+    """Whether more samples are unnecessary for every block.
+
+    A block is settled once one score has ``agreement`` votes, or once its
+    leader is further ahead than the number of samples still to come.
+    """
+    if remaining <= 0:
+        return True
+    for counter in votes.values():
+        ranked = [count for _, count in counter.most_common(2)] + [0, 0]
+        if ranked[0] < agreement and ranked[0] - ranked[1] <= remaining:
+            return False
+    return True
+
+
+def distribution(counter: Counter) -> dict[str, int]:
+    return {str(score): counter[score] for score in VALID_SCORES if counter[score]}
+
+
+def combine(samples: list[dict], output_keys) -> tuple[dict, int]:
+    """Majority scores of ``samples``; returns ``(scores, representative)``.
+
+    ``representative`` is the index of the sample whose answer supplied the
+    first block's text.
+    """
+    votes = tally(samples, output_keys)
+    combined = {"model": samples[0].get("model")}
+    representative = 0
+    for position, key in enumerate(output_keys):
+        score = majority(votes[key])
+        agreeing = [i for i, sample in enumerate(samples) if sample[key]["raw_score"] == score]
+        if position == 0:
+            representative = agreeing[0]
+        block = copy.deepcopy(samples[agreeing[0]][key])
+        evidence, seen = [], set()
+        for i in agreeing:
+            for item in samples[i][key]["evidence"]:
+                fingerprint = (item.get("doc"), normalize(item["quote"])[0])
+                if fingerprint not in seen:
+                    seen.add(fingerprint)
+                    evidence.append(copy.deepcopy(item))
+        block["evidence"] = evidence
+        block["votes"] = distribution(votes[key])
+        block["samples"] = len(samples)
+        combined[key] = block
+    return combined, representative
+
+
+def add_usage(total: dict | None, usage: dict) -> dict:
+    """Sum token counts of several calls; counts unknown for any call stay ``None``."""
+    if total is None:
+        return dict(usage)
+    return {
+        key: None if total.get(key) is None or usage.get(key) is None else total[key] + usage[key]
+        for key in dict.fromkeys([*total, *usage])
+    }